@@ -0,0 +1,250 @@
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import platform
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ga.genetic_algorithm import *
+
+SELECTIONS = [tournament_selection, roulette_selection, rank_selection]
+BATCH_SELECTIONS = [batch_tournament_selection, batch_roulette_selection, batch_rank_selection]
+CROSSOVERS = [partially_mapped_crossover, order_crossover, fast_order_mapped_crossover, cycle_crossover]
+BATCH_CROSSOVERS = [batch_partially_mapped_crossover, batch_order_crossover, batch_fast_order_mapped_crossover, batch_cycle_crossover]
+MUTATIONS = [swap_mutation, inversion_mutation, displacement_mutation]
+BATCH_MUTATIONS = [batch_swap_mutation, batch_inversion_mutation, batch_displacement_mutation]
+GROUPS = ('selection', 'crossover', 'mutation', 'fitness', 'local_search', 'diversity', 'ga')
+
+
+def benchmark_cases(population_sizes=(50, 200), route_sizes=(10, 30, 100), groups=GROUPS, seed=0):
+    """
+    Builds the benchmark cases: every operator on a generation's worth of work (population_size selections,
+    population_size / 2 crossovers, population_size mutations or evaluations), the local searches on one
+    route, the diversity measures and one ga() generation, for every population size and route size.
+
+    Route sizes count the areas, depot included: 10 is the game (with its constraints and the QS -> DV
+    jump), larger sizes are Instance.random instances.
+
+    Parameters:
+        population_sizes (tuple of int): The population sizes.
+        route_sizes (tuple of int): The numbers of areas.
+        groups (tuple of str): The groups of cases to build (see GROUPS).
+        seed (int): Seed of the instances and populations.
+
+    Returns:
+        list of tuple: The (name, group, function, population size, route size) of every case, where function
+                       runs the case once without arguments.
+
+    Example Usage:
+        cases = benchmark_cases(population_sizes=(100,), route_sizes=(10,), groups=('crossover',))
+    """
+    cases = []
+    for route_size in route_sizes:
+        instance = Instance.random(route_size, seed=seed, candidates_k=min(8, route_size - 2))
+        if 'local_search' in groups:
+            cases.extend(_local_search_cases(instance, seed))
+        for population_size in population_sizes:
+            cases.extend(_population_cases(instance, population_size, groups, seed))
+    return cases
+
+
+def _local_search_cases(instance, seed):
+    # the local searches on one route of the instance
+    matrix, route_size = instance.geo_matrix, len(instance)
+    search_options = dict(constraints=instance.constraints, jump_areas=instance.jump_areas, candidates=instance.candidates)
+    random.seed(seed)
+    route = generate_individual(instance=instance)
+    return [(f"local_search/{search.__name__}[L={route_size}]", 'local_search',
+             lambda search=search: search(route, matrix, **search_options), None, route_size)
+            for search in (two_opt, or_opt)]
+
+
+def _population_cases(instance, population_size, groups, seed):
+    # the cases working on a generation's worth of routes of the instance
+    matrix, route_size = instance.geo_matrix, len(instance)
+    options = dict(constraints=instance.constraints, jump_areas=instance.jump_areas)
+    search_options = dict(options, candidates=instance.candidates)
+    random.seed(seed)
+    np.random.seed(seed)
+    routes = population(population_size, instance=instance)
+    fitnesses = batch_fitness(routes, matrix, **options)[0].tolist()
+    pairs = population_size // 2
+    parents1, parents2 = routes[:pairs], routes[pairs:2 * pairs]
+    cases = []
+
+    def add(name, group, function):
+        cases.append((f"{group}/{name}[n={population_size},L={route_size}]", group, function, population_size, route_size))
+
+    if 'selection' in groups:
+        for selection in SELECTIONS:
+            add(selection.__name__, 'selection',
+                lambda selection=selection: [selection(routes, fitnesses) for _ in range(population_size)])
+        for selection in BATCH_SELECTIONS:
+            add(selection.__name__, 'selection', lambda selection=selection: selection(fitnesses, pairs))
+
+    if 'crossover' in groups:
+        for crossover in CROSSOVERS:
+            add(crossover.__name__, 'crossover',
+                lambda crossover=crossover: [crossover(p1, p2) for p1, p2 in zip(parents1, parents2)])
+        for crossover in BATCH_CROSSOVERS:
+            add(crossover.__name__, 'crossover', lambda crossover=crossover: crossover(parents1, parents2))
+
+    if 'mutation' in groups:
+        for mutation in MUTATIONS:
+            add(mutation.__name__, 'mutation', lambda mutation=mutation: [mutation(route, 1.0) for route in routes])
+        for mutation in BATCH_MUTATIONS:
+            add(mutation.__name__, 'mutation', lambda mutation=mutation: mutation(routes, 1.0))
+
+    if 'fitness' in groups:
+        add('fitness_function', 'fitness', lambda: [fitness_function(route, matrix, **options) for route in routes])
+        add('batch_fitness', 'fitness', lambda: batch_fitness(routes, matrix, **options))
+
+    if 'diversity' in groups:
+        add('genotypic_diversity', 'diversity', lambda: genotypic_diversity(routes))
+        add('fitness_shared', 'diversity', lambda: fitness_shared(routes, fitnesses))
+
+    if 'ga' in groups:
+        evaluator = bind_evaluator(batch_fitness, **options)
+
+        def improve(children):
+            return [two_opt(child, matrix, **search_options) for child in children]
+
+        for name, operators in (('generation', (tournament_selection, order_crossover, swap_mutation)),
+                                ('batch_generation', (batch_tournament_selection, batch_order_crossover, batch_swap_mutation))):
+            add(name, 'ga', lambda operators=operators: next_generation(
+                routes, fitnesses, population_size, *operators, 0.1, 0.7, True, 2, evaluator, matrix, improve))
+    return cases
+
+
+def time_case(function, min_time=0.2, repeat=3):
+    """
+    Times a function: every repeat calls it as many times as fit in min_time (at least once), and the
+    fastest repeat gives the time per call, the least disturbed by the rest of the machine.
+
+    Parameters:
+        function (function): The function to time, called without arguments.
+        min_time (float): The minimum duration of a repeat, in seconds.
+        repeat (int): The number of repeats.
+
+    Returns:
+        float: The time per call, in seconds.
+
+    Example Usage:
+        time_case(lambda: batch_fitness(population(100), matrix))
+    """
+    start = time.perf_counter()
+    function()
+    number = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)))
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run_benchmarks(population_sizes=(50, 200), route_sizes=(10, 30, 100), groups=GROUPS, min_time=0.2, repeat=3,
+                   verbose=True):
+    """
+    Runs the benchmark cases (see benchmark_cases) and returns their machine-readable results.
+
+    Parameters:
+        population_sizes (tuple of int): The population sizes.
+        route_sizes (tuple of int): The numbers of areas.
+        groups (tuple of str): The groups of cases to run (see GROUPS).
+        min_time (float): The minimum duration of a repeat of a case, in seconds.
+        repeat (int): The number of repeats of a case.
+        verbose (bool): Whether to print every result.
+
+    Returns:
+        dict: The environment ('meta') and the seconds per call, group, population size and route size of
+              every case ('results', keyed by case name).
+
+    Example Usage:
+        results = run_benchmarks(population_sizes=(100,), route_sizes=(10, 50))
+    """
+    results = {}
+    for name, group, function, population_size, route_size in benchmark_cases(population_sizes, route_sizes, groups):
+        seconds = time_case(function, min_time, repeat)
+        results[name] = dict(group=group, seconds=seconds, population_size=population_size, route_size=route_size)
+        if verbose:
+            print(f"{name:<70} {seconds * 1000:>12.3f} ms")
+    meta = dict(python=platform.python_version(), numpy=np.__version__, machine=platform.machine(),
+                processor=platform.processor(), time=time.strftime('%Y-%m-%dT%H:%M:%S'))
+    return dict(meta=meta, results=results)
+
+
+def compare_results(results, baseline, threshold=0.25):
+    """
+    Compares benchmark results with a baseline.
+
+    Parameters:
+        results (dict): The results of run_benchmarks.
+        baseline (dict): Earlier results of run_benchmarks; cases missing from either are skipped.
+        threshold (float): The relative slowdown above which a case is a regression (0.25 for 25% slower).
+
+    Returns:
+        list of tuple: The (name, baseline seconds, seconds, ratio) of every case compared, slowest ratio first,
+                       and the list of the regressions among them.
+
+    Example Usage:
+        comparisons, regressions = compare_results(results, json.load(open('benchmark_baseline.json')))
+    """
+    comparisons = []
+    for name, result in results['results'].items():
+        if name in baseline['results']:
+            baseline_seconds = baseline['results'][name]['seconds']
+            comparisons.append((name, baseline_seconds, result['seconds'], result['seconds'] / baseline_seconds))
+    comparisons.sort(key=lambda comparison: comparison[3], reverse=True)
+    regressions = [comparison for comparison in comparisons if comparison[3] > 1 + threshold]
+    return comparisons, regressions
+
+
+def main(arguments=None):
+    """
+    Command line entry point: runs the benchmarks, writes the results as JSON and, given a baseline, prints
+    the comparison and exits with status 1 when a case is slower than the baseline by more than the threshold.
+
+    Example Usage:
+        python benchmarks/benchmark.py --output benchmark_baseline.json
+        python benchmarks/benchmark.py --baseline benchmark_baseline.json --threshold 0.25
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks the operators, the fitness, the local searches and ga().')
+    parser.add_argument('--population-sizes', type=int, nargs='+', default=[50, 200])
+    parser.add_argument('--route-sizes', type=int, nargs='+', default=[10, 30, 100])
+    parser.add_argument('--groups', nargs='+', choices=GROUPS, default=list(GROUPS))
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum duration of a repeat, in seconds')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='results of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.25, help='relative slowdown that fails the comparison')
+    arguments = parser.parse_args(arguments)
+
+    results = run_benchmarks(arguments.population_sizes, arguments.route_sizes, tuple(arguments.groups),
+                             arguments.min_time, arguments.repeat)
+    with open(arguments.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {arguments.output}")
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        comparisons, regressions = compare_results(results, baseline, arguments.threshold)
+        print(f"{'='*50}")
+        for name, baseline_seconds, seconds, ratio in comparisons:
+            flag = 'REGRESSION' if ratio > 1 + arguments.threshold else ''
+            print(f"{name:<70} {baseline_seconds * 1000:>10.3f} -> {seconds * 1000:>10.3f} ms  x{ratio:.2f} {flag}")
+        if regressions:
+            print(f"{len(regressions)} of {len(comparisons)} cases are more than {arguments.threshold:.0%} slower than {arguments.baseline}")
+            return 1
+        print(f"No case is more than {arguments.threshold:.0%} slower than {arguments.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
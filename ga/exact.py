@@ -0,0 +1,103 @@
+import sys
+import os
+import math
+import itertools
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.utils import AREA_CODEC, JUMP_AREAS, batch_fitness
+
+
+def permutation_chunks(items, chunk_size=40320):
+    """
+    Streams every permutation of the given items, in lexicographic order of their positions, as
+    2-D arrays of at most chunk_size rows.
+
+    The permutations of the last m items (m! <= chunk_size) are built once as an index table; every
+    chunk is one permutation of the leading items followed by the remaining items gathered through
+    that table, so no more than one chunk is held in memory.
+
+    Parameters:
+        items (list or numpy.ndarray): The items to permute.
+        chunk_size (int): The maximum number of permutations per chunk.
+
+    Yields:
+        numpy.ndarray: A (rows x len(items)) array of permutations.
+
+    Example Usage:
+        for chunk in permutation_chunks(np.arange(1, 10)):
+            fitnesses, jumped_ks = batch_fitness(chunk, matrix)
+    """
+    items = np.asarray(items)
+    n = len(items)
+    tail = 0
+    while tail < n and math.factorial(tail + 1) <= chunk_size:
+        tail += 1
+    table = np.array(list(itertools.permutations(range(tail))), dtype=np.intp).reshape(-1, tail)
+
+    for head in itertools.permutations(range(n), n - tail):
+        rest = np.setdiff1d(np.arange(n), head)
+        chunk = np.empty((len(table), n), dtype=items.dtype)
+        chunk[:, :n - tail] = items[list(head)]
+        chunk[:, n - tail:] = items[rest[table]]
+        yield chunk
+
+
+def exhaustive_search(geo_matrix=None, instance=None, constraints=None, jump_areas=JUMP_AREAS,
+                      evaluator=batch_fitness, chunk_size=40320):
+    """
+    Finds the optimal route by scoring every route that starts and ends at the depot.
+
+    The routes are enumerated in chunks with permutation_chunks and each chunk is scored with one
+    batched evaluator call, which applies the compiled constraints, so the 362,880 routes of the game
+    are solved in a few seconds with bounded memory. Ties are broken like the comparisons of
+    fitness_function results: a route that jumps KS beats a route with the same fitness that does not,
+    and otherwise the first route in enumeration order is kept.
+
+    Parameters:
+        geo_matrix (list of lists, optional): The Geo matrix, for the areas of the game.
+        instance (Instance, optional): The instance to solve instead (see utils/instance.py).
+        constraints (CompiledConstraints or list of dict, optional): The route constraints, defaults to
+                                the constraints of the game (or of the instance).
+        jump_areas (tuple, optional): The codes of 'QS' and 'DV' for the jump rule, None to disable it.
+        evaluator (function): A batched evaluator with the interface of batch_fitness.
+        chunk_size (int): The maximum number of routes scored per evaluator call.
+
+    Returns:
+        tuple: The optimal route, its fitness and its jumped_ks flag.
+
+    Example Usage:
+        matrix = geo_matrix_generator(seed=42)
+        best_route, best_fitness, jumped_ks = exhaustive_search(matrix)
+        print(AREA_CODEC.decode(best_route), best_fitness)
+    """
+    if instance is None:
+        if geo_matrix is None:
+            raise ValueError("exhaustive_search needs a geo_matrix or an instance")
+        geo_matrix, codec, depot = np.asarray(geo_matrix), AREA_CODEC, AREA_CODEC.index['D']
+    else:
+        geo_matrix, codec, depot = instance.geo_matrix, instance.codec, instance.depot_index
+        jump_areas = instance.jump_areas
+        if constraints is None:
+            constraints = instance.constraints
+
+    interior = np.array([area for area in range(len(codec)) if area != depot], dtype=codec.dtype)
+    best_route, best_fitness, best_jumped = None, None, False
+
+    for chunk in permutation_chunks(interior, chunk_size):
+        # close every route at the depot
+        routes = np.empty((len(chunk), len(interior) + 2), dtype=codec.dtype)
+        routes[:, 0] = routes[:, -1] = depot
+        routes[:, 1:-1] = chunk
+
+        fitnesses, jumped_ks = evaluator(routes, geo_matrix, constraints=constraints, jump_areas=jump_areas)
+        fitnesses, jumped_ks = np.asarray(fitnesses), np.asarray(jumped_ks, dtype=bool)
+
+        # the best route of the chunk, preferring routes that jump KS
+        top = fitnesses == fitnesses.max()
+        index = np.argmax(top & jumped_ks) if (top & jumped_ks).any() else np.argmax(top)
+        if best_route is None or (fitnesses[index], jumped_ks[index]) > (best_fitness, best_jumped):
+            best_route, best_fitness, best_jumped = routes[index].copy(), fitnesses[index].item(), bool(jumped_ks[index])
+
+    return best_route, best_fitness, best_jumped
@@ -1,6 +1,9 @@
 import sys
 import os
+import math
+import time
 import random
+from functools import partial
 import numpy as np
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,12 +14,655 @@ from operators.mutators import *
 from operators.optimizations import *
 from pop.population import *
 from utils.utils import *
+from utils.fitness_cache import *
+from utils.instance import *
+from utils.timing import *
+from utils.checkpoint import *
+from utils.snapshot_log import *
+from ga.exact import *
+from ga.parallel import *
+from ga.islands import *
 from visualizations.visualization import *
 from visualizations.dashboard import *
 
 
+def evaluate_population(evaluator, population, matrix):
+    """
+    Evaluates every individual of a population with the given evaluator.
+
+    Batched evaluators (marked with a `batched` attribute, such as batch_fitness) score the whole
+    population in a single call; any other evaluator is called once per individual.
+
+    Parameters:
+    - evaluator (function): Function to evaluate the fitness of individuals.
+    - population (numpy.ndarray): The individuals to evaluate, one encoded route per row.
+    - matrix (numpy.ndarray): The Geo matrix.
+
+    Returns:
+    - tuple: The list of fitnesses and the list of jumped_ks flags.
+
+    Example Usage:
+        fitnesses, jumped_ks_flags = evaluate_population(batch_fitness, population(100), matrix)
+    """
+    if getattr(evaluator, 'batched', False):
+        fitnesses, jumped_ks_flags = evaluator(population, matrix)
+        return fitnesses.tolist(), jumped_ks_flags.tolist()
+
+    fitness_results = [evaluator(ind, matrix) for ind in population]
+    fitnesses = [result[0] for result in fitness_results]
+    jumped_ks_flags = [result[1] for result in fitness_results]
+    return fitnesses, jumped_ks_flags
+
+
+def bind_evaluator(evaluator, **options):
+    """
+    Binds keyword options (such as constraints and jump_areas) to an evaluator, keeping the
+    (routes, matrix) evaluator interface.
+
+    Parameters:
+    - evaluator (function): fitness_function, batch_fitness or any evaluator accepting the given keywords.
+    - options: The keyword arguments passed to every call of the evaluator.
+
+    Returns:
+    - function: The evaluator using the given options.
+
+    Example Usage:
+        constraints = compile_constraints(ROUTE_CONSTRAINTS + [{'rule': 'window', 'area': 'KS', 'end': 3}], AREA_TO_INDEX)
+        evaluator = bind_evaluator(batch_fitness, constraints=constraints)
+    """
+    def bound_evaluator(routes, matrix):
+        return evaluator(routes, matrix, **options)
+
+    bound_evaluator.batched = getattr(evaluator, 'batched', False)
+    # the single-route counterpart of a batched evaluator gets the same options
+    if getattr(evaluator, 'route_evaluator', None) is not None:
+        bound_evaluator.route_evaluator = partial(evaluator.route_evaluator, **options)
+    return bound_evaluator
+
+
+def batch_offspring(population, fitnesses, n_pairs, selection, crossover, crossover_rate, timer=NULL_TIMER):
+    """
+    Selects n_pairs parent pairs and crosses them with a batched crossover in a single call.
+
+    Parent index pairs come from one call of a batched selection (such as batch_tournament_selection),
+    or from calling a per-individual selection twice per pair. Each pair is crossed with probability
+    crossover_rate, and the pairs that are not crossed are copied.
+
+    Parameters:
+    - population (numpy.ndarray): The population, one encoded route per row.
+    - fitnesses (list): The fitness of every individual.
+    - n_pairs (int): The number of parent pairs.
+    - selection (function): Function to select individuals for crossover.
+    - crossover (function): A batched crossover (such as batch_order_crossover).
+    - crossover_rate (float): Probability of crossover.
+    - timer (PhaseTimer, optional): Times the selection and crossover phases.
+
+    Returns:
+    - numpy.ndarray: The (2 * n_pairs x route_length) children, child1 and child2 of each pair in turn.
+
+    Example Usage:
+        children = batch_offspring(population, fitnesses, 49, batch_tournament_selection, batch_order_crossover, 0.7)
+    """
+    with timer.phase('selection'):
+        if getattr(selection, 'batched', False):
+            parent_pairs = selection(fitnesses, n_pairs)
+            parents1, parents2 = population[parent_pairs[:, 0]], population[parent_pairs[:, 1]]
+        else:
+            parents = [(selection(population, fitnesses), selection(population, fitnesses)) for _ in range(n_pairs)]
+            parents1 = np.array([p1 for p1, p2 in parents], dtype=population.dtype).reshape(n_pairs, -1)
+            parents2 = np.array([p2 for p1, p2 in parents], dtype=population.dtype).reshape(n_pairs, -1)
+
+    # pairs that are not crossed are copied
+    with timer.phase('crossover'):
+        children = np.empty((2 * n_pairs, population.shape[1]), dtype=population.dtype)
+        children[0::2], children[1::2] = parents1, parents2
+        crossed = np.random.random(n_pairs) < crossover_rate
+        if crossed.any():
+            children[np.repeat(crossed, 2)] = crossover(parents1[crossed], parents2[crossed])
+    return children
+
+
+def next_generation(population, fitnesses, population_size, selection, crossover, mutation, mutation_rate,
+                    crossover_rate, elitism, elitism_size, evaluator, matrix, improve, pool=None, timer=NULL_TIMER):
+    """
+    Breeds and evaluates the next generation of ga().
+
+    The elites are carried over, and the children are bred with the selection, crossover and mutation
+    functions (one call per generation for batched operators, one per parent pair otherwise). The local
+    search and the evaluation of the children then run in this process, or on the OffspringPool. They
+    draw no random numbers, so both modes give the same generation.
+
+    Parameters:
+    - population (numpy.ndarray): The current population, one encoded route per row.
+    - fitnesses (list): The fitness of every individual.
+    - population_size (int): Number of individuals in the population.
+    - selection, crossover, mutation (function): The genetic operators (see ga()).
+    - mutation_rate (float): Probability of mutation.
+    - crossover_rate (float): Probability of crossover.
+    - elitism (bool): Whether to use elitism.
+    - elitism_size (int): Number of top individuals to carry over to the next generation.
+    - evaluator (function): Function to evaluate the fitness of individuals.
+    - matrix (numpy.ndarray): The Geo matrix.
+    - improve (function): Applies the local searches to a list of routes.
+    - pool (OffspringPool, optional): The worker processes for the local search and evaluation of the children.
+    - timer (PhaseTimer, optional): Times the phases of the generation (see utils/timing.py).
+
+    Returns:
+    - tuple: The new population, its fitnesses and its jumped_ks flags.
+
+    Example Usage:
+        population, fitnesses, jumped_ks_flags = next_generation(
+            population, fitnesses, 100, tournament_selection, order_crossover, swap_mutation, 0.1, 0.7,
+            True, 2, batch_fitness, matrix, lambda routes: routes)
+    """
+    with timer.phase('elitism'):
+        if elitism:
+            # select the individuals to be carried over to the next generation
+            sorted_indices = np.argsort(fitnesses)
+            elite_indices = sorted_indices[-elitism_size:]
+            offspring = [population[i] for i in elite_indices]
+        else:
+            offspring = []
+    n_children = population_size - len(offspring)
+
+    if getattr(crossover, 'batched', False):
+        # select and cross every parent pair of the generation at once
+        children = batch_offspring(population, fitnesses, (n_children + 1) // 2, selection, crossover, crossover_rate, timer)
+        with timer.phase('mutation'):
+            if getattr(mutation, 'batched', False):
+                children = mutation(children, mutation_rate)
+            else:
+                children = [mutation(child, mutation_rate) for child in children]
+        children = list(children)
+    else:
+        children = []
+        if getattr(selection, 'batched', False):
+            # draw every parent pair of the generation at once
+            with timer.phase('selection'):
+                parent_pairs = iter(selection(fitnesses, (n_children + 1) // 2))
+
+    while len(children) < n_children:
+        with timer.phase('selection'):
+            if getattr(selection, 'batched', False):
+                i, j = next(parent_pairs)
+                p1, p2 = population[i], population[j]
+            else:
+                p1 = selection(population, fitnesses)
+                p2 = selection(population, fitnesses)
+
+        with timer.phase('crossover'):
+            if random.random() < crossover_rate:
+                c1, c2 = crossover(p1, p2)
+            else:
+                c1, c2 = p1, p2
+
+        with timer.phase('mutation'):
+            if getattr(mutation, 'batched', False):
+                c1, c2 = mutation(np.array([c1, c2]), mutation_rate)
+            else:
+                c1 = mutation(c1, mutation_rate)
+                c2 = mutation(c2, mutation_rate)
+
+        children.extend([c1, c2])
+
+    children = np.array(children[:n_children], dtype=population.dtype).reshape(n_children, -1)
+    if pool is None:
+        with timer.phase('local_search'):
+            children = improve(list(children))
+        with timer.phase('evaluation'):
+            population = np.array(offspring + children, dtype=population.dtype)
+            fitnesses, jumped_ks_flags = evaluate_population(evaluator, population, matrix)
+        return population, fitnesses, jumped_ks_flags
+
+    # the elites are evaluated here, the children by the workers
+    with timer.phase('offspring_pool'):
+        children, child_fitnesses, child_flags = pool.improve_and_evaluate(children)
+    fitnesses, jumped_ks_flags = [], []
+    if offspring:
+        with timer.phase('evaluation'):
+            fitnesses, jumped_ks_flags = evaluate_population(evaluator, np.array(offspring, dtype=population.dtype), matrix)
+    population = np.concatenate([np.array(offspring, dtype=population.dtype).reshape(-1, population.shape[1]), children])
+    return population, fitnesses + child_fitnesses, jumped_ks_flags + child_flags
+
+
+class GenerationSnapshot:
+    """
+    A lightweight summary of one generation of a run, as yielded by Evolution and passed to the callbacks of ga().
+
+    Attributes:
+    - generation (int): The index of the generation (0 for the first one, or for the exhaustive search).
+    - best_route (numpy.ndarray): A copy of the best route of the generation.
+    - best_fitness (float): Its fitness (lowered by fitness sharing, except in the last generation).
+    - jumped_ks (bool): Whether the best route jumped KS.
+    - phenotypic_diversity (float): The standard deviation of the fitnesses.
+    - genotypic_diversity (float): The genotypic diversity of the population (see genotypic_diversity).
+    - seconds (float): The wall time of the generation.
+    - timings (dict or None): The [seconds, calls] of every phase of the generation if the run has a PhaseTimer.
+    - evaluations (int): The number of routes evaluated since the start of the run.
+
+    Example Usage:
+        for snapshot in Evolution(matrix_seed=1):
+            print(snapshot.generation, snapshot.best_fitness)
+    """
+
+    def __init__(self, generation, best_route, best_fitness, jumped_ks, phenotypic_diversity, genotypic_diversity,
+                 seconds, timings=None, evaluations=0):
+        self.generation = generation
+        self.best_route = best_route
+        self.best_fitness = best_fitness
+        self.jumped_ks = jumped_ks
+        self.phenotypic_diversity = phenotypic_diversity
+        self.genotypic_diversity = genotypic_diversity
+        self.seconds = seconds
+        self.timings = timings
+        self.evaluations = evaluations
+
+    def __repr__(self):
+        return f"GenerationSnapshot(generation={self.generation}, best_fitness={self.best_fitness})"
+
+    def as_dict(self):
+        """
+        Returns the snapshot as a JSON-serializable dict, with the best route as a list of area indices.
+        """
+        return dict(generation=self.generation, best_route=self.best_route.tolist(), best_fitness=float(self.best_fitness),
+                    jumped_ks=bool(self.jumped_ks), phenotypic_diversity=float(self.phenotypic_diversity),
+                    genotypic_diversity=float(self.genotypic_diversity), seconds=self.seconds, timings=self.timings,
+                    evaluations=self.evaluations)
+
+
+class RunResult(tuple):
+    """
+    The tuple returned by ga(), which also records how the run ended and what it spent.
+
+    Attributes:
+    - stop_reason (str): The criterion that ended the run (see ga()).
+    - generations (int): The number of generations run.
+    - evaluations (int): The number of routes evaluated (local search moves aside).
+    - seconds (float): The wall time of the run.
+
+    Example Usage:
+        result = ga(matrix_seed=1, stall_generations=10, time_limit=5, dashboard=False)
+        best_individual, best_fitness = result
+        print(result.stop_reason, result.generations, result.evaluations)
+    """
+
+    def __new__(cls, values, evolution):
+        result = super().__new__(cls, values)
+        result.stop_reason = evolution.stop_reason
+        result.generations = evolution.generation
+        result.evaluations = evolution.evaluations
+        result.seconds = evolution.elapsed()
+        return result
+
+
+class Evolution:
+    """
+    A ga() run as an iterator of GenerationSnapshot: every generation is yielded as soon as it is bred, so
+    consumers (the dashboard, loggers, stopping rules) process the run as it goes instead of buffering it.
+    ga() iterates over an Evolution, and a seeded Evolution yields the generations of the seeded ga() run.
+
+    The population is initialized and evaluated when the Evolution is created, and the generations run
+    while it is iterated. Breaking out of the loop stops the run (and its OffspringPool, see close), and
+    the current state stays available: population, fitnesses, raw_fitnesses (before fitness sharing), jumped_ks_flags,
+    generation, evaluations and best().
+
+    The run ends after num_generations generations, or earlier when one of the stopping criteria fires
+    (stall_generations, target_fitness, max_evaluations, time_limit). The criteria are checked on the raw
+    fitnesses after every generation, before fitness sharing, so the last generation is never shared;
+    stop_reason records the criterion that ended the run.
+
+    With a checkpoint_path, the state of the run is written to a checkpoint every checkpoint_interval generations
+    and after the last one (see checkpoint). An Evolution created with the same parameters and resume_from
+    continues the run from its checkpoint exactly as if it had never stopped: it yields the same generations
+    and ends with the same population.
+
+    Only the current generation is kept in memory. With keep_history, best_routes and best_fitnesses also hold the
+    best route and fitness of every generation, and checkpoints carry them, so that a resumed run has the whole history.
+
+    Parameters:
+    - The parameters of ga() except visualize and dashboard; verbose prints the same output as ga().
+    - keep_history (bool): Whether to keep the best route and fitness of every generation.
+
+    Example Usage:
+        evolution = Evolution(matrix_seed=1, num_generations=100, selection=batch_tournament_selection)
+        for snapshot in evolution:
+            print(snapshot.generation, snapshot.best_fitness, snapshot.genotypic_diversity)
+        best_individual, best_fitness, jumped_ks = evolution.best()
+    """
+
+    def __init__(self,
+                 initializer=population,
+                 evaluator=batch_fitness,
+                 selection=tournament_selection,
+                 crossover=order_crossover,
+                 mutation=swap_mutation,
+                 mutation_rate=0.1,
+                 population_size=100,
+                 num_generations=50,
+                 crossover_rate=0.7,
+                 elitism_size=2,
+                 elitism=True,
+                 matrix_to_use=None,
+                 matrix_seed=None,
+                 verbose=False,
+                 fitness_sharing=True,
+                 fitness_cache_size=None,
+                 constraints=None,
+                 instance=None,
+                 local_search=two_opt,
+                 exact_max_areas=None,
+                 workers=None,
+                 timer=None,
+                 stall_generations=None,
+                 target_fitness=None,
+                 max_evaluations=None,
+                 time_limit=None,
+                 checkpoint_path=None,
+                 checkpoint_interval=10,
+                 resume_from=None,
+                 keep_history=False):
+        self.start_time = time.perf_counter()
+        checkpoint = None if resume_from is None else load_checkpoint(resume_from)
+        if instance is None:
+            # initialize the population (a resumed run takes it from the checkpoint)
+            population = initializer(population_size) if checkpoint is None else checkpoint['population']
+
+            # select the Geo matrix to use (original=True uses the original matrix from the project instructions)
+            if matrix_to_use is None:
+                matrix = geo_matrix_generator(seed=matrix_seed) if checkpoint is None else checkpoint['matrix']
+            else:
+                matrix = np.array(matrix_to_use)
+            codec, jump_areas, candidates = AREA_CODEC, JUMP_AREAS, None
+        else:
+            # the instance brings its own areas, Geo matrix, constraints and candidate lists
+            population = initializer(population_size, instance=instance) if checkpoint is None else checkpoint['population']
+            matrix = instance.geo_matrix
+            codec, jump_areas, candidates = instance.codec, instance.jump_areas, instance.candidates
+            if constraints is None:
+                constraints = instance.constraints
+
+        # compile the route constraints once for the whole run
+        if constraints is not None and not isinstance(constraints, CompiledConstraints):
+            constraints = compile_constraints(constraints, codec.index)
+        evaluator_options = None
+        if constraints is not None or instance is not None:
+            evaluator_options = dict(constraints=constraints, jump_areas=jump_areas)
+        self.base_evaluator = evaluator
+        if evaluator_options:
+            evaluator = bind_evaluator(evaluator, **evaluator_options)
+
+        # memoize route fitnesses (the cache belongs to this run and therefore to this Geo matrix)
+        if fitness_cache_size:
+            evaluator = FitnessCache(evaluator, capacity=fitness_cache_size)
+
+        if local_search is None:
+            local_searches = []
+        elif callable(local_search):
+            local_searches = [local_search]
+        else:
+            local_searches = list(local_search)
+
+        self.selection, self.crossover, self.mutation = selection, crossover, mutation
+        self.mutation_rate, self.crossover_rate = mutation_rate, crossover_rate
+        self.population_size, self.num_generations = population_size, num_generations
+        self.elitism, self.elitism_size = elitism, elitism_size
+        self.fitness_sharing, self.fitness_cache_size = fitness_sharing, fitness_cache_size
+        self.verbose, self.workers = verbose, workers
+        self.timer = NULL_TIMER if timer is None else timer
+        self.instance, self.matrix, self.codec = instance, matrix, codec
+        self.constraints, self.jump_areas = constraints, jump_areas
+        self.evaluator, self.evaluator_options = evaluator, evaluator_options
+        self.local_searches = local_searches
+        self.search_options = dict(constraints=constraints, jump_areas=jump_areas, candidates=candidates)
+        self.population = population
+        self.generation = 0
+        self.pool = None
+        self._generations = None
+
+        # the best route and fitness of every generation, with keep_history
+        self.keep_history = keep_history
+        self.best_routes, self.best_fitnesses = [], []
+        self.checkpoint_path, self.checkpoint_interval = checkpoint_path, checkpoint_interval
+        self.resumed_from = resume_from
+
+        # stopping criteria
+        self.stall_generations, self.target_fitness = stall_generations, target_fitness
+        self.max_evaluations, self.time_limit = max_evaluations, time_limit
+        self.stop_reason = None
+        self.evaluations = 0
+        self.best_raw_fitness, self.stalled_generations = None, 0
+
+        # small instances have a proven optimum
+        self.exact = exact_max_areas is not None and len(codec) - 1 <= exact_max_areas
+        if not self.exact and checkpoint is not None:
+            self._restore(checkpoint)
+        elif not self.exact:
+            # compute fitness for each individual in the population
+            with self.timer.phase('evaluation'):
+                self.fitnesses, self.jumped_ks_flags = evaluate_population(evaluator, population, matrix)
+            self.raw_fitnesses = self.fitnesses
+            self.evaluations = len(population)
+            self.best_raw_fitness = max(self.fitnesses)
+
+    def improve(self, routes):
+        """
+        Applies the local searches to each route in turn.
+        """
+        for search in self.local_searches:
+            routes = [search(route, self.matrix, **self.search_options) for route in routes]
+        return routes
+
+    def best(self):
+        """
+        Returns the best individual of the current population, its fitness and its jumped_ks flag.
+        """
+        best = int(np.argmax(self.fitnesses))
+        return self.population[best], self.fitnesses[best], self.jumped_ks_flags[best]
+
+    def elapsed(self):
+        """
+        Returns the wall time since the creation of the run, in seconds.
+        """
+        return time.perf_counter() - self.start_time
+
+    def checkpoint(self, path=None):
+        """
+        Writes the state of the run to a compressed checkpoint (see utils/checkpoint.py): the population, its
+        fitnesses, the best route and fitness of every generation, the counters of the stopping criteria and
+        the states of the random and numpy.random generators.
+
+        Parameters:
+        - path (str, optional): The checkpoint file, checkpoint_path by default.
+
+        Returns:
+        - str: The checkpoint file.
+
+        Example Usage:
+            evolution.checkpoint('run.ckpt')
+            evolution = Evolution(matrix_seed=1, resume_from='run.ckpt')
+        """
+        path = self.checkpoint_path if path is None else path
+        width = self.population.shape[1]
+        save_checkpoint(path, population=self.population, **number_arrays('fitnesses', self.fitnesses),
+                        **number_arrays('raw_fitnesses', self.raw_fitnesses),
+                        jumped_ks_flags=np.asarray(self.jumped_ks_flags, dtype=bool), matrix=self.matrix,
+                        generation=self.generation, evaluations=self.evaluations,
+                        best_raw_fitness=self.best_raw_fitness, stalled_generations=self.stalled_generations,
+                        stop_reason=self.stop_reason or '', seconds=self.elapsed(),
+                        best_routes=np.array(self.best_routes, dtype=self.population.dtype).reshape(-1, width),
+                        **number_arrays('best_fitnesses', self.best_fitnesses), **random_state())
+        return path
+
+    def _restore(self, checkpoint):
+        # continue the run of a checkpoint from its last generation
+        if not np.array_equal(checkpoint['matrix'], self.matrix):
+            raise ValueError(f"The checkpoint {self.resumed_from} was written by a run with a different Geo matrix")
+        if self.population.shape != (self.population_size, len(self.codec) + 1):
+            raise ValueError(f"The checkpoint {self.resumed_from} holds {len(self.population)} routes of "
+                             f"{self.population.shape[1]} areas, not {self.population_size} routes of {len(self.codec) + 1}")
+        self.fitnesses = read_numbers(checkpoint, 'fitnesses')
+        self.raw_fitnesses = read_numbers(checkpoint, 'raw_fitnesses')
+        self.jumped_ks_flags = checkpoint['jumped_ks_flags'].tolist()
+        self.generation, self.evaluations = int(checkpoint['generation']), int(checkpoint['evaluations'])
+        self.best_raw_fitness = checkpoint['best_raw_fitness'].item()
+        self.stalled_generations = int(checkpoint['stalled_generations'])
+        self.stop_reason = str(checkpoint['stop_reason']) or None
+        if self.keep_history:
+            self.best_routes = list(checkpoint['best_routes'])
+            self.best_fitnesses = read_numbers(checkpoint, 'best_fitnesses')
+        # the time limit covers the whole run
+        self.start_time -= float(checkpoint['seconds'])
+        set_random_state(checkpoint)
+
+    def _stopping_criterion(self, raw_best_fitness, generation_seconds):
+        # the criterion that ends the run after the current generation, None to go on
+        if raw_best_fitness > self.best_raw_fitness:
+            self.best_raw_fitness, self.stalled_generations = raw_best_fitness, 0
+        else:
+            self.stalled_generations += 1
+        if self.target_fitness is not None and self.best_raw_fitness >= self.target_fitness:
+            return 'target_fitness'
+        if self.stall_generations is not None and self.stalled_generations >= self.stall_generations:
+            return 'stall_generations'
+        if self.generation >= self.num_generations:
+            return 'num_generations'
+        # stop when the next generation would exceed the budgets
+        if self.max_evaluations is not None and self.evaluations + self.population_size > self.max_evaluations:
+            return 'max_evaluations'
+        if self.time_limit is not None and self.elapsed() + generation_seconds > self.time_limit:
+            return 'time_limit'
+        return None
+
+    def __iter__(self):
+        if self._generations is None:
+            self._generations = self._run()
+        return self._generations
+
+    def close(self):
+        """
+        Stops the run, and its OffspringPool, when the iteration is left before the last generation.
+        """
+        if self._generations is not None:
+            self._generations.close()
+
+    def _run(self):
+        timer, verbose, codec = self.timer, self.verbose, self.codec
+        if self.exact:
+            start = time.perf_counter()
+            best_individual, best_fitness, jumped_ks = exhaustive_search(self.matrix, instance=self.instance,
+                                                                         constraints=self.constraints,
+                                                                         jump_areas=self.jump_areas)
+            self.population, self.fitnesses, self.jumped_ks_flags = best_individual[np.newaxis], [best_fitness], [jumped_ks]
+            self.raw_fitnesses = self.fitnesses
+            self.evaluations, self.stop_reason = math.factorial(len(codec) - 1), 'exhaustive_search'
+            if self.keep_history:
+                self.best_routes, self.best_fitnesses = [best_individual.copy()], [best_fitness]
+            if verbose:
+                print(f"{'Exhaustive Search:':<30} {codec.decode(best_individual)} {best_fitness}"
+                      f" ({'jumped' if jumped_ks else 'did not jump'} KS)")
+            yield GenerationSnapshot(0, best_individual.copy(), best_fitness, jumped_ks, 0.0, 0.0,
+                                     time.perf_counter() - start, evaluations=self.evaluations)
+            return
+
+        if verbose:
+            print('RESULTS START')
+            print("="*50)
+            if self.resumed_from is not None:
+                print(f"{'Resumed From:':<30} {self.resumed_from} (generation {self.generation})")
+            print(f"{'Initial Best Fitness:':<30} {max(self.fitnesses)}")
+            print(f"{'Population Size:':<30} {self.population_size}")
+            print(f"{'Number of Generations:':<30} {self.num_generations}")
+            print(f"{'Geo Matrix:':<30}")
+            print(self.matrix)
+            print("="*50)
+
+        # the worker processes share the Geo matrix for the whole run
+        if self.workers:
+            self.pool = OffspringPool(self.workers, self.matrix, self.base_evaluator, self.evaluator_options,
+                                      self.local_searches, self.search_options, cache_size=self.fitness_cache_size)
+
+        num_generations = self.num_generations
+        if self.stop_reason is None and self.max_evaluations is not None \
+                and self.evaluations + self.population_size > self.max_evaluations:
+            self.stop_reason = 'max_evaluations'
+        try:
+            while self.generation < num_generations and self.stop_reason is None:
+                generation = self.generation
+                start = time.perf_counter()
+                timer.start_generation()
+                population, fitnesses, jumped_ks_flags = next_generation(
+                    self.population, self.fitnesses, self.population_size, self.selection, self.crossover,
+                    self.mutation, self.mutation_rate, self.crossover_rate, self.elitism, self.elitism_size,
+                    self.evaluator, self.matrix, self.improve, self.pool, timer)
+                self.generation = generation + 1
+                self.evaluations += len(population)
+                self.stop_reason = self._stopping_criterion(max(fitnesses), time.perf_counter() - start)
+                last_generation = self.stop_reason is not None
+
+                raw_fitnesses = fitnesses
+                if not last_generation and self.fitness_sharing:
+                    with timer.phase('fitness_sharing'):
+                        fitnesses = fitness_shared(population, fitnesses)
+
+                current_best_fitness = max(fitnesses)
+                with timer.phase('diversity'):
+                    phenotypic_diversity = np.std(fitnesses)
+                    genotypic_diversity_value = genotypic_diversity(population)
+
+                if verbose:
+                    print(f"{'-'*40}")
+                    print(f'Generation {generation} best fitness {"(lowered due to sharing)" if self.fitness_sharing==True and not last_generation else ""}: {current_best_fitness}')
+                    print(f"{'-'*40}")
+                    print(f'Best individual: {codec.decode(population[np.argmax(fitnesses)])}')
+                    print(f"Phenotypic Diversity: {phenotypic_diversity:.2f}")
+                    print(f"Genotypic Diversity: {genotypic_diversity_value:.2f}")
+                    print(f"{'-'*40}\n")
+
+                self.population, self.fitnesses, self.jumped_ks_flags = population, fitnesses, jumped_ks_flags
+                self.raw_fitnesses = raw_fitnesses
+                best = int(np.argmax(fitnesses))
+                if self.keep_history:
+                    self.best_routes.append(population[best].copy())
+                    self.best_fitnesses.append(current_best_fitness)
+                if self.checkpoint_path is not None and (self.generation % self.checkpoint_interval == 0 or last_generation):
+                    with timer.phase('checkpoint'):
+                        self.checkpoint()
+                yield GenerationSnapshot(generation, population[best].copy(), current_best_fitness, jumped_ks_flags[best],
+                                         phenotypic_diversity, genotypic_diversity_value, time.perf_counter() - start,
+                                         timer.generations[-1] if timer.enabled else None, self.evaluations)
+        finally:
+            if self.pool is not None:
+                self.pool.close()
+
+        if self.stop_reason is None:
+            self.stop_reason = 'num_generations'
+
+        # print the jump status
+        if verbose:
+            if self.stop_reason != 'num_generations':
+                print(f"{'Stopped Early:':<30} {self.stop_reason} after {self.generation} generations "
+                      f"and {self.evaluations} evaluations ({self.elapsed():.2f}s)")
+            jumped_ks = self.best()[2]
+            if jumped_ks:
+                print(f"The best individual in the last generation jumped KS.")
+            else:
+                print(f"The best individual in the last generation did not jump KS.")
+            if self.fitness_cache_size:
+                cache_stats = self.evaluator.stats()
+                if self.pool is not None:
+                    # add the caches of the worker processes
+                    for key, value in self.pool.cache_stats().items():
+                        cache_stats[key] += value
+                    lookups = cache_stats['hits'] + cache_stats['misses']
+                    cache_stats['hit_rate'] = cache_stats['hits'] / lookups if lookups else 0.0
+                print(f"{'Fitness Cache:':<30} {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                      f"{cache_stats['evictions']} evictions ({cache_stats['hit_rate']:.1%} hit rate)")
+            if timer.enabled:
+                timer.report()
+
+
 def ga(initializer=population,
-       evaluator=fitness_function,
+       evaluator=batch_fitness,
        selection=tournament_selection,
        crossover=order_crossover,
        mutation=swap_mutation,
@@ -31,7 +677,22 @@ def ga(initializer=population,
        verbose=True,
        visualize=True,
        dashboard=True,
-       fitness_sharing=True):
+       fitness_sharing=True,
+       fitness_cache_size=None,
+       constraints=None,
+       instance=None,
+       local_search=two_opt,
+       exact_max_areas=None,
+       workers=None,
+       timer=None,
+       callbacks=None,
+       stall_generations=None,
+       target_fitness=None,
+       max_evaluations=None,
+       time_limit=None,
+       checkpoint_path=None,
+       checkpoint_interval=10,
+       resume_from=None):
     """
     This algorithm simulates natural selection by evolving a population of candidate solutions
     through selection, crossover, and mutation. Over successive generations, it selects the fittest
@@ -39,11 +700,15 @@ def ga(initializer=population,
     aiming to find the best solution.
 
     Parameters:
-    - initializer (function): Function to initialize the population.
-    - evaluator (function): Function to evaluate the fitness of individuals.
-    - selection (function): Function to select individuals for crossover.
-    - crossover (function): Function to perform crossover between individuals.
-    - mutation (function): Function to mutate individuals.
+    - initializer (function): Function to initialize the population as a 2-D array of encoded routes.
+    - evaluator (function): Function to evaluate the fitness of individuals, either one at a time
+      (fitness_function) or the whole population at once (batch_fitness).
+    - selection (function): Function to select individuals for crossover, either one parent at a time
+      (tournament_selection) or the index pairs of all parents of a generation at once (batch_tournament_selection).
+    - crossover (function): Function to perform crossover between individuals, either one pair at a time
+      (order_crossover) or every pair of a generation at once (batch_order_crossover).
+    - mutation (function): Function to mutate individuals, either one at a time (swap_mutation) or every
+      child of a generation at once (batch_swap_mutation).
     - matrix_to_use (list of lists, optional): Predefined Geo matrix to use.
     - matrix_seed (int, optional): Seed for Geo matrix generation.
     - mutation_rate (float): Probability of mutation.
@@ -53,13 +718,50 @@ def ga(initializer=population,
     - elitism_size (int): Number of top individuals to carry over to the next generation.
     - elitism (bool): Whether to use elitism.
     - verbose (bool): Whether to print verbose output.
-    - visualize (bool): Whether to visualize the routes.
+    - visualize (bool or str): Whether to visualize the routes. A file name (routes.mp4, routes.gif or routes.png)
+      exports the animation to it instead of displaying it (see export_routes_animation), for machines without a display.
     - dashboard (bool): Whether to run the dashboard.
     - fitness_sharing (bool): Whether to use fitness sharing.
+    - fitness_cache_size (int, optional): Capacity of an LRU cache of route fitnesses used by the evaluator.
+      None disables the cache.
+    - constraints (list of dict, optional): Route constraint spec (see ROUTE_CONSTRAINTS in utils/constraints.py)
+      used by the evaluator and two_opt instead of the constraints of the game.
+    - instance (Instance, optional): Problem instance to solve (see utils/instance.py), with any number of areas.
+      Its Geo matrix, constraints and candidate lists are used instead of matrix_to_use and matrix_seed,
+      and the initializer is called with instance=instance.
+    - local_search (function or list of functions, optional): Local search applied to every child, such as
+      two_opt or or_opt. A list applies each function in turn, None disables local search.
+    - exact_max_areas (int, optional): Solve instances with at most this many areas besides the depot with
+      exhaustive_search instead of evolving a population (9 covers the game in well under a second).
+    - workers (int, optional): Run the local search and the evaluation of the offspring on a pool of this many
+      processes (see OffspringPool in ga/parallel.py). The results are the same as the serial mode's for the
+      same seed. None runs everything in this process.
+    - timer (PhaseTimer, optional): Accumulates the wall time and call count of every phase of the run (selection,
+      crossover, mutation, local search, evaluation, fitness sharing, diversity), in total and per generation,
+      and prints them when verbose is True. None disables the instrumentation.
+    - callbacks (list of functions, optional): Functions called with the GenerationSnapshot of every generation
+      as soon as it is bred (see Evolution to iterate over the generations instead).
+    - stall_generations (int, optional): Stop when the best fitness has not improved for this many generations.
+    - target_fitness (float, optional): Stop as soon as a route reaches this fitness.
+    - max_evaluations (int, optional): Stop before the generation that would evaluate more routes than this in total.
+    - time_limit (float, optional): Stop before the generation that would end more than this many seconds after
+      the start of the run (estimated from the duration of the previous generation).
+      The criteria can be combined; the first one to fire ends the run, and the last generation is never shared.
+    - checkpoint_path (str, optional): Write the state of the run (population, fitnesses, history, counters and
+      random states) to this file every checkpoint_interval generations and after the last one.
+    - checkpoint_interval (int): The number of generations between two checkpoints.
+    - resume_from (str, optional): Continue the run saved in this checkpoint, with the same parameters otherwise;
+      the result is the one of the uninterrupted run (the routes and fitness scores of every generation included,
+      when the checkpoint was written by ga() with the dashboard or the visualization). The Geo matrix is taken
+      from the checkpoint unless matrix_to_use or instance is given.
 
     Returns:
     - tuple: Contains routes per generation, fitness per generation, best individual, best fitness, and Geo matrix if dashboard is True.
+      Routes are encoded arrays of area indices; use AREA_CODEC.decode to get the area initials.
     - tuple: Contains best individual and best fitness if dashboard is False.
+      Both are RunResult tuples, which also record the stop_reason ('num_generations', 'stall_generations',
+      'target_fitness', 'max_evaluations', 'time_limit' or 'exhaustive_search') and the generations,
+      evaluations and seconds actually spent.
 
     Example Usage: 
     if __name__ == "__main__":
@@ -75,105 +777,39 @@ def ga(initializer=population,
             routes, fitnesses, best_route, best_fitness, matrix = result
             run_dashboard(routes, fitnesses, best_route, matrix)
     """
-    # initialize the population
-    population = initializer(population_size)
-    
-    # select the Geo matrix to use (original=True uses the original matrix from the project instructions)
-    if matrix_to_use is None:
-        matrix = geo_matrix_generator(seed=matrix_seed)
-    else:
-        matrix = np.array(matrix_to_use)
-    
-    # compute fitness for each individual in the population
-    fitness_results = [evaluator(ind, matrix) for ind in population]
-    fitnesses = [result[0] for result in fitness_results]
-    jumped_ks_flags = [result[1] for result in fitness_results]
-    
-    if verbose:
-        print('RESULTS START')
-        print("="*50)
-        print(f"{'Initial Best Fitness:':<30} {max(fitnesses)}")
-        print(f"{'Population Size:':<30} {population_size}")
-        print(f"{'Number of Generations:':<30} {num_generations}")
-        print(f"{'Geo Matrix:':<30}")
-        print(matrix)
-        print("="*50)
-    
-    routes_per_generation = []  # store routes here
-    fitness_per_generation = []  # store fitness scores here
-    
-    for generation in range(num_generations):    
-        if elitism:
-            # select the individuals to be carried over to the next generation
-            sorted_indices = np.argsort(fitnesses)
-            elite_indices = sorted_indices[-elitism_size:]
-            offspring = [population[i] for i in elite_indices]
-        else:
-            offspring = []
-         
-        while len(offspring) < population_size:
-            p1 = selection(population, fitnesses)
-            p2 = selection(population, fitnesses)
-         
-            if random.random() < crossover_rate:
-                c1, c2 = crossover(p1, p2)
-            else:
-                c1, c2 = p1, p2
-              
-            c1 = mutation(c1, mutation_rate)
-            c2 = mutation(c2, mutation_rate)
-         
-            c1 = two_opt(c1, matrix)
-            c2 = two_opt(c2, matrix)
-         
-            offspring.extend([c1, c2])
-         
-        population = offspring[:population_size]
-        fitness_results = [evaluator(ind, matrix) for ind in population]
-        fitnesses = [result[0] for result in fitness_results]
-        jumped_ks_flags = [result[1] for result in fitness_results]
-     
-        if generation < num_generations - 1 and fitness_sharing:
-            fitnesses = fitness_shared(population, fitnesses)
-            
-        current_best_fitness = max(fitnesses)
-        phenotypic_diversity = np.std(fitnesses)
-        genotypic_diversity_value = genotypic_diversity(population)
-            
-        if verbose:
-            print(f"{'-'*40}")
-            print(f'Generation {generation} best fitness {"(lowered due to sharing)" if fitness_sharing==True and generation<(num_generations-1) else ""}: {current_best_fitness}')
-            print(f"{'-'*40}")
-            print(f'Best individual: {population[np.argmax(fitnesses)]}')
-            print(f"Phenotypic Diversity: {phenotypic_diversity:.2f}")
-            print(f"Genotypic Diversity: {genotypic_diversity_value:.2f}")
-            print(f"{'-'*40}\n")
-
-        best_individual = population[np.argmax(fitnesses)]
-        routes_per_generation.append(best_individual)
-        fitness_per_generation.append(current_best_fitness)
-    
+    # the routes of every generation are only kept for the dashboard and the visualization
+    keep_history = bool(dashboard or visualize)
+    evolution = Evolution(initializer, evaluator, selection, crossover, mutation, mutation_rate, population_size,
+                          num_generations, crossover_rate, elitism_size, elitism, matrix_to_use, matrix_seed, verbose,
+                          fitness_sharing, fitness_cache_size, constraints, instance, local_search, exact_max_areas,
+                          workers, timer, stall_generations=stall_generations, target_fitness=target_fitness,
+                          max_evaluations=max_evaluations, time_limit=time_limit, checkpoint_path=checkpoint_path,
+                          checkpoint_interval=checkpoint_interval, resume_from=resume_from,
+                          keep_history=keep_history and (checkpoint_path is not None or resume_from is not None))
+
+    # the routes and fitness scores of every generation, starting with those of the checkpoint of a resumed run
+    routes_per_generation = list(evolution.best_routes)  # store routes here
+    fitness_per_generation = list(evolution.best_fitnesses)  # store fitness scores here
+    for snapshot in evolution:
+        if keep_history:
+            routes_per_generation.append(snapshot.best_route)
+            fitness_per_generation.append(snapshot.best_fitness)
+        for callback in callbacks or []:
+            callback(snapshot)
+
     # get the best individual and its fitness
-    best_individual, best_fitness = population[np.argmax(fitnesses)], max(fitnesses)
-    
-    # check if the best individual jumped KS
-    jumped_ks = jumped_ks_flags[np.argmax(fitnesses)]
-    
-    # print the jump status
-    if verbose:
-        if jumped_ks:
-            print(f"The best individual in the last generation jumped KS.")
-        else:
-            print(f"The best individual in the last generation did not jump KS.")
-    
+    best_individual, best_fitness, jumped_ks = evolution.best()
+
     # visualize the routes if the visualize parameter is True
-    if visualize:
-        visualize_routes(routes_per_generation, best_individual)
-    
-    if dashboard:
-        print('INITIALIZING DASHBOARD....')
-        return routes_per_generation, fitness_per_generation, best_individual, best_fitness, matrix
-    
-    return best_individual, best_fitness
+    if visualize and not evolution.exact:
+        visualize_routes(routes_per_generation, best_individual, codec=evolution.codec,
+                         coordinates=None if instance is None else instance.coordinates,
+                         path=visualize if isinstance(visualize, str) else None)
 
+    if dashboard:
+        if not evolution.exact:
+            print('INITIALIZING DASHBOARD....')
+        return RunResult((routes_per_generation, fitness_per_generation, best_individual, best_fitness, evolution.matrix),
+                         evolution)
 
+    return RunResult((best_individual, best_fitness), evolution)
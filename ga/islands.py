@@ -0,0 +1,237 @@
+import sys
+import os
+import random
+import traceback
+import numpy as np
+from multiprocessing import Pipe, Process
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from operators.selection_algorithms import tournament_selection
+from operators.crossovers import order_crossover
+from operators.mutators import swap_mutation
+from operators.optimizations import two_opt
+from pop.population import population
+from utils.utils import AREA_CODEC, batch_fitness, fitness_shared, geo_matrix_generator
+from utils.constraints import CompiledConstraints, compile_constraints
+
+# the ga() options that can be set per island
+ISLAND_OPTIONS = ('initializer', 'evaluator', 'selection', 'crossover', 'mutation', 'mutation_rate', 'population_size',
+                  'crossover_rate', 'elitism_size', 'elitism', 'fitness_sharing', 'fitness_cache_size', 'local_search')
+
+
+def migration_targets(islands, topology='ring', rng=np.random):
+    """
+    Returns the island every island sends its migrants to.
+
+    On a 'ring' island i always sends to island i + 1. The 'random' topology draws a new ring over a random
+    order of the islands at every migration, so no island sends to itself.
+
+    Parameters:
+        islands (int): The number of islands.
+        topology (str): 'ring' or 'random'.
+        rng (numpy.random.RandomState, optional): The generator of the random rings, numpy.random by default.
+
+    Returns:
+        numpy.ndarray: The target island of every island.
+
+    Example Usage:
+        migration_targets(4)  # Output: array([1, 2, 3, 0])
+    """
+    if topology == 'ring':
+        order = np.arange(islands)
+    elif topology == 'random':
+        order = rng.permutation(islands)
+    else:
+        raise ValueError(f"Unknown migration topology '{topology}', expected 'ring' or 'random'")
+    targets = np.empty(islands, dtype=int)
+    targets[order] = np.roll(order, -1)
+    return targets
+
+
+def _receive_immigrants(evolution, immigrants, ranking):
+    # replaces the worst individuals of an island (ranking is its ascending fitness order) with the immigrants
+    if not len(immigrants):
+        return
+    from ga.genetic_algorithm import evaluate_population
+    immigrant_fitnesses, immigrant_flags = evaluate_population(evolution.evaluator, immigrants, evolution.matrix)
+    evolution.evaluations += len(immigrants)
+    raw_fitnesses, jumped_ks_flags = list(evolution.raw_fitnesses), list(evolution.jumped_ks_flags)
+    for index, route, fitness, jumped_ks in zip(ranking, immigrants, immigrant_fitnesses, immigrant_flags):
+        evolution.population[index], raw_fitnesses[index], jumped_ks_flags[index] = route, fitness, jumped_ks
+    # share the fitnesses of the merged population again, as the generation of the residents was
+    fitnesses = raw_fitnesses
+    if evolution.fitness_sharing and evolution.stop_reason is None:
+        fitnesses = fitness_shared(evolution.population, raw_fitnesses)
+    evolution.fitnesses, evolution.raw_fitnesses, evolution.jumped_ks_flags = fitnesses, raw_fitnesses, jumped_ks_flags
+
+
+def _evolve_island(connection, island, seed, options, matrix, instance, constraints, num_generations,
+                   migration_interval, migration_size):
+    # runs one island in its own process, exchanging migrants with island_ga() every migration_interval generations
+    from ga.genetic_algorithm import Evolution
+    try:
+        random.seed(seed)
+        np.random.seed(seed)
+        evolution = Evolution(**options, num_generations=num_generations, constraints=constraints, instance=instance,
+                              matrix_to_use=matrix if instance is None else None)
+        best_curve = []
+        for snapshot in evolution:
+            best_curve.append(snapshot.best_fitness)
+            if evolution.generation % migration_interval or evolution.generation == num_generations:
+                continue
+
+            # send copies of the best individuals and replace the worst ones with the migrants received
+            ranking = np.argsort(evolution.fitnesses, kind='stable')
+            connection.send(('migrants', best_curve, evolution.population[ranking[::-1][:migration_size]].copy()))
+            best_curve = []
+            _receive_immigrants(evolution, connection.recv(), ranking)
+
+        best_individual, best_fitness, jumped_ks = evolution.best()
+        connection.send(('done', best_curve, best_individual, best_fitness, jumped_ks))
+    except Exception:
+        connection.send(('error', traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+def island_ga(islands=4,
+              migration_interval=5,
+              migration_size=2,
+              topology='ring',
+              island_options=None,
+              seed=None,
+              initializer=population,
+              evaluator=batch_fitness,
+              selection=tournament_selection,
+              crossover=order_crossover,
+              mutation=swap_mutation,
+              mutation_rate=0.1,
+              population_size=100,
+              num_generations=50,
+              crossover_rate=0.7,
+              elitism_size=2,
+              elitism=True,
+              matrix_to_use=None,
+              matrix_seed=None,
+              verbose=True,
+              fitness_sharing=False,
+              fitness_cache_size=None,
+              constraints=None,
+              instance=None,
+              local_search=two_opt):
+    """
+    Island-model genetic algorithm: evolves several sub-populations in separate processes, one per island,
+    with the generations of ga() (see next_generation).
+
+    Every migration_interval generations each island sends copies of its migration_size best individuals
+    over a pipe, and they replace the worst individuals of the next island of the topology. Islands only
+    exchange a few routes, so they scale with the number of cores, and their separate evolution keeps the
+    diversity that fitness sharing otherwise buys at O(n²) per generation (fitness sharing is therefore
+    off by default).
+
+    Parameters:
+    - islands (int): Number of islands (and processes).
+    - migration_interval (int): Number of generations between migrations.
+    - migration_size (int): Number of individuals sent by every island at each migration.
+    - topology (str): 'ring' to always send to the next island, 'random' to draw a new ring at every
+      migration (see migration_targets).
+    - island_options (list of dict, optional): Per-island overrides of the ga() options listed in
+      ISLAND_OPTIONS, such as {'crossover': cycle_crossover} for one island.
+    - seed (int, optional): Seed of the run. Island i seeds the random and numpy.random generators with
+      seed + i, so a run can be repeated. None draws a seed.
+    - The other parameters are those of ga(), shared by every island. The Geo matrix is resolved once,
+      so every island solves the same problem.
+
+    Returns:
+    - tuple: The best individual, its fitness, the best fitness curve of every island (one list per island,
+      one value per generation) and the global best fitness curve (the best island at every generation).
+
+    Example Usage:
+        best_individual, best_fitness, island_curves, global_curve = island_ga(
+            islands=4, migration_interval=5, topology='random', matrix_seed=1,
+            island_options=[{}, {'crossover': cycle_crossover}, {'mutation': inversion_mutation}, {}])
+    """
+    if migration_size < 0 or migration_interval < 1:
+        raise ValueError("migration_interval must be positive and migration_size non-negative")
+    island_options = list(island_options or [])
+    if len(island_options) > islands:
+        raise ValueError(f"{len(island_options)} island options were given for {islands} islands")
+    for options in island_options:
+        unknown = set(options) - set(ISLAND_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown island options {sorted(unknown)}, expected some of {ISLAND_OPTIONS}")
+
+    # every island solves the same problem
+    if instance is None:
+        if matrix_to_use is None:
+            matrix = geo_matrix_generator(seed=matrix_seed)
+        else:
+            matrix = np.array(matrix_to_use)
+        codec = AREA_CODEC
+    else:
+        matrix = instance.geo_matrix
+        codec = instance.codec
+        if constraints is None:
+            constraints = instance.constraints
+    if constraints is not None and not isinstance(constraints, CompiledConstraints):
+        constraints = compile_constraints(constraints, codec.index)
+
+    if seed is None:
+        seed = np.random.randint(0, 2**31 - islands)
+    topology_rng = np.random.RandomState(seed)
+    shared_options = dict(initializer=initializer, evaluator=evaluator, selection=selection, crossover=crossover,
+                          mutation=mutation, mutation_rate=mutation_rate, population_size=population_size,
+                          crossover_rate=crossover_rate, elitism_size=elitism_size, elitism=elitism,
+                          fitness_sharing=fitness_sharing, fitness_cache_size=fitness_cache_size,
+                          local_search=local_search)
+
+    connections, processes = [], []
+    try:
+        for island in range(islands):
+            options = dict(shared_options, **(island_options[island] if island < len(island_options) else {}))
+            if migration_size > options['population_size']:
+                raise ValueError(f"Island {island} cannot send {migration_size} migrants from a population of "
+                                 f"{options['population_size']}")
+            connection, island_connection = Pipe()
+            process = Process(target=_evolve_island, daemon=True,
+                              args=(island_connection, island, seed + island, options, matrix, instance, constraints,
+                                    num_generations, migration_interval, migration_size))
+            process.start()
+            island_connection.close()
+            connections.append(connection)
+            processes.append(process)
+
+        island_curves = [[] for _ in range(islands)]
+        while True:
+            messages = [connection.recv() for connection in connections]
+            for island, message in enumerate(messages):
+                if message[0] == 'error':
+                    raise RuntimeError(f"Island {island} failed:\n{message[1]}")
+                island_curves[island].extend(message[1])
+            if messages[0][0] == 'done':
+                break
+
+            # forward the migrants along the topology
+            targets = migration_targets(islands, topology, topology_rng)
+            for island, target in enumerate(targets):
+                connections[target].send(messages[island][2])
+            if verbose:
+                print(f"Generation {len(island_curves[0]) - 1} island best fitness: "
+                      f"{[curve[-1] for curve in island_curves]} (migrated along {targets.tolist()})")
+    finally:
+        for connection in connections:
+            connection.close()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    global_curve = [max(values) for values in zip(*island_curves)]
+    best_island = max(range(islands), key=lambda island: messages[island][3])
+    _, _, best_individual, best_fitness, jumped_ks = messages[best_island]
+    if verbose:
+        print(f"{'Best Island:':<30} {best_island}")
+        print(f"{'Best Individual:':<30} {codec.decode(best_individual)}")
+        print(f"{'Best Fitness:':<30} {best_fitness} ({'jumped' if jumped_ks else 'did not jump'} KS)")
+    return best_individual, best_fitness, island_curves, global_curve
@@ -0,0 +1,115 @@
+import sys
+import os
+import numpy as np
+from multiprocessing import Pool, shared_memory
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fitness_cache import FitnessCache
+
+# state of a worker process, set once by _init_worker
+_worker = {}
+
+
+def _init_worker(shm_name, shape, dtype, evaluator, evaluator_options, local_searches, search_options, cache_size):
+    # attach to the shared Geo matrix (keeping the segment open for the lifetime of the worker)
+    from ga.genetic_algorithm import bind_evaluator
+    segment = shared_memory.SharedMemory(name=shm_name)
+    matrix = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+    if evaluator_options:
+        evaluator = bind_evaluator(evaluator, **evaluator_options)
+    if cache_size:
+        evaluator = FitnessCache(evaluator, capacity=cache_size)
+    _worker.update(segment=segment, matrix=matrix, evaluator=evaluator,
+                   local_searches=local_searches, search_options=search_options)
+
+
+def _improve_and_evaluate(children):
+    # local search and evaluation of a chunk of children inside a worker
+    from ga.genetic_algorithm import evaluate_population
+    matrix, evaluator = _worker['matrix'], _worker['evaluator']
+    routes = list(children)
+    for search in _worker['local_searches']:
+        routes = [search(route, matrix, **_worker['search_options']) for route in routes]
+    routes = np.array(routes, dtype=children.dtype).reshape(children.shape[0], -1)
+    fitnesses, jumped_ks_flags = evaluate_population(evaluator, routes, matrix)
+    cache_stats = evaluator.stats() if isinstance(evaluator, FitnessCache) else None
+    return routes, fitnesses, jumped_ks_flags, os.getpid(), cache_stats
+
+
+class OffspringPool:
+    """
+    A persistent process pool that runs the local search and the evaluation of the offspring of ga().
+
+    The Geo matrix is published once through multiprocessing.shared_memory and every worker maps it
+    when it starts, so only the routes travel with each task. The offspring of a generation are split
+    into one large chunk per worker, and the results come back in order, so a run gives the same results
+    as the serial mode for the same seed. The evaluator and the local search functions are sent once to
+    every worker and must be picklable (module-level functions such as batch_fitness and two_opt).
+
+    Parameters:
+        workers (int): The number of worker processes.
+        matrix (numpy.ndarray): The Geo matrix.
+        evaluator (function): The evaluator, before binding any options.
+        evaluator_options (dict, optional): The keyword options bound to the evaluator (see bind_evaluator).
+        local_searches (list of function): The local searches applied to every child, in turn.
+        search_options (dict, optional): The keyword options of the local searches.
+        cache_size (int, optional): The capacity of the FitnessCache of every worker, None for no cache.
+
+    Example Usage:
+        with OffspringPool(4, matrix, batch_fitness, local_searches=[two_opt]) as pool:
+            routes, fitnesses, jumped_ks_flags = pool.improve_and_evaluate(children)
+    """
+
+    def __init__(self, workers, matrix, evaluator, evaluator_options=None, local_searches=(), search_options=None,
+                 cache_size=None):
+        matrix = np.ascontiguousarray(matrix)
+        self.workers = workers
+        self.segment = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=self.segment.buf)[...] = matrix
+        self.worker_cache_stats = {}
+        self.pool = Pool(workers, initializer=_init_worker,
+                         initargs=(self.segment.name, matrix.shape, matrix.dtype, evaluator, evaluator_options,
+                                   list(local_searches), search_options or {}, cache_size))
+
+    def improve_and_evaluate(self, children):
+        """
+        Applies the local searches to the children and evaluates them, split across the workers.
+
+        Parameters:
+            children (numpy.ndarray): The children, one encoded route per row.
+
+        Returns:
+            tuple: The improved children (numpy.ndarray), their fitnesses and their jumped_ks flags (lists).
+        """
+        chunks = [chunk for chunk in np.array_split(children, self.workers) if len(chunk)]
+        routes, fitnesses, jumped_ks_flags = [], [], []
+        for chunk_routes, chunk_fitnesses, chunk_flags, pid, cache_stats in self.pool.map(_improve_and_evaluate, chunks):
+            routes.append(chunk_routes)
+            fitnesses.extend(chunk_fitnesses)
+            jumped_ks_flags.extend(chunk_flags)
+            if cache_stats is not None:
+                self.worker_cache_stats[pid] = cache_stats
+        return np.concatenate(routes), fitnesses, jumped_ks_flags
+
+    def cache_stats(self):
+        """
+        Returns the hits, misses and evictions of the worker caches, summed over the workers.
+        """
+        return {key: sum(stats[key] for stats in self.worker_cache_stats.values())
+                for key in ('hits', 'misses', 'evictions')}
+
+    def close(self):
+        """
+        Stops the workers and releases the shared Geo matrix.
+        """
+        self.pool.close()
+        self.pool.join()
+        self.segment.close()
+        self.segment.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
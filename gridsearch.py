@@ -1,14 +1,21 @@
+import os
+import sys
+import inspect
 import numpy as np
 import itertools
-from multiprocessing import Pool, Manager
+from statistics import NormalDist
+from multiprocessing import Pool
 from tqdm import tqdm
+from functools import lru_cache
 from ga.genetic_algorithm import ga
+from ga.exact import exhaustive_search
 from pop.population import population
 from operators.selection_algorithms import *
 from operators.crossovers import *
 from operators.mutators import *
 from utils.utils import *
-import csv
+from utils.result_store import ResultStore, ResultAggregator, combination_key
+import json
 
 def generate_matrix_gs(seed):
     """
@@ -27,6 +34,24 @@ def generate_matrix_gs(seed):
     matrix = geo_matrix_generator(seed=seed)
     return matrix
 
+@lru_cache(maxsize=None)
+def optimal_fitness(seed):
+    """
+    Compute the proven optimal fitness of the Geo matrix generated with a given seed.
+    Computed once per seed and process.
+
+    Parameters:
+        - seed (int): The seed value for random number generation.
+
+    Returns:
+        - int: The fitness of the optimal route.
+
+    Example Usage:
+        optimum = optimal_fitness(42)
+    """
+    best_route, best_fitness, jumped_ks = exhaustive_search(generate_matrix_gs(seed))
+    return best_fitness
+
 def evaluate_combination(combo):
     """
     Evaluate a combination of genetic algorithm parameters using a specific seed.
@@ -35,7 +60,8 @@ def evaluate_combination(combo):
         - combo (tuple): A tuple containing a seed and a dictionary of parameters.
 
     Returns:
-        - tuple: A tuple containing the parameters and the best fitness achieved.
+        - tuple: A tuple containing the seed, the parameters, the best fitness achieved and its gap to the optimal
+          fitness (None if the run failed).
     
     Example Usage:
         combo = (42, {'population_size': 50, 'num_generations': 50, 'mutation_rate': 0.05})
@@ -45,21 +71,39 @@ def evaluate_combination(combo):
     try:
         matrix = generate_matrix_gs(seed)
         best_individual, best_fitness = ga(**parameters, matrix_to_use=matrix, verbose=False, dashboard=False, visualize=False, fitness_sharing=True)
-        return (parameters, best_fitness)
+        return (seed, parameters, best_fitness, optimal_fitness(seed) - best_fitness)
     except Exception as e:
-        print(f"Error in combination {parameters}: {e}")
-        return (parameters, float('inf'))
+        print(f"Error in combination {combination_key(parameters)}: {e}")
+        return (seed, parameters, None, None)
 
-def perform_grid_search(param_grid, n_seeds=15):
+def perform_grid_search(param_grid, n_seeds=15, store_path='grid_search_results.sqlite', chunksize=None, top_n=5,
+                        leaderboard_interval=None):
     """
     Perform a grid search over the specified parameter grid using multiple seeds.
 
+    Every (seed, combination) result is committed to a ResultStore as soon as it completes, with the
+    combination keyed by stable parameter labels (function names instead of reprs). Running the search
+    again with the same store resumes it: the stored seeds are reused and the completed runs are skipped,
+    so an interrupted search loses no finished run, and a search can be extended with more seeds or
+    parameter values. Failed runs are not stored, so they are retried.
+
+    The results are aggregated in this process as they arrive (see ResultAggregator), which keeps a live
+    top-N leaderboard of the combinations: the progress bar shows the leader, and the whole leaderboard is
+    printed every leaderboard_interval results.
+
     Parameters:
         - param_grid (dict): A dictionary specifying the parameter grid for the grid search.
         - n_seeds (int): The number of seeds to use for random number generation.
+        - store_path (str): The SQLite file of the result store (see utils/result_store.py).
+        - chunksize (int, optional): The number of runs sent to a worker at once, by default about a quarter
+          of the runs per worker, up to 16.
+        - top_n (int): The number of combinations of the leaderboard.
+        - leaderboard_interval (int, optional): Print the leaderboard every this many results.
 
     Returns:
-        - None: Prints the best parameter combination and its average fitness.
+        - ResultAggregator: The aggregated results. Prints the best parameter combination, its average fitness
+          and its average gap to the optimal fitness, and writes them to grid_search_results.csv with one
+          column per hyperparameter.
 
     Example Usage:
         param_grid = {
@@ -67,49 +111,313 @@ def perform_grid_search(param_grid, n_seeds=15):
             'num_generations': [50, 100],
             'mutation_rate': [0.05, 0.1],
         }
-        perform_grid_search(param_grid, n_seeds=15)
+        perform_grid_search(param_grid, n_seeds=15, leaderboard_interval=500)
     """
-    seeds = [np.random.randint(1, 10000) for _ in range(n_seeds)]
-    combinations = [dict(zip(param_grid.keys(), values)) for values in itertools.product(*param_grid.values())]
-    
-    # prepare combination and seed pairs for grid search
-    combos_with_seeds = [(seed, combo) for seed in seeds for combo in combinations]
-
-    with Pool() as pool, Manager() as manager:
-        results = manager.list()
-        with tqdm(total=len(combos_with_seeds)) as pbar:
-            for result in pool.imap_unordered(evaluate_combination, combos_with_seeds):
-                results.append(result)
-                pbar.update(1)
-
-        # aggregate results
-        combination_scores = {}
-        for (parameters, fitness) in results:
-            combo_key = tuple(sorted(parameters.items()))  # create a hashable representation of the dictionary
-            if combo_key not in combination_scores:
-                combination_scores[combo_key] = []
-            combination_scores[combo_key].append(fitness)
-
-        # calculate average fitness for each combination
-        average_scores = {combo: np.mean(scores) for combo, scores in combination_scores.items()}
-
-        # find the combination with the highest average fitness
-        best_combo = max(average_scores, key=average_scores.get)
-        print("Overall best combination:", dict(best_combo))
-        print("Average fitness:", average_scores[best_combo])
-
-        # export results to CSV file
-        with open('grid_search_results.csv', 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(['Parameters', 'Average Fitness'])
-            for combo, score in average_scores.items():
-                writer.writerow([str(combo), score])
+    aggregator = ResultAggregator()
+    with ResultStore(store_path) as store:
+        # a resumed search reuses the seeds of the store
+        seeds = store.seeds(n_seeds, lambda: np.random.randint(1, 10000))
+        combinations = [dict(zip(param_grid.keys(), values)) for values in itertools.product(*param_grid.values())]
+
+        # aggregate the runs of previous searches, and run the other combination and seed pairs
+        for seed, combo_key, fitness, gap in store.results(seeds, combinations):
+            aggregator.add(json.loads(combo_key), fitness, gap)
+        completed = store.completed_keys()
+        combos_with_seeds = [(seed, combo) for seed in seeds for combo in combinations
+                             if (seed, combination_key(combo)) not in completed]
+        print(f"{len(seeds) * len(combinations) - len(combos_with_seeds)} completed runs found in {store_path}, "
+              f"{len(combos_with_seeds)} to run")
+
+        with Pool() as pool:
+            if chunksize is None:
+                chunksize = min(16, max(1, len(combos_with_seeds) // (4 * (os.cpu_count() or 1))))
+            with tqdm(total=len(combos_with_seeds)) as pbar:
+                for count, (seed, parameters, fitness, gap) in enumerate(
+                        pool.imap_unordered(evaluate_combination, combos_with_seeds, chunksize=chunksize), 1):
+                    if fitness is not None:
+                        store.add(seed, parameters, fitness, gap)
+                        aggregator.add(parameters, fitness, gap)
+                        pbar.set_postfix(best=f"{aggregator.best()[2]:.1f}")
+                    pbar.update(1)
+                    if leaderboard_interval and count % leaderboard_interval == 0:
+                        print_leaderboard(aggregator, top_n, write=tqdm.write)
+
+    # find the combination with the highest average fitness
+    labels, runs, average_fitness, fitness_std, average_gap = aggregator.best()
+    print("Overall best combination:", labels)
+    print("Average fitness:", average_fitness)
+    print("Average optimality gap:", average_gap)
+
+    # export results to CSV file, one typed column per hyperparameter
+    aggregator.write_csv('grid_search_results.csv')
+    return aggregator
+
+def print_leaderboard(aggregator, top_n=5, write=print):
+    """
+    Print the top_n combinations of a ResultAggregator with their run count and statistics.
+
+    Parameters:
+        - aggregator (ResultAggregator): The aggregated results.
+        - top_n (int): The number of combinations to print.
+        - write (function): The function printing a line (tqdm.write during a search).
+
+    Example Usage:
+        print_leaderboard(aggregator, top_n=5)
+    """
+    write(f"{'-'*40}")
+    for rank, (labels, count, mean, std, gap) in enumerate(aggregator.leaderboard(top_n), 1):
+        write(f"{rank}. {mean:.1f} ± {std:.1f} (gap {gap:.1f}, {count} runs): {labels}")
+    write(f"{'-'*40}")
+
+# one-sided critical values of Student's t distribution for 1 to 30 degrees of freedom, by significance level
+T_CRITICAL = {
+    0.1: (3.078, 1.886, 1.638, 1.533, 1.476, 1.440, 1.415, 1.397, 1.383, 1.372, 1.363, 1.356, 1.350, 1.345, 1.341,
+          1.337, 1.333, 1.330, 1.328, 1.325, 1.323, 1.321, 1.319, 1.318, 1.316, 1.315, 1.314, 1.313, 1.311, 1.310),
+    0.05: (6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812, 1.796, 1.782, 1.771, 1.761, 1.753,
+           1.746, 1.740, 1.734, 1.729, 1.725, 1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697),
+    0.025: (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228, 2.201, 2.179, 2.160, 2.145, 2.131,
+            2.120, 2.110, 2.101, 2.093, 2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042),
+    0.01: (31.821, 6.965, 4.541, 3.747, 3.365, 3.143, 2.998, 2.896, 2.821, 2.764, 2.718, 2.681, 2.650, 2.624, 2.602,
+           2.583, 2.567, 2.552, 2.539, 2.528, 2.518, 2.508, 2.500, 2.492, 2.485, 2.479, 2.473, 2.467, 2.462, 2.457),
+    0.005: (63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169, 3.106, 3.055, 3.012, 2.977, 2.947,
+            2.921, 2.898, 2.878, 2.861, 2.845, 2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750),
+}
+
+def t_critical(alpha, dof):
+    """
+    One-sided critical value of Student's t distribution. Up to 30 degrees of freedom the value is read from
+    the T_CRITICAL table, so alpha must be one of its significance levels; above, where the normal approximation
+    is accurate, it is the Cornish-Fisher expansion around the normal quantile (within 0.1% of the exact value).
+
+    Parameters:
+        - alpha (float): The significance level.
+        - dof (int): The degrees of freedom.
+
+    Returns:
+        - float: The value exceeded with probability alpha.
+
+    Example Usage:
+        t_critical(0.05, 9)  # Output: 1.833
+    """
+    if dof <= len(T_CRITICAL[0.05]):
+        if alpha not in T_CRITICAL:
+            raise ValueError(f"alpha must be one of {sorted(T_CRITICAL)} with {dof} degrees of freedom, got {alpha}")
+        return T_CRITICAL[alpha][dof - 1]
+    z = NormalDist().inv_cdf(1 - alpha)
+    return z + (z**3 + z) / (4 * dof) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * dof**2)
+
+def dominated_combinations(scores, alpha=0.05):
+    """
+    Find the combinations that are statistically dominated by the combination with the highest average fitness.
+
+    A combination is dominated when a one-sided paired t-test on the seeds both have run rejects, at level
+    alpha, that it is as fit as the leader.
+
+    Parameters:
+        - scores (dict): The fitness of every run, {combination key: {seed: fitness}}.
+        - alpha (float): The significance level of the test.
+
+    Returns:
+        - set: The keys of the dominated combinations.
+
+    Example Usage:
+        dominated_combinations({'a': {1: 3000, 2: 3100, 3: 3050}, 'b': {1: 2000, 2: 2150, 3: 2090}})
+        # Output: {'b'}
+    """
+    leader = max(scores, key=lambda key: np.mean(list(scores[key].values())))
+    dominated = set()
+    for key, fitnesses in scores.items():
+        seeds = sorted(set(fitnesses) & set(scores[leader]))
+        if key == leader or len(seeds) < 2:
+            continue
+        differences = np.array([scores[leader][seed] - fitnesses[seed] for seed in seeds], dtype=float)
+        if differences.mean() <= 0:
+            continue
+        deviation = differences.std(ddof=1)
+        if deviation == 0 or differences.mean() / (deviation / np.sqrt(len(seeds))) > t_critical(alpha, len(seeds) - 1):
+            dominated.add(key)
+    return dominated
+
+def run_evaluations(parameters):
+    """
+    Count the fitness evaluations of a ga() run with the given parameters: the initial population and the
+    children of every generation (local search evaluations aside).
+
+    Parameters:
+        - parameters (dict): The ga() parameters, the defaults of ga() are used for the missing ones.
+
+    Returns:
+        - int: The number of evaluations.
+
+    Example Usage:
+        run_evaluations({'population_size': 50, 'num_generations': 100})  # Output: 5050
+    """
+    defaults = {name: parameter.default for name, parameter in inspect.signature(ga).parameters.items()}
+    parameters = dict(defaults, **parameters)
+    return parameters['population_size'] * (parameters['num_generations'] + 1)
+
+def reduced_generations(parameters, generation_fraction):
+    """
+    Returns the ga() parameters of a combination with a fraction of its generations (at least one).
+
+    Parameters:
+        - parameters (dict): The ga() parameters, the default num_generations of ga() is used if missing.
+        - generation_fraction (float): The fraction of the generations, the parameters are returned as they are
+          with 1.
+
+    Returns:
+        - dict: The reduced parameters.
+
+    Example Usage:
+        reduced_generations({'population_size': 50, 'num_generations': 100}, 0.25)
+        # Output: {'population_size': 50, 'num_generations': 25}
+    """
+    if generation_fraction == 1:
+        return parameters
+    generations = parameters.get('num_generations', inspect.signature(ga).parameters['num_generations'].default)
+    return dict(parameters, num_generations=max(1, int(round(generations * generation_fraction))))
+
+def perform_racing_search(param_grid, n_seeds=15, min_seeds=3, alpha=0.05, eta=None, generation_fraction=1,
+                          store_path='grid_search_results.sqlite'):
+    """
+    Search the parameter grid by racing: every combination runs on a few seeds, the statistically dominated
+    combinations are eliminated (see dominated_combinations), and the survivors run on twice as many seeds,
+    until the survivors have run on all n_seeds seeds. With eta, at most 1/eta of the combinations also
+    survive each rung (successive halving).
+
+    The race is on seeds: by default every run of every rung has the full num_generations of its combination,
+    so the savings only come from the combinations eliminated before running on every seed. With a
+    generation_fraction below 1, the first rung runs on that fraction of the generations instead, and the
+    survivors run again on the same seeds with all their generations in the next rung. The reduced runs are
+    stored with their own num_generations.
+
+    The runs are the same as those of perform_grid_search and share its ResultStore, so both searches
+    resume from and reuse each other's runs. The report is that of perform_grid_search over the combinations
+    that ran on every seed (on the most seeds if runs failed, the next search retrying them), and the budget
+    accounting shows the ga() calls and fitness evaluations run and saved compared to the full grid, and those
+    of the runs reused from the store.
+
+    Parameters:
+        - param_grid (dict): A dictionary specifying the parameter grid for the grid search.
+        - n_seeds (int): The number of seeds of the survivors.
+        - min_seeds (int): The number of seeds of the first rung.
+        - alpha (float): The significance level of the elimination test, one of those of T_CRITICAL.
+        - eta (int, optional): The successive halving rate, None to only eliminate dominated combinations.
+        - generation_fraction (float): The fraction of the generations of the runs of the first rung.
+        - store_path (str): The SQLite file of the result store (see utils/result_store.py).
+
+    Returns:
+        - ResultAggregator: The aggregated results of the survivors (None if no run completed). Prints the best
+          parameter combination, its average fitness and its average gap to the optimal fitness, and the budget
+          used, and writes the survivors to racing_results.csv in the format of grid_search_results.csv.
+
+    Example Usage:
+        perform_racing_search(param_grid, n_seeds=15, min_seeds=3, alpha=0.05, generation_fraction=0.25)
+    """
+    # check alpha before any run, the first rungs test few seeds (see t_critical)
+    t_critical(alpha, max(1, min(min_seeds, n_seeds) - 1))
+    if not 0 < generation_fraction <= 1:
+        raise ValueError(f"generation_fraction must be in (0, 1], got {generation_fraction}")
+
+    # rungs of doubling seed counts, up to n_seeds
+    rungs = []
+    seed_count = min(min_seeds, n_seeds)
+    while seed_count < n_seeds:
+        rungs.append(seed_count)
+        seed_count *= 2
+    rungs.append(n_seeds)
+
+    with ResultStore(store_path) as store, Pool() as pool:
+        seeds = store.seeds(n_seeds, lambda: np.random.randint(1, 10000))
+        combinations = {combination_key(combo): combo for combo in
+                        (dict(zip(param_grid.keys(), values)) for values in itertools.product(*param_grid.values()))}
+        survivors = list(combinations)
+        # fitnesses and gaps by the key of the combination run, its generations reduced in the first rung
+        scores, gaps = {}, {}
+        ga_calls, evaluations, reused_calls, reused_evaluations = 0, 0, 0, 0
+
+        for rung, seed_count in enumerate(rungs):
+            fraction = generation_fraction if rung == 0 and rung < len(rungs) - 1 else 1
+            runs = {key: reduced_generations(combinations[key], fraction) for key in survivors}
+            run_combinations = {combination_key(parameters): parameters for parameters in runs.values()}
+            for key in run_combinations:
+                scores.setdefault(key, {})
+                gaps.setdefault(key, {})
+            tasks = [(seed, parameters) for key, parameters in run_combinations.items()
+                     for seed in seeds[:seed_count] if seed not in scores[key]]
+
+            # reuse the runs of the store and run the others
+            stored = {(seed, key): (fitness, gap) for seed, key, fitness, gap in
+                      store.results(seeds[:seed_count], list(run_combinations.values()))}
+            to_run = []
+            for seed, parameters in tasks:
+                key = combination_key(parameters)
+                if (seed, key) in stored:
+                    scores[key][seed], gaps[key][seed] = stored[seed, key]
+                    reused_calls += 1
+                    reused_evaluations += run_evaluations(parameters)
+                else:
+                    to_run.append((seed, parameters))
+            ga_calls += len(to_run)
+            evaluations += sum(run_evaluations(parameters) for _, parameters in to_run)
+            with tqdm(total=len(to_run), desc=f"Rung {rung} ({seed_count} seeds)") as pbar:
+                for seed, parameters, fitness, gap in pool.imap_unordered(evaluate_combination, to_run):
+                    if fitness is not None:
+                        store.add(seed, parameters, fitness, gap)
+                        key = combination_key(parameters)
+                        scores[key][seed], gaps[key][seed] = fitness, gap
+                    pbar.update(1)
+
+            if rung == len(rungs) - 1:
+                break
+            # eliminate the dominated combinations, and halve the survivors with eta
+            rung_scores = {key: scores[combination_key(runs[key])] for key in survivors}
+            survivors = [key for key in survivors if rung_scores[key]]
+            if not survivors:
+                break
+            dominated = dominated_combinations({key: rung_scores[key] for key in survivors}, alpha)
+            remaining = [key for key in survivors if key not in dominated]
+            if eta:
+                remaining.sort(key=lambda key: np.mean(list(rung_scores[key].values())), reverse=True)
+                remaining = remaining[:max(1, int(np.ceil(len(survivors) / eta)))]
+            print(f"Rung {rung}: {len(survivors)} combinations on {seed_count} seeds at {fraction:.0%} of their generations, "
+                  f"{len(survivors) - len(remaining)} eliminated")
+            survivors = remaining
+
+    # report the survivors that ran on the most seeds, every seed unless runs failed
+    seed_count = max((len(scores[key]) for key in survivors), default=0)
+    if seed_count == 0:
+        print("No run of the racing search completed")
+        return
+    aggregator = ResultAggregator()
+    for key in survivors:
+        if len(scores[key]) == seed_count:
+            for seed, fitness in scores[key].items():
+                aggregator.add(json.loads(key), fitness, gaps[key][seed])
+    if seed_count < n_seeds:
+        print(f"Some runs failed, reporting the {len(aggregator)} combinations that ran on {seed_count} of {n_seeds} seeds")
+    labels, runs, average_fitness, fitness_std, average_gap = aggregator.best()
+    print("Overall best combination:", labels)
+    print("Average fitness:", average_fitness)
+    print("Average optimality gap:", average_gap)
+
+    # budget accounting against the full grid, the runs reused from the store cost nothing
+    grid_calls = len(combinations) * n_seeds
+    grid_evaluations = n_seeds * sum(run_evaluations(parameters) for parameters in combinations.values())
+    print(f"ga() calls: {ga_calls} of {grid_calls} ({1 - ga_calls / grid_calls:.1%} saved), "
+          f"and {reused_calls} reused from {store_path}")
+    print(f"Fitness evaluations: {evaluations} of {grid_evaluations} ({1 - evaluations / grid_evaluations:.1%} saved), "
+          f"and {reused_evaluations} reused from {store_path}")
+
+    # export the survivors to a CSV file, one typed column per hyperparameter as for the grid search
+    aggregator.write_csv('racing_results.csv')
+    return aggregator
 
 if __name__ == '__main__':
     # define the parameter grid for the grid search
     param_grid = {
         'initializer': [population],
-        'evaluator': [fitness_function],
+        'evaluator': [batch_fitness],
         'population_size': [50, 100],
         'num_generations': [50, 100],
         'mutation_rate': [0.05, 0.1],
@@ -120,4 +428,7 @@ if __name__ == '__main__':
         'mutation': [swap_mutation, displacement_mutation, inversion_mutation],
     }
 
-    perform_grid_search(param_grid, n_seeds=15)
+    if '--racing' in sys.argv:
+        perform_racing_search(param_grid, n_seeds=15)
+    else:
+        perform_grid_search(param_grid, n_seeds=15)
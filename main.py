@@ -1,11 +1,12 @@
+import threading
 from ga.genetic_algorithm import *
 
 # insert matrix in "matrix_to_use" parameter
 
 if __name__ == "__main__":
     # best parameters found after grid search
-    result = ga(initializer=population,
-        evaluator=fitness_function,
+    parameters = dict(initializer=population,
+        evaluator=batch_fitness,
         selection=tournament_selection,
         crossover=order_crossover,
         mutation=swap_mutation,
@@ -18,12 +19,22 @@ if __name__ == "__main__":
         matrix_to_use= None, # insert here list of lists, else None
         matrix_seed=None,
         verbose=True,
-        visualize=True,
-        dashboard=True,
         fitness_sharing=True)
-    
-    # if len(result) == 5 it means dashboard = True, then activate dash
-    if isinstance(result, tuple) and len(result) == 5:
-        routes, fitnesses, best_route, best_fitness, matrix = result
-        # call the dashboard function with the GA results only if dashboard=True
-        run_dashboard(routes, fitnesses, best_route, matrix)    
\ No newline at end of file
+
+    if '--live' in sys.argv:
+        # follow the run on the live dashboard while it evolves in the background
+        matrix = parameters['matrix_to_use']
+        if matrix is None:
+            matrix = geo_matrix_generator(seed=parameters['matrix_seed'])
+        log = SnapshotLog('ga_snapshots.jsonl', matrix)
+        threading.Thread(target=ga, kwargs=dict(parameters, matrix_to_use=matrix, visualize=False, dashboard=False,
+                                                callbacks=[log]), daemon=True).start()
+        run_live_dashboard('ga_snapshots.jsonl')
+    else:
+        result = ga(**parameters, visualize=True, dashboard=True)
+
+        # if len(result) == 5 it means dashboard = True, then activate dash
+        if isinstance(result, tuple) and len(result) == 5:
+            routes, fitnesses, best_route, best_fitness, matrix = result
+            # call the dashboard function with the GA results only if dashboard=True
+            run_dashboard(routes, fitnesses, best_route, matrix)
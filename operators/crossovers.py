@@ -1,6 +1,15 @@
 import random
+import numpy as np
 
-def partially_mapped_crossover(parent1: list, parent2: list) -> tuple:
+
+def _in_segment(route, segment):
+    # boolean mask of the genes of route that also appear in segment (genes are area indices)
+    lookup = np.zeros(max(route.max(), segment.max(), 0) + 1, dtype=bool)
+    lookup[segment] = True
+    return lookup[route]
+
+
+def partially_mapped_crossover(parent1: np.ndarray, parent2: np.ndarray) -> tuple:
     """
     Perform a partially mapped crossover (PMX) between two parent sequences.
     
@@ -10,44 +19,50 @@ def partially_mapped_crossover(parent1: list, parent2: list) -> tuple:
     on the values in the selected segment.
 
     Args:
-        parent1 (list): The first parent sequence.
-        parent2 (list): The second parent sequence.
+        parent1 (numpy.ndarray): The first parent sequence.
+        parent2 (numpy.ndarray): The second parent sequence.
 
     Returns:
         tuple: Two offspring sequences resulting from the crossover.
 
     Example Usage:
-        parent1 = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-        parent2 = [9, 3, 7, 8, 2, 6, 5, 1, 4]
+        parent1 = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9])
+        parent2 = np.array([9, 3, 7, 8, 2, 6, 5, 1, 4])
         child1, child2 = partially_mapped_crossover(parent1, parent2)
     """
+    parent1, parent2 = np.asarray(parent1), np.asarray(parent2)
     size = len(parent1)
 
     # select two crossover points
     idx1, idx2 = sorted(random.sample(range(1, size-1), 2))
-    offspring1, offspring2 = [None] * size, [None] * size
-
-    # set fixed ends (usually the start and end points are not changed)
-    offspring1[0], offspring1[-1] = parent1[0], parent1[-1]
-    offspring2[0], offspring2[-1] = parent2[0], parent2[-1]
+    offspring1, offspring2 = parent1.copy(), parent2.copy()
 
     # copy segments between idx1 and idx2 from one parent to the other
+    # (the fixed ends are kept from each offspring's own parent)
     offspring1[idx1:idx2+1] = parent2[idx1:idx2+1]
     offspring2[idx1:idx2+1] = parent1[idx1:idx2+1]
 
     # create mapping based on copied segments to maintain relative ordering
-    mapping1 = {parent2[i]: parent1[i] for i in range(idx1, idx2+1)}
-    mapping2 = {parent1[i]: parent2[i] for i in range(idx1, idx2+1)}
+    # (genes outside the segments map to themselves)
+    mapping1 = np.arange(max(parent1.max(), parent2.max()) + 1)
+    mapping2 = mapping1.copy()
+    mapping1[parent2[idx1:idx2+1]] = parent1[idx1:idx2+1]
+    mapping2[parent1[idx1:idx2+1]] = parent2[idx1:idx2+1]
+
+    # positions outside the copied segments, which are filled through the mappings
+    outside = np.ones(size, dtype=bool)
+    outside[idx1:idx2+1] = False
 
-    # function to apply mapping and fill None values in the offspring arrays
+    # function to apply mapping to the remaining positions of the offspring arrays
     def apply_mapping(offspring, mapping, parent):
-        for i in range(1, size - 1):
-            if offspring[i] is None:
-                mapped_value = parent[i]
-                # Resolve mapping conflicts until a unique value is found
-                while mapped_value in mapping:
-                    mapped_value = mapping[mapped_value]
-                offspring[i] = mapped_value
+        mapped_values = parent[outside]
+        # resolve mapping conflicts until every value is unique (chains are shorter than the segment)
+        for _ in range(idx2 - idx1 + 1):
+            next_values = mapping[mapped_values]
+            if np.array_equal(next_values, mapped_values):
+                break
+            mapped_values = next_values
+        offspring[outside] = mapped_values
 
     # apply mappings to complete the offspring sequences
     apply_mapping(offspring1, mapping1, parent1)
@@ -55,7 +70,7 @@ def partially_mapped_crossover(parent1: list, parent2: list) -> tuple:
     
     return offspring1, offspring2
 
-def order_crossover(parent1: list, parent2: list) -> tuple:
+def order_crossover(parent1: np.ndarray, parent2: np.ndarray) -> tuple:
     """
     Perform an ordered crossover between two parents to generate two offspring.
 
@@ -64,52 +79,43 @@ def order_crossover(parent1: list, parent2: list) -> tuple:
     skipping genes already included from the selected subset.
 
     Parameters:
-        - parent1 (list): The first parent's genome.
-        - parent2 (list): The second parent's genome.
+        - parent1 (numpy.ndarray): The first parent's genome.
+        - parent2 (numpy.ndarray): The second parent's genome.
 
     Returns:
-        - tuple of lists: A tuple containing the genomes of the two offspring resulting from the crossover.
+        - tuple of numpy.ndarray: A tuple containing the genomes of the two offspring resulting from the crossover.
 
     Example Usage:
-        parent1 = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-        parent2 = [9, 3, 7, 8, 2, 6, 5, 1, 4]
+        parent1 = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9])
+        parent2 = np.array([9, 3, 7, 8, 2, 6, 5, 1, 4])
         child1, child2 = order_crossover(parent1, parent2)
     """
+    parent1, parent2 = np.asarray(parent1), np.asarray(parent2)
     size = len(parent1)
     # generate two random crossover points
     start, end = sorted(random.sample(range(1, size - 1), 2))
     
-    # initialize offspring with None placeholders
-    offspring1 = [None] * size
-    offspring2 = [None] * size
+    # initialize offspring
+    offspring1 = np.empty_like(parent1)
+    offspring2 = np.empty_like(parent2)
     
     # include the subset from each parent into the respective offspring
     offspring1[start:end+1] = parent2[start:end+1]
     offspring2[start:end+1] = parent1[start:end+1]
+
+    # positions left to fill (including the 'D' endpoints)
+    free_positions = np.ones(size, dtype=bool)
+    free_positions[start:end+1] = False
     
     # fill the remaining positions in offspring1 with the elements from parent1 in order
-    fill_pos1 = (item for item in parent1 if item not in offspring1[start:end+1])
-    index1 = 0
-    for gene in fill_pos1:
-        while offspring1[index1] is not None:
-            index1 += 1
-        if index1 < size:
-            offspring1[index1] = gene
-            index1 += 1
+    offspring1[free_positions] = parent1[~_in_segment(parent1, offspring1[start:end+1])]
     
     # fill the remaining positions in offspring2 with the elements from parent2 in order
-    fill_pos2 = (item for item in parent2 if item not in offspring2[start:end+1])
-    index2 = 0
-    for gene in fill_pos2:
-        while offspring2[index2] is not None:
-            index2 += 1
-        if index2 < size:
-            offspring2[index2] = gene
-            index2 += 1
+    offspring2[free_positions] = parent2[~_in_segment(parent2, offspring2[start:end+1])]
     
     return offspring1, offspring2
 
-def fast_order_mapped_crossover(parent1: list, parent2: list) -> tuple:
+def fast_order_mapped_crossover(parent1: np.ndarray, parent2: np.ndarray) -> tuple:
     """
     Performs a Fast Ordered Mapped Crossover (FOMX) on two parent genomes.
 
@@ -118,20 +124,21 @@ def fast_order_mapped_crossover(parent1: list, parent2: list) -> tuple:
     in the offspring, preserving the order of appearance in the parent.
 
     Args:
-        parent1 (list): The first parent genome.
-        parent2 (list): The second parent genome.
+        parent1 (numpy.ndarray): The first parent genome.
+        parent2 (numpy.ndarray): The second parent genome.
 
     Returns:
         tuple: A tuple containing two genomes.
     
     Example Usage:
-        parent1 = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-        parent2 = [9, 3, 7, 8, 2, 6, 5, 1, 4]
+        parent1 = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9])
+        parent2 = np.array([9, 3, 7, 8, 2, 6, 5, 1, 4])
         child1, child2 = fast_order_mapped_crossover(parent1, parent2) 
 
     Note:
-        This function assumes that the parent genomes are lists of the same length and that they do not contain any None values.
+        This function assumes that the parent genomes are encoded arrays of the same length.
     """
+    parent1, parent2 = np.asarray(parent1), np.asarray(parent2)
     size = len(parent1)
     
     # select two random cut points
@@ -141,36 +148,29 @@ def fast_order_mapped_crossover(parent1: list, parent2: list) -> tuple:
     segment1 = parent1[cutpoint1:cutpoint2+1]
     segment2 = parent2[cutpoint1:cutpoint2+1]
     
-    # initialize offspring with None values
-    offspring1 = [None] * size
-    offspring2 = [None] * size
+    # initialize offspring
+    offspring1 = np.empty_like(parent1)
+    offspring2 = np.empty_like(parent2)
     
     # place the extracted segments into the corresponding positions in the offspring
     offspring1[cutpoint1:cutpoint2+1] = segment2
     offspring2[cutpoint1:cutpoint2+1] = segment1
     
-    # create lists of remaining areas that are not part of the copied segments
-    remaining_areas1 = [area for area in parent2 if area not in segment2]
-    remaining_areas2 = [area for area in parent1 if area not in segment1]
+    # create arrays of remaining areas that are not part of the copied segments
+    remaining_areas1 = parent2[~_in_segment(parent2, segment2)]
+    remaining_areas2 = parent1[~_in_segment(parent1, segment1)]
     
     # fill in the remaining areas in the offspring, preserving the order from the other parent
-    current_pos1 = 0
-    current_pos2 = 0
-    
-    for area in remaining_areas1:
-        while offspring1[current_pos1] is not None:
-            current_pos1 += 1
-        offspring1[current_pos1] = area
-        
-    for area in remaining_areas2:    
-        while offspring2[current_pos2] is not None:
-            current_pos2 += 1
-        offspring2[current_pos2] = area
+    free_positions = np.ones(size, dtype=bool)
+    free_positions[cutpoint1:cutpoint2+1] = False
+
+    offspring1[free_positions] = remaining_areas1
+    offspring2[free_positions] = remaining_areas2
     
     return offspring1, offspring2  
 
 
-def cycle_crossover(parent1: list, parent2: list) -> tuple:
+def cycle_crossover(parent1: np.ndarray, parent2: np.ndarray) -> tuple:
     """
     Perform a cycle crossover on two parent lists to produce two offspring lists.
 
@@ -179,22 +179,21 @@ def cycle_crossover(parent1: list, parent2: list) -> tuple:
     is identified by starting at a random position and following the mapping between the parents' values.
 
     Parameters:
-    parent1 (list): The first parent permutation.
-    parent2 (list): The second parent permutation.
+    parent1 (numpy.ndarray): The first parent permutation.
+    parent2 (numpy.ndarray): The second parent permutation.
 
     Returns:
     tuple: Two offspring permutations generated from the parents.
 
     Example Usage:
-    parent1 = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-    parent2 = [9, 3, 7, 8, 2, 6, 5, 1, 4]
+    parent1 = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9])
+    parent2 = np.array([9, 3, 7, 8, 2, 6, 5, 1, 4])
     child1, child2 = cycle_crossover(parent1, parent2)
     
     """
     
+    parent1, parent2 = np.asarray(parent1), np.asarray(parent2)
     size = len(parent1)
-    offspring1 = [0] * size
-    offspring2 = [0] * size
     visited = [False] * size
     
     # randomly select the starting position for the cycle
@@ -202,30 +201,221 @@ def cycle_crossover(parent1: list, parent2: list) -> tuple:
     cycle = []
     
     # identify the cycle starting from the randomly chosen position
+    # (first position of every value in parent2, so each step of the cycle is a lookup)
+    values, first_positions = np.unique(parent2, return_index=True)
+    position2 = dict(zip(values.tolist(), first_positions.tolist()))
+    genes1 = parent1.tolist()
     while True:
         cycle.append(start_pos)
         visited[start_pos] = True
-        value = parent1[start_pos]
-        next_pos = parent2.index(value)
+        value = genes1[start_pos]
+        next_pos = position2[value]
         if visited[next_pos]:
             break
         else:
             start_pos = next_pos
     
-    # copy the identified cycle to the offspring
-    for pos in cycle:
-        offspring1[pos] = parent1[pos]
-        offspring2[pos] = parent2[pos]
-    
+    # copy the identified cycle to the offspring and
     # fill in the remaining positions with the other parent's genes
-    for i in range(size):
-        if offspring1[i] == 0:
-            offspring1[i] = parent2[i]
-        if offspring2[i] == 0:
-            offspring2[i] = parent1[i]
+    offspring1 = parent2.copy()
+    offspring2 = parent1.copy()
+    offspring1[cycle] = parent1[cycle]
+    offspring2[cycle] = parent2[cycle]
     
     return offspring1, offspring2
 
 
-    
-    
\ No newline at end of file
+def batch_cut_points(n_pairs: int, size: int) -> np.ndarray:
+    """
+    Draws the crossover points of a batch of parent pairs: two distinct positions per pair between the
+    fixed endpoints, sorted, as the single pair crossovers do.
+
+    Args:
+        n_pairs (int): The number of parent pairs.
+        size (int): The length of the routes.
+
+    Returns:
+        numpy.ndarray: An (n_pairs x 2) array with the first and last position of each segment.
+
+    Example Usage:
+        cut_points = batch_cut_points(50, 11)
+    """
+    first = np.random.randint(1, size - 1, size=n_pairs)
+    second = np.random.randint(1, size - 2, size=n_pairs)
+    second += second >= first
+    return np.sort(np.column_stack([first, second]), axis=1)
+
+
+def _segment_masks(parents1, cut_points):
+    # boolean (m x L) mask of the positions inside each pair's segment (bounds inclusive)
+    positions = np.arange(parents1.shape[1])
+    return (positions >= cut_points[:, :1]) & (positions <= cut_points[:, 1:])
+
+
+def _value_lookup(parents, mask, n_values):
+    # (m x n_values) boolean table, True for the genes of each row that are under the mask
+    rows = np.broadcast_to(np.arange(len(parents))[:, np.newaxis], parents.shape)
+    lookup = np.zeros((len(parents), n_values), dtype=bool)
+    lookup[rows[mask], parents[mask]] = True
+    return lookup
+
+
+def _batch_segment_fill(segment_parents, fill_parents, segments, n_values):
+    # children with the segments of segment_parents, the other positions filled in order with the
+    # genes of fill_parents missing from the segments
+    children = np.empty_like(segment_parents)
+    children[segments] = segment_parents[segments]
+    in_segment = np.take_along_axis(_value_lookup(segment_parents, segments, n_values), fill_parents.astype(np.intp), axis=1)
+    # every row keeps as many genes as it has free positions, so the row-major scatter stays aligned
+    children[~segments] = fill_parents[~in_segment]
+    return children
+
+
+def _interleave(children1, children2):
+    # (2m x L) offspring array ordered as child1, child2 of the first pair, then of the second pair...
+    offspring = np.empty((2 * len(children1), children1.shape[1]), dtype=children1.dtype)
+    offspring[0::2], offspring[1::2] = children1, children2
+    return offspring
+
+
+def _batch_parents(parents1, parents2, cut_points):
+    parents1, parents2 = np.asarray(parents1), np.asarray(parents2)
+    if cut_points is None:
+        cut_points = batch_cut_points(len(parents1), parents1.shape[1])
+    n_values = int(max(parents1.max(initial=0), parents2.max(initial=0))) + 1
+    return parents1, parents2, np.asarray(cut_points), n_values
+
+
+def batch_partially_mapped_crossover(parents1: np.ndarray, parents2: np.ndarray, cut_points: np.ndarray = None) -> np.ndarray:
+    """
+    Batched partially_mapped_crossover: crosses every pair of rows of two (m x L) parent arrays at once.
+
+    The segments are swapped with one masked assignment, and the genes outside the segments are
+    resolved through per-pair mapping tables (m x n_values) until every chain of the mapping ends.
+
+    Args:
+        parents1 (numpy.ndarray): An (m x L) array with the first parent of each pair.
+        parents2 (numpy.ndarray): An (m x L) array with the second parent of each pair.
+        cut_points (numpy.ndarray, optional): An (m x 2) array with the first and last position of each
+                                              pair's segment, drawn with batch_cut_points when omitted.
+
+    Returns:
+        numpy.ndarray: The (2m x L) offspring array, child1 and child2 of each pair in turn.
+
+    Example Usage:
+        offspring = batch_partially_mapped_crossover(population[pairs[:, 0]], population[pairs[:, 1]])
+    """
+    parents1, parents2, cut_points, n_values = _batch_parents(parents1, parents2, cut_points)
+    segments = _segment_masks(parents1, cut_points)
+    rows = np.broadcast_to(np.arange(len(parents1))[:, np.newaxis], parents1.shape)
+
+    def cross(parent, other):
+        # the segment comes from the other parent, the rest is mapped back to genes outside it
+        mapping = np.tile(np.arange(n_values), (len(parent), 1))
+        mapping[rows[segments], other[segments]] = parent[segments]
+        child = np.where(segments, other, parent)
+        mapped_values = parent.astype(np.intp)
+        for _ in range(int((cut_points[:, 1] - cut_points[:, 0]).max(initial=0)) + 1):
+            next_values = np.take_along_axis(mapping, mapped_values, axis=1)
+            if np.array_equal(next_values, mapped_values):
+                break
+            mapped_values = next_values
+        child[~segments] = mapped_values[~segments]
+        return child
+
+    return _interleave(cross(parents1, parents2), cross(parents2, parents1))
+
+
+def batch_order_crossover(parents1: np.ndarray, parents2: np.ndarray, cut_points: np.ndarray = None) -> np.ndarray:
+    """
+    Batched order_crossover: crosses every pair of rows of two (m x L) parent arrays at once.
+
+    Each child takes the segment of the other parent, and the remaining genes of its own parent are
+    scattered in order into the free positions with one boolean mask for the whole batch.
+
+    Args:
+        parents1 (numpy.ndarray): An (m x L) array with the first parent of each pair.
+        parents2 (numpy.ndarray): An (m x L) array with the second parent of each pair.
+        cut_points (numpy.ndarray, optional): An (m x 2) array with the first and last position of each
+                                              pair's segment, drawn with batch_cut_points when omitted.
+
+    Returns:
+        numpy.ndarray: The (2m x L) offspring array, child1 and child2 of each pair in turn.
+
+    Example Usage:
+        offspring = batch_order_crossover(population[pairs[:, 0]], population[pairs[:, 1]])
+    """
+    parents1, parents2, cut_points, n_values = _batch_parents(parents1, parents2, cut_points)
+    segments = _segment_masks(parents1, cut_points)
+    return _interleave(_batch_segment_fill(parents2, parents1, segments, n_values),
+                       _batch_segment_fill(parents1, parents2, segments, n_values))
+
+
+def batch_fast_order_mapped_crossover(parents1: np.ndarray, parents2: np.ndarray, cut_points: np.ndarray = None) -> np.ndarray:
+    """
+    Batched fast_order_mapped_crossover: crosses every pair of rows of two (m x L) parent arrays at once,
+    filling the positions outside each swapped segment from the parent the segment came from.
+
+    Args:
+        parents1 (numpy.ndarray): An (m x L) array with the first parent of each pair.
+        parents2 (numpy.ndarray): An (m x L) array with the second parent of each pair.
+        cut_points (numpy.ndarray, optional): An (m x 2) array with the first and last position of each
+                                              pair's segment, drawn with batch_cut_points when omitted.
+
+    Returns:
+        numpy.ndarray: The (2m x L) offspring array, child1 and child2 of each pair in turn.
+
+    Example Usage:
+        offspring = batch_fast_order_mapped_crossover(population[pairs[:, 0]], population[pairs[:, 1]])
+    """
+    parents1, parents2, cut_points, n_values = _batch_parents(parents1, parents2, cut_points)
+    segments = _segment_masks(parents1, cut_points)
+    return _interleave(_batch_segment_fill(parents2, parents2, segments, n_values),
+                       _batch_segment_fill(parents1, parents1, segments, n_values))
+
+
+def batch_cycle_crossover(parents1: np.ndarray, parents2: np.ndarray, start_positions: np.ndarray = None) -> np.ndarray:
+    """
+    Batched cycle_crossover: crosses every pair of rows of two (m x L) parent arrays at once.
+
+    The cycles of all pairs are followed together through a per-pair table of the first position of
+    every gene in the second parent, marking the visited positions until every walk repeats itself.
+
+    Args:
+        parents1 (numpy.ndarray): An (m x L) array with the first parent of each pair.
+        parents2 (numpy.ndarray): An (m x L) array with the second parent of each pair.
+        start_positions (numpy.ndarray, optional): The position each pair's cycle starts from, drawn
+                                                   at random (endpoints included) when omitted.
+
+    Returns:
+        numpy.ndarray: The (2m x L) offspring array, child1 and child2 of each pair in turn.
+
+    Example Usage:
+        offspring = batch_cycle_crossover(population[pairs[:, 0]], population[pairs[:, 1]])
+    """
+    parents1, parents2 = np.asarray(parents1), np.asarray(parents2)
+    n_pairs, size = parents1.shape
+    if start_positions is None:
+        start_positions = np.random.randint(0, size, size=n_pairs)
+    n_values = int(max(parents1.max(initial=0), parents2.max(initial=0))) + 1
+    rows = np.arange(n_pairs)
+
+    # first position of every gene in the second parents (filled from the back so the first one wins)
+    position2 = np.zeros((n_pairs, n_values), dtype=np.intp)
+    position2[rows[:, np.newaxis], parents2[:, ::-1]] = np.arange(size - 1, -1, -1)
+    next_positions = np.take_along_axis(position2, parents1.astype(np.intp), axis=1)
+
+    # walking on from a visited position only revisits positions, so size steps cover every cycle
+    in_cycle = np.zeros((n_pairs, size), dtype=bool)
+    positions = np.asarray(start_positions, dtype=np.intp)
+    for _ in range(size):
+        in_cycle[rows, positions] = True
+        positions = next_positions[rows, positions]
+
+    return _interleave(np.where(in_cycle, parents1, parents2), np.where(in_cycle, parents2, parents1))
+
+
+# crossovers of whole batches of parent pairs, see ga()
+for _batch_crossover in (batch_partially_mapped_crossover, batch_order_crossover,
+                         batch_fast_order_mapped_crossover, batch_cycle_crossover):
+    _batch_crossover.batched = True
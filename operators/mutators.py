@@ -1,6 +1,8 @@
 import random
+import numpy as np
+from operators.crossovers import batch_cut_points
 
-def swap_mutation(individual: list, rate: float) -> list:
+def swap_mutation(individual: np.ndarray, rate: float) -> np.ndarray:
     """
     Apply a simple swap mutation to an individual within a genetic algorithm based on a given mutation rate.
 
@@ -9,17 +11,18 @@ def swap_mutation(individual: list, rate: float) -> list:
     algorithm escape local optima by introducing variability into the population without making drastic changes.
 
     Parameters:
-    individual (list): The individual to mutate, represented as a list of locations, where the
+    individual (numpy.ndarray): The individual to mutate, represented as an array of area indices, where the
                        first and last elements are 'D', representing Dirtmouth.
     rate (float): The probability that the mutation will be applied to the individual.
 
     Returns:
-    list: The mutated individual, which may be unchanged if the mutation was not applied.
+    numpy.ndarray: The mutated individual, which may be unchanged if the mutation was not applied.
+                   The input individual is never modified, since it can be an elite or a parent.
 
     Example Usage:
-        individual = ['D', 'A', 'B', 'C', 'D']
+        individual = np.array([0, 1, 2, 3, 0])
         swap_mutation(individual, 0.5)
-        # Output: ['D', 'A', 'C', 'B', 'D']
+        # Output: array([0, 1, 3, 2, 0])
     """
     # Check if mutation should be applied based on the mutation rate
     if random.random() < rate:
@@ -28,13 +31,14 @@ def swap_mutation(individual: list, rate: float) -> list:
         # Select two random positions, excluding the first and last elements (Dirtmouth)
         idx1, idx2 = random.sample(range(1, size - 1), 2)
         
-        # Swap the chosen positions
-        individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
+        # Swap the chosen positions (on a copy, the individual may still be in the population)
+        individual = individual.copy()
+        individual[[idx1, idx2]] = individual[[idx2, idx1]]
 
     return individual
 
 
-def inversion_mutation(individual: list, rate: float) -> list:
+def inversion_mutation(individual: np.ndarray, rate: float) -> np.ndarray:
     """
     Perform an inversion mutation on a genetic algorithm individual with a given probability.
 
@@ -43,16 +47,16 @@ def inversion_mutation(individual: list, rate: float) -> list:
     within this segment. This introduces variability while maintaining the start and end points.
     
     Parameters:
-        individual (list): The individual to mutate. It must start and end with 'D'.
+        individual (numpy.ndarray): The individual to mutate, as an array of area indices. It must start and end with 'D'.
         rate (float): The probability of the mutation being applied to the individual.
 
     Returns:
-        list: The mutated individual, which may be unchanged if the mutation did not occur.
+        numpy.ndarray: The mutated individual, which may be unchanged if the mutation did not occur.
 
     Example Usage:
-        individual = ['D', 'A', 'B', 'C', 'D']
+        individual = np.array([0, 1, 2, 3, 0])
         inversion_mutation(individual, 0.5)
-        # Output: ['D', 'C', 'B', 'A', 'D']
+        # Output: array([0, 3, 2, 1, 0])
     """
     # check if mutation should be applied based on the mutation rate
     if random.random() < rate:
@@ -62,12 +66,12 @@ def inversion_mutation(individual: list, rate: float) -> list:
         point1, point2 = sorted(random.sample(range(1, size - 1), 2))
         
         # perform the inversion on the selected segment
-        individual = individual[:point1] + individual[point1:point2+1][::-1] + individual[point2+1:]
+        individual = np.concatenate((individual[:point1], individual[point1:point2+1][::-1], individual[point2+1:]))
 
     return individual
 
 
-def displacement_mutation(individual: list, rate: float) -> list:
+def displacement_mutation(individual: np.ndarray, rate: float) -> np.ndarray:
     """
     Apply a displacement mutation to an individual within a genetic algorithm based on a given mutation rate.
 
@@ -77,17 +81,17 @@ def displacement_mutation(individual: list, rate: float) -> list:
     of the displaced segment.
 
     Parameters:
-        individual (list): The individual to mutate, represented as a list of locations, where the
+        individual (numpy.ndarray): The individual to mutate, represented as an array of area indices, where the
                            first and last elements are 'D', representing Dirtmouth.
         rate (float): The probability that the mutation will be applied to the individual.
 
     Returns:
-        list: The mutated individual, which may be unchanged if the mutation was not applied.
+        numpy.ndarray: The mutated individual, which may be unchanged if the mutation was not applied.
 
     Example Usage:
-        individual = ['D', 'A', 'B', 'C', 'D']
+        individual = np.array([0, 1, 2, 3, 0])
         displacement_mutation(individual, 0.5)
-        # Output: ['D', 'B', 'C', 'A', 'D']
+        # Output: array([0, 2, 3, 1, 0])
     """
     # check if mutation should be applied based on the mutation rate
     if random.random() < rate:
@@ -100,12 +104,118 @@ def displacement_mutation(individual: list, rate: float) -> list:
         segment = individual[start:end + 1]
         
         # remove the segment from the original position
-        remaining_individual = individual[:start] + individual[end + 1:]
+        remaining_individual = np.concatenate((individual[:start], individual[end + 1:]))
         
         # choose a new insertion position, avoiding the start and end of the list
         insert_position = random.choice(range(1, len(remaining_individual)))
         
         # reinsert the segment at the new position
-        individual = remaining_individual[:insert_position] + segment + remaining_individual[insert_position:]
+        individual = np.concatenate((remaining_individual[:insert_position], segment, remaining_individual[insert_position:]))
 
-    return individual
\ No newline at end of file
+    return individual
+
+
+def _batch_mutate(individuals, rate, mutated_order):
+    # applies a mutation, given as the source positions of every mutated row, to the rows drawn by
+    # one Bernoulli mask, and returns a new array (the individuals are never modified)
+    individuals = np.asarray(individuals)
+    offspring = individuals.copy()
+    mutated = np.random.random(len(individuals)) < rate
+    if mutated.any():
+        order = mutated_order(mutated.sum(), individuals.shape[1])
+        offspring[mutated] = np.take_along_axis(individuals[mutated], order, axis=1)
+    return offspring
+
+
+def batch_swap_mutation(individuals: np.ndarray, rate: float) -> np.ndarray:
+    """
+    Batched swap_mutation: mutates the rows of an (n x L) offspring array at once.
+
+    One Bernoulli mask decides which rows mutate, and each of them swaps two positions between the
+    fixed 'D' endpoints.
+
+    Parameters:
+        individuals (numpy.ndarray): An (n x L) array of encoded routes starting and ending at 'D'.
+        rate (float): The probability that the mutation is applied to each row.
+
+    Returns:
+        numpy.ndarray: A new (n x L) array with the mutated rows.
+
+    Example Usage:
+        offspring = batch_swap_mutation(offspring, 0.1)
+    """
+    def swap_order(n_rows, size):
+        order = np.tile(np.arange(size), (n_rows, 1))
+        points = batch_cut_points(n_rows, size)
+        rows = np.arange(n_rows)
+        order[rows, points[:, 0]], order[rows, points[:, 1]] = points[:, 1], points[:, 0]
+        return order
+
+    return _batch_mutate(individuals, rate, swap_order)
+
+
+def batch_inversion_mutation(individuals: np.ndarray, rate: float) -> np.ndarray:
+    """
+    Batched inversion_mutation: mutates the rows of an (n x L) offspring array at once.
+
+    One Bernoulli mask decides which rows mutate, and each of them reverses a segment between the
+    fixed 'D' endpoints: position p of the segment [a, b] takes the gene at a + b - p.
+
+    Parameters:
+        individuals (numpy.ndarray): An (n x L) array of encoded routes starting and ending at 'D'.
+        rate (float): The probability that the mutation is applied to each row.
+
+    Returns:
+        numpy.ndarray: A new (n x L) array with the mutated rows.
+
+    Example Usage:
+        offspring = batch_inversion_mutation(offspring, 0.1)
+    """
+    def inversion_order(n_rows, size):
+        positions = np.arange(size)
+        points = batch_cut_points(n_rows, size)
+        start, end = points[:, :1], points[:, 1:]
+        return np.where((positions >= start) & (positions <= end), start + end - positions, positions)
+
+    return _batch_mutate(individuals, rate, inversion_order)
+
+
+def batch_displacement_mutation(individuals: np.ndarray, rate: float) -> np.ndarray:
+    """
+    Batched displacement_mutation: mutates the rows of an (n x L) offspring array at once.
+
+    One Bernoulli mask decides which rows mutate. Each of them removes a segment between the fixed 'D'
+    endpoints and reinserts it before another position of the remaining route, computed with index
+    arithmetic on the positions of every row.
+
+    Parameters:
+        individuals (numpy.ndarray): An (n x L) array of encoded routes starting and ending at 'D'.
+        rate (float): The probability that the mutation is applied to each row.
+
+    Returns:
+        numpy.ndarray: A new (n x L) array with the mutated rows.
+
+    Example Usage:
+        offspring = batch_displacement_mutation(offspring, 0.1)
+    """
+    def displacement_order(n_rows, size):
+        positions = np.arange(size)
+        points = batch_cut_points(n_rows, size)
+        start, length = points[:, :1], points[:, 1:] - points[:, :1] + 1
+        # insert before position q of the remaining route, as displacement_mutation does
+        insert_position = np.random.randint(1, size - length)
+
+        def remaining(position):
+            # position in the route of the given position of the remaining route
+            return np.where(position < start, position, position + length)
+
+        return np.where(positions < insert_position, remaining(positions),
+                        np.where(positions < insert_position + length, start + positions - insert_position,
+                                 remaining(positions - length)))
+
+    return _batch_mutate(individuals, rate, displacement_order)
+
+
+# mutations of whole offspring arrays, see ga()
+for _batch_mutation in (batch_swap_mutation, batch_inversion_mutation, batch_displacement_mutation):
+    _batch_mutation.batched = True
@@ -1,51 +1,541 @@
 import sys
 import os
-from utils.utils import fitness_function
+import numpy as np
+from functools import lru_cache
+from utils.utils import fitness_function, JUMP_AREAS, _compiled
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-def two_opt(route: list[int], geo_matrix: list[list[float]], max_iterations: int = 5) -> list[int]:
+@lru_cache(maxsize=None)
+def _two_opt_moves(route_length):
+    # pairs (i, j) with 1 <= i and i + 2 <= j <= route_length - 2, ordered by i then j
+    starts, ends = np.triu_indices(route_length - 1, k=2)
+    keep = starts >= 1
+    return starts[keep], ends[keep]
+
+
+@lru_cache(maxsize=None)
+def _or_opt_moves(route_length, max_segment_length):
+    # triples (i, s, j) relocating route[i:i+s] after route[j], ordered by i, then s, then j
+    starts = np.arange(1, route_length - 1)[:, np.newaxis, np.newaxis]
+    lengths = np.arange(1, max_segment_length + 1)[np.newaxis, :, np.newaxis]
+    targets = np.arange(0, route_length - 1)[np.newaxis, np.newaxis, :]
+    valid = (starts + lengths <= route_length - 1) & ((targets < starts - 1) | (targets >= starts + lengths))
+    i, s, j = np.nonzero(valid)
+    return i + 1, s + 1, j
+
+
+class _MoveDelta:
+    """
+    Shared scoring of local search moves for fitness_function.
+
+    Subclasses compute the path sum of every candidate move and describe where the move sends each
+    position (moved) and which old position ends up at each new position (origin). The position rules
+    of the compiled constraints and the 'QS' -> 'DV' rule of fitness_function only depend on the new
+    positions of a few areas, while endpoint and uniqueness rules cannot change with moves of the
+    route interior.
+    """
+
+    def __init__(self, geo_matrix, constraints=None, jump_areas=JUMP_AREAS, candidates=None):
+        self.geo_matrix = np.asarray(geo_matrix)
+        self.constraints = _compiled(constraints)
+        self.jump_areas = jump_areas
+        self.candidates = None if candidates is None else np.asarray(candidates)
+
+    def evaluate(self, route, geo_matrix):
+        # full evaluation with the same constraints and jump rule
+        return fitness_function(route, geo_matrix, self.constraints, self.jump_areas)
+
+    def _score(self, route, path_sum, moved, origin, new_routes):
+        geo_matrix = self.geo_matrix
+        route_length = len(route)
+        n_moves = len(path_sum)
+
+        def area_at(position):
+            # area at the given position of each new route
+            return route[origin(np.clip(position, 0, route_length - 1))]
+
+        constraints = self.constraints
+        jump_from, jump_to = self.jump_areas if self.jump_areas is not None else (-1, -1)
+        base_route = route[np.newaxis]
+        positions = constraints.first_positions(base_route, set(constraints.tracked_areas) | {jump_from, jump_to})
+        positions = {area: position[0] for area, position in positions.items()}
+
+        # endpoints and repeated areas are not affected by moves of the interior
+        structure_violations = constraints.structure_violations(base_route)
+        if any(violation[0] for violation in structure_violations.values()):
+            return np.full(n_moves, constraints.penalty), np.zeros(n_moves, dtype=bool)
+        if len(set(route[1:-1].tolist())) != route_length - 2:
+            # first occurrences of repeated areas do not simply follow the move
+            return _full_move_fitness(new_routes(), geo_matrix, self.evaluate)
+
+        # position rules only depend on where the move sends the constrained areas
+        moved_positions = {area: moved(positions[area]) for area in constraints.tracked_areas}
+        valid = np.ones(n_moves, dtype=bool)
+        for violation in constraints.position_violations(moved_positions, route_length).values():
+            valid &= ~violation
+
+        # handle special case for skipping 'KS' between 'QS' and 'DV'
+        fitnesses = path_sum
+        jumped_ks = np.zeros(n_moves, dtype=bool)
+        if positions[jump_from] >= 0 and positions[jump_to] >= 0:
+            qs_position = moved(positions[jump_from])
+            jumped_ks = moved(positions[jump_to]) == qs_position + 1
+            previous_area, next_area = area_at(qs_position - 1), area_at(qs_position + 2)
+            # the edge after 'DV' is skipped, and the jump replaces 'QS' -> 'DV' when that earns more
+            correction = (np.maximum(geo_matrix[previous_area, jump_to] - geo_matrix[jump_from, jump_to], 0)
+                          - geo_matrix[jump_to, next_area])
+            fitnesses = np.where(jumped_ks, path_sum + correction, path_sum)
+
+        fitnesses = np.where(valid, fitnesses, constraints.penalty)
+        return fitnesses, jumped_ks & valid
+
+
+class TwoOptDelta(_MoveDelta):
+    """
+    Delta evaluation of 2-opt moves for fitness_function.
+
+    Reversing the segment route[i:j+1] replaces the edges (i-1 -> i) and (j -> j+1) and flips every
+    internal edge. Since the Geo matrix is asymmetric, the engine keeps prefix sums of the route's
+    forward edges and of its backward (flipped) edges, so the path sum of every candidate reversal is
+    obtained in O(1). The position rules of the compiled constraints and the 'QS' -> 'DV' rule of
+    fitness_function only depend on the new positions of a few areas, which are also mapped through the
+    reversal in O(1), while endpoint and uniqueness rules cannot change with a reversal. All candidate
+    moves of a route are scored at once with array operations and give exactly the values that
+    fitness_function returns for the reversed routes.
+
+    With candidate successor lists (see Instance in utils/instance.py), only the moves whose new edge
+    (i-1 -> j) leads to one of the k candidate successors of the area at i-1 are considered, which
+    makes a scan O(n*k) instead of O(n^2) on large instances.
+
+    Parameters:
+        geo_matrix (list of lists): The Geo matrix.
+        constraints (CompiledConstraints or list of dict, optional): The route constraints, defaults to
+                                the constraints of the game.
+        jump_areas (tuple, optional): The codes of 'QS' and 'DV' for the jump rule, None to disable it.
+        candidates (numpy.ndarray, optional): An (n_areas x k) array of candidate successors of each area.
+
+    Example Usage:
+        delta = TwoOptDelta(geo_matrix)
+        starts, ends = delta.moves(route)
+        fitnesses, jumped_ks = delta.move_fitness(route)
+        # fitnesses[k] == fitness_function(route with route[starts[k]:ends[k]+1] reversed, geo_matrix)[0]
+    """
+
+    def moves(self, route):
+        """
+        Returns the segment bounds (i, j) of the 2-opt moves of a route, in the scan order of two_opt
+        (by i, then j): endpoints are kept fixed and adjacent elements are not swapped.
+
+        Parameters:
+            route (numpy.ndarray): The encoded route.
+
+        Returns:
+            tuple: Two arrays with the first and last position of each reversed segment.
+        """
+        route_length = len(route)
+        if self.candidates is None or route_length < 5:
+            return _two_opt_moves(route_length)
+
+        # position of every area inside the route (-1 for the areas that are not visited)
+        route = np.asarray(route, dtype=np.intp)
+        positions = np.full(len(self.geo_matrix), -1, dtype=np.intp)
+        positions[route[1:-1]] = np.arange(1, route_length - 1)
+
+        # the reversal starting at i brings a candidate successor of route[i-1] next to it
+        k = self.candidates.shape[1]
+        first = np.arange(1, route_length - 3)
+        starts = np.repeat(first, k)
+        ends = positions[self.candidates[route[first - 1]].ravel()]
+        keep = ends >= starts + 2
+        starts, ends = starts[keep], ends[keep]
+        order = np.lexsort((ends, starts))
+        return starts[order], ends[order]
+
+    def move_fitness(self, route, moves=None):
+        """
+        Scores the 2-opt moves of a route.
+
+        Parameters:
+            route (numpy.ndarray): The encoded route.
+            moves (tuple, optional): The (starts, ends) arrays of the moves, defaults to self.moves(route).
+
+        Returns:
+            tuple: Arrays with the fitness and jumped_ks flag of the route obtained by each move.
+        """
+        geo_matrix = self.geo_matrix
+        route = np.asarray(route, dtype=np.intp)
+        route_length = len(route)
+        starts, ends = self.moves(route) if moves is None else moves
+
+        # prefix sums of the forward edges and of the flipped edges
+        forward = np.zeros(route_length, dtype=geo_matrix.dtype)
+        backward = np.zeros(route_length, dtype=geo_matrix.dtype)
+        np.cumsum(geo_matrix[route[:-1], route[1:]], out=forward[1:])
+        np.cumsum(geo_matrix[route[1:], route[:-1]], out=backward[1:])
+
+        path_sum = (forward[-1]
+                    - (forward[ends + 1] - forward[starts - 1])
+                    + geo_matrix[route[starts - 1], route[ends]]
+                    + (backward[ends] - backward[starts])
+                    + geo_matrix[route[starts], route[ends + 1]])
+
+        def moved(position):
+            # new position of the area at the given position (-1 for missing areas stays -1)
+            return np.where((starts <= position) & (position <= ends), starts + ends - position, position)
+
+        def new_routes():
+            for i, j in zip(starts.tolist(), ends.tolist()):
+                new_route = route.copy()
+                new_route[i:j + 1] = new_route[i:j + 1][::-1]
+                yield new_route
+
+        # a reversal is its own inverse
+        return self._score(route, path_sum, moved, moved, new_routes)
+
+
+class OrOptDelta(_MoveDelta):
+    """
+    Delta evaluation of Or-opt moves for fitness_function.
+
+    An Or-opt move relocates the segment route[i:i+s] (s = 1 to 3 areas) between route[j] and route[j+1]
+    without reversing it. Only the three edges around the segment and the insertion point change, so on
+    the asymmetric Geo matrix the path sum of every candidate move is obtained in O(1) from
+    (a -> f), (l -> b), (c -> d) being replaced by (a -> b), (c -> f), (l -> d), where f and l are the first
+    and last areas of the segment, a and b its neighbours and c and d the areas around the insertion
+    point. The constraints and the 'QS' -> 'DV' rule are evaluated from the shifted positions, as in
+    TwoOptDelta, and the scores equal the values that fitness_function returns for the moved routes.
+
+    With candidate successor lists, only the insertions that create a candidate edge (c -> f) or (l -> d)
+    are considered.
+
+    Parameters:
+        geo_matrix (list of lists): The Geo matrix.
+        constraints (CompiledConstraints or list of dict, optional): The route constraints, defaults to
+                                the constraints of the game.
+        jump_areas (tuple, optional): The codes of 'QS' and 'DV' for the jump rule, None to disable it.
+        candidates (numpy.ndarray, optional): An (n_areas x k) array of candidate successors of each area.
+        max_segment_length (int): The longest segment relocated. Defaults to 3.
+
+    Example Usage:
+        delta = OrOptDelta(geo_matrix)
+        starts, lengths, targets = delta.moves(route)
+        fitnesses, jumped_ks = delta.move_fitness(route)
+        # fitnesses[k] == fitness_function(relocate_segment(route, starts[k], lengths[k], targets[k]), geo_matrix)[0]
+    """
+
+    def __init__(self, geo_matrix, constraints=None, jump_areas=JUMP_AREAS, candidates=None, max_segment_length=3):
+        super().__init__(geo_matrix, constraints, jump_areas, candidates)
+        self.max_segment_length = max_segment_length
+        if self.candidates is not None:
+            # is_candidate[a, b] is True when b is a candidate successor of a
+            self.is_candidate = np.zeros((len(self.geo_matrix), len(self.geo_matrix)), dtype=bool)
+            np.put_along_axis(self.is_candidate, self.candidates, True, axis=1)
+            # predecessors[b] lists the areas that have b as a candidate successor (padded with -1)
+            successors, areas = np.nonzero(self.is_candidate.T)
+            counts = np.bincount(successors, minlength=len(self.geo_matrix))
+            self.predecessors = np.full((len(self.geo_matrix), max(counts.max(initial=0), 1)), -1, dtype=np.intp)
+            self.predecessors[successors, np.arange(len(areas)) - np.repeat(np.cumsum(counts) - counts, counts)] = areas
+
+    def moves(self, route, dont_look=None):
+        """
+        Returns the Or-opt moves (i, s, j) of a route, ordered by i, then s, then j: the segment
+        route[i:i+s] is moved after route[j], endpoints are kept fixed.
+
+        Parameters:
+            route (numpy.ndarray): The encoded route.
+            dont_look (numpy.ndarray, optional): A boolean per area code, the segments starting at
+                                areas whose bit is set are skipped.
+
+        Returns:
+            tuple: Three arrays with the start, the length and the insertion point of each move.
+        """
+        route = np.asarray(route, dtype=np.intp)
+        if self.candidates is not None:
+            return self._candidate_moves(route, dont_look)
+        starts, lengths, targets = _or_opt_moves(len(route), self.max_segment_length)
+        if dont_look is None:
+            return starts, lengths, targets
+        keep = ~dont_look[route[starts]]
+        return starts[keep], lengths[keep], targets[keep]
+
+    def _candidate_moves(self, route, dont_look):
+        # the moves creating a candidate edge (c -> f) or (l -> d), built from the candidate lists in
+        # O(n*k) instead of filtering all O(n^2) moves
+        route_length = len(route)
+        starts, lengths = np.meshgrid(np.arange(1, route_length - 1), np.arange(1, self.max_segment_length + 1), indexing='ij')
+        valid = starts + lengths <= route_length - 1
+        starts, lengths = starts[valid], lengths[valid]
+        if dont_look is not None:
+            keep = ~dont_look[route[starts]]
+            starts, lengths = starts[keep], lengths[keep]
+
+        # position of every area, as the area before (c) and as the area after (d) the insertion point
+        positions_from = np.full(len(self.geo_matrix), -1, dtype=np.intp)
+        positions_to = positions_from.copy()
+        positions_from[route[::-1]] = np.arange(route_length - 1, -1, -1)
+        positions_to[route] = np.arange(route_length)
+
+        predecessors = self.predecessors[route[starts]]
+        after = np.where(predecessors >= 0, positions_from[predecessors], -1)
+        before = positions_to[self.candidates[route[starts + lengths - 1]]] - 1
+        targets = np.concatenate([after, before], axis=1)
+
+        starts = np.broadcast_to(starts[:, np.newaxis], targets.shape).ravel()
+        lengths = np.broadcast_to(lengths[:, np.newaxis], targets.shape).ravel()
+        targets = targets.ravel()
+        valid = ((targets >= 0) & (targets <= route_length - 2)
+                 & ((targets < starts - 1) | (targets >= starts + lengths)))
+
+        # unique moves in scan order
+        keys = np.unique((starts[valid] * (self.max_segment_length + 1) + lengths[valid]) * route_length + targets[valid])
+        segments, targets = np.divmod(keys, route_length)
+        starts, lengths = np.divmod(segments, self.max_segment_length + 1)
+        return starts, lengths, targets
+
+    def move_fitness(self, route, moves=None):
+        """
+        Scores the Or-opt moves of a route.
+
+        Parameters:
+            route (numpy.ndarray): The encoded route.
+            moves (tuple, optional): The (starts, lengths, targets) arrays of the moves, defaults to self.moves(route).
+
+        Returns:
+            tuple: Arrays with the fitness and jumped_ks flag of the route obtained by each move.
+        """
+        geo_matrix = self.geo_matrix
+        route = np.asarray(route, dtype=np.intp)
+        starts, lengths, targets = self.moves(route) if moves is None else moves
+        ends = starts + lengths
+
+        # the three replaced edges and the three new ones
+        a, f, l, b = route[starts - 1], route[starts], route[ends - 1], route[ends]
+        c, d = route[targets], route[targets + 1]
+        path_sum = (geo_matrix[route[:-1], route[1:]].sum()
+                    - geo_matrix[a, f] - geo_matrix[l, b] - geo_matrix[c, d]
+                    + geo_matrix[a, b] + geo_matrix[c, f] + geo_matrix[l, d])
+
+        forward = targets >= ends
+        shift = targets - ends + 1
+
+        def moved(position):
+            # new position of the area at the given position (-1 for missing areas stays -1)
+            after = np.where(position < starts, position,
+                             np.where(position < ends, position + shift,
+                                      np.where(position <= targets, position - lengths, position)))
+            before = np.where(position <= targets, position,
+                              np.where(position < starts, position + lengths,
+                                       np.where(position < ends, position - starts + targets + 1, position)))
+            return np.where(forward, after, before)
+
+        def origin(position):
+            # old position of the area at the given new position
+            after = np.where(position < starts, position,
+                             np.where(position <= targets - lengths, position + lengths,
+                                      np.where(position <= targets, position - shift, position)))
+            before = np.where(position <= targets, position,
+                              np.where(position <= targets + lengths, position + starts - targets - 1,
+                                       np.where(position < ends, position - lengths, position)))
+            return np.where(forward, after, before)
+
+        def new_routes():
+            for i, s, j in zip(starts.tolist(), lengths.tolist(), targets.tolist()):
+                yield relocate_segment(route, i, s, j)
+
+        return self._score(route, path_sum, moved, origin, new_routes)
+
+
+def relocate_segment(route, start, length, target):
+    """
+    Moves the segment route[start:start+length] after route[target], keeping its orientation.
+
+    Parameters:
+        route (numpy.ndarray): The encoded route.
+        start (int): The first position of the segment.
+        length (int): The number of areas in the segment.
+        target (int): The position, outside the segment, of the area the segment is moved after.
+
+    Returns:
+        numpy.ndarray: The new route.
+
+    Example Usage:
+        relocate_segment(np.array([0, 1, 2, 3, 4, 0]), 1, 2, 4)  # Output: array([0, 3, 4, 1, 2, 0])
+    """
+    end = start + length
+    if target >= end:
+        order = np.r_[0:start, end:target + 1, start:end, target + 1:len(route)]
+    else:
+        order = np.r_[0:target + 1, start:end, target + 1:start, end:len(route)]
+    return np.asarray(route)[order]
+
+
+def _full_move_fitness(new_routes, geo_matrix, evaluator):
+    # scores every move by evaluating the whole new route
+    results = [evaluator(new_route, geo_matrix) for new_route in new_routes]
+    if not results:
+        return np.array([]), np.array([], dtype=bool)
+    fitnesses, jumped_ks = zip(*results)
+    return np.array(fitnesses), np.array(jumped_ks, dtype=bool)
+
+
+def _select_move(fitnesses, jumped_ks, best_fit, best_jumped, strategy):
+    # index of the move to apply, None when no move improves (fitness, jumped_ks)
+    improving = (fitnesses > best_fit) | ((fitnesses == best_fit) & jumped_ks & (not best_jumped))
+    if not improving.any():
+        return None, improving
+    if strategy == 'first':
+        return np.argmax(improving), improving
+    top = improving & (fitnesses == fitnesses[improving].max())
+    return (np.argmax(top & jumped_ks) if (top & jumped_ks).any() else np.argmax(top)), improving
+
+
+def two_opt(route: np.ndarray, geo_matrix: list[list[float]], max_iterations: int = 5, strategy: str = 'first',
+            max_moves: int = 1, evaluator=None, constraints=None, jump_areas=JUMP_AREAS,
+            candidates=None) -> np.ndarray:
     """
     Optimizes a given route using the 2-opt algorithm. This algorithm attempts to reduce the travel
     cost by iteratively reversing segments of the route. It is commonly used in solving routing problems
     such as the Traveling Salesman Problem (TSP).
 
+    Candidate reversals are delta evaluated with TwoOptDelta, so each move costs O(1) instead of a full
+    fitness_function call. A move is accepted when it improves (fitness, jumped_ks) as compared by
+    fitness_function's return value. With the defaults the result is the same as a full scan that stops
+    at the first improving reversal.
+
     Parameters:
-    - route (List[int]): The initial route as a list of node indices.
+    - route (np.ndarray): The initial route as an array of node indices.
     - geo_matrix (List[List[float]]): A matrix representing the distances or costs between nodes.
-    - max_iterations (int): The maximum number of iterations to run the optimization. Defaults to 2.
+    - max_iterations (int): The maximum number of scans of the neighborhood. Defaults to 5.
+    - strategy (str): 'first' applies the first improving reversal in scan order, 'best' the most improving one.
+    - max_moves (int, optional): The maximum number of reversals applied, None for no limit. Defaults to 1.
+    - evaluator (function, optional): Evaluate every candidate route in full with this function instead
+      of delta evaluation (only needed for fitness functions other than fitness_function).
+    - constraints (CompiledConstraints or list of dict, optional): The route constraints, defaults to the
+      constraints of the game.
+    - jump_areas (tuple, optional): The codes of 'QS' and 'DV' for the jump rule, None to disable it.
+    - candidates (numpy.ndarray, optional): Candidate successor lists restricting the scanned moves
+      (see Instance.candidates), None to scan every move.
 
     Returns:
-    - List[int]: The optimized route, potentially improved from the initial route if better configurations are found.
+    - np.ndarray: The optimized route, potentially improved from the initial route if better configurations are found.
 
     Example Usage:
-        route = [0, 1, 2, 3, 0]
+        route = np.array([0, 1, 2, 3, 0])
         geo_matrix = [[0, 10, 15, 20], [10, 0, 35, 25], [15, 35, 0, 30], [20, 25, 30, 0]]
         optimized_route = two_opt(route, geo_matrix, max_iterations=5)
+        optimized_route = two_opt(route, geo_matrix, strategy='best', max_moves=None)
     """
-    best_route = route[:]
-    improved = False
-    iteration = 0
-
-    while not improved and iteration < max_iterations:
-        improved = False
-        best_fit = fitness_function(best_route, geo_matrix)
-        # keep endpoints fixed
-        for i in range(1, len(best_route) - 2):
-            for j in range(i + 1, len(best_route) - 1):
-                if j - i == 1:
-                    continue  # dont need to swap adjacent elements
-                new_route = best_route[:]
-                # reverse the segment between i and j+1
-                new_route[i:j + 1] = reversed(new_route[i:j + 1])
-                new_fit = fitness_function(new_route, geo_matrix)
-                if new_fit > best_fit:
-                    best_route = new_route
-                    best_fit = new_fit
-                    improved = True
-                    break
-            if improved:
-                break
-        iteration += 1
-
-    return best_route
\ No newline at end of file
+    if strategy not in ('first', 'best'):
+        raise ValueError(f"Unknown 2-opt strategy '{strategy}', expected 'first' or 'best'")
+
+    best_route = np.array(route)
+    delta = TwoOptDelta(geo_matrix, constraints, jump_areas, candidates)
+
+    moves = 0
+    for iteration in range(max_iterations):
+        starts, ends = delta.moves(best_route)
+        if len(starts) == 0:
+            break
+
+        if evaluator is None:
+            best_fit, best_jumped = fitness_function(best_route, delta.geo_matrix, delta.constraints, jump_areas)
+        else:
+            best_fit, best_jumped = evaluator(best_route, delta.geo_matrix)
+        if evaluator is None:
+            fitnesses, jumped_ks = delta.move_fitness(best_route, (starts, ends))
+        else:
+            reversed_routes = (np.r_[best_route[:i], best_route[i:j + 1][::-1], best_route[j + 1:]]
+                               for i, j in zip(starts.tolist(), ends.tolist()))
+            fitnesses, jumped_ks = _full_move_fitness(reversed_routes, delta.geo_matrix, evaluator)
+
+        # same ordering as comparing (fitness, jumped_ks) tuples
+        move, improving = _select_move(fitnesses, jumped_ks, best_fit, best_jumped, strategy)
+        if move is None:
+            break  # the scan is deterministic, repeating it cannot find a move
+
+        # reverse the segment between i and j+1
+        i, j = starts[move], ends[move]
+        best_route[i:j + 1] = best_route[i:j + 1][::-1]
+
+        moves += 1
+        if max_moves is not None and moves >= max_moves:
+            break
+
+    return best_route
+
+
+def or_opt(route: np.ndarray, geo_matrix: list[list[float]], max_segment_length: int = 3, strategy: str = 'first',
+           max_moves: int = None, evaluator=None, constraints=None, jump_areas=JUMP_AREAS,
+           candidates=None) -> np.ndarray:
+    """
+    Optimizes a given route with Or-opt moves: segments of 1 to max_segment_length areas are relocated
+    elsewhere in the route without being reversed. Unlike 2-opt, a move keeps the direction of every
+    internal edge, which matters on the asymmetric Geo matrix, and each move is delta evaluated in O(1)
+    with OrOptDelta.
+
+    Don't-look bits keep the search focused on the recent changes: once no segment starting at an area
+    improves the route, the area is skipped until one of the edges next to it changes.
+
+    Parameters:
+    - route (np.ndarray): The initial route as an array of node indices.
+    - geo_matrix (List[List[float]]): A matrix representing the distances or costs between nodes.
+    - max_segment_length (int): The longest segment relocated. Defaults to 3.
+    - strategy (str): 'first' applies the first improving move in scan order, 'best' the most improving one.
+    - max_moves (int, optional): The maximum number of moves applied, None to stop at a local optimum. Defaults to None.
+    - evaluator (function, optional): Evaluate every candidate route in full with this function instead
+      of delta evaluation (only needed for fitness functions other than fitness_function).
+    - constraints (CompiledConstraints or list of dict, optional): The route constraints, defaults to the
+      constraints of the game.
+    - jump_areas (tuple, optional): The codes of 'QS' and 'DV' for the jump rule, None to disable it.
+    - candidates (numpy.ndarray, optional): Candidate successor lists restricting the insertion points
+      (see Instance.candidates), None to try every insertion point.
+
+    Returns:
+    - np.ndarray: The optimized route, potentially improved from the initial route if better configurations are found.
+
+    Example Usage:
+        route = np.array([0, 1, 2, 3, 0])
+        geo_matrix = [[0, 10, 15, 20], [10, 0, 35, 25], [15, 35, 0, 30], [20, 25, 30, 0]]
+        optimized_route = or_opt(route, geo_matrix)
+        optimized_route = or_opt(two_opt(route, geo_matrix), geo_matrix, max_segment_length=1)
+    """
+    if strategy not in ('first', 'best'):
+        raise ValueError(f"Unknown Or-opt strategy '{strategy}', expected 'first' or 'best'")
+
+    best_route = np.array(route)
+    delta = OrOptDelta(geo_matrix, constraints, jump_areas, candidates, max_segment_length)
+    dont_look = np.zeros(len(delta.geo_matrix), dtype=bool)
+
+    moves = 0
+    while True:
+        starts, lengths, targets = delta.moves(best_route, dont_look)
+        if len(starts) == 0:
+            break
+
+        if evaluator is None:
+            best_fit, best_jumped = fitness_function(best_route, delta.geo_matrix, delta.constraints, jump_areas)
+            fitnesses, jumped_ks = delta.move_fitness(best_route, (starts, lengths, targets))
+        else:
+            best_fit, best_jumped = evaluator(best_route, delta.geo_matrix)
+            moved_routes = (relocate_segment(best_route, i, s, j)
+                            for i, s, j in zip(starts.tolist(), lengths.tolist(), targets.tolist()))
+            fitnesses, jumped_ks = _full_move_fitness(moved_routes, delta.geo_matrix, evaluator)
+
+        # the areas whose segments cannot improve the route are not looked at again
+        move, improving = _select_move(fitnesses, jumped_ks, best_fit, best_jumped, strategy)
+        dont_look[best_route[starts]] = True
+        dont_look[best_route[starts[improving]]] = False
+        if move is None:
+            break
+
+        # the areas next to the replaced edges are looked at again
+        i, s, j = starts[move], lengths[move], targets[move]
+        dont_look[best_route[[i - 1, i, i + s - 1, i + s, j, j + 1]]] = False
+        best_route = relocate_segment(best_route, i, s, j)
+
+        moves += 1
+        if max_moves is not None and moves >= max_moves:
+            break
+
+    return best_route
@@ -1,4 +1,5 @@
 import random
+import numpy as np
 
 def roulette_selection(population, fitnesses):
     """
@@ -10,7 +11,7 @@ def roulette_selection(population, fitnesses):
     their chances of selection.
 
     Args:
-        population (list): A list of individuals in the population.
+        population (numpy.ndarray or list): The individuals in the population (one encoded route per row).
         fitnesses (list): A list of fitness scores corresponding to each individual.
 
     Returns:
@@ -40,7 +41,7 @@ def tournament_selection(population, fitnesses):
     selected individual.
 
     Args:
-        population (list): A list of individuals in the population.
+        population (numpy.ndarray or list): The individuals in the population (one encoded route per row).
         fitnesses (list): A list of fitness scores corresponding to each individual.
 
     Returns:
@@ -52,12 +53,54 @@ def tournament_selection(population, fitnesses):
         selected_individual = tournament_selection(population, fitnesses)
     """
     # randomly select a subset of individuals from the population (between 3 to 6 individuals)
-    selected_individuals = random.choices(population, k=random.randint(3, 6))
+    selected_indices = random.choices(range(len(population)), k=random.randint(3, 6))
     
     # find the individual with the highest fitness score in the selected subset
-    best_individual = max(selected_individuals, key=lambda ind: fitnesses[population.index(ind)])
+    best_index = max(selected_indices, key=lambda idx: fitnesses[idx])
     
-    return best_individual
+    return population[best_index]
+
+def batch_tournament_selection(fitnesses, n_pairs, tournament_size=(3, 6)):
+    """
+    Selects the parents of a whole generation at once using tournament selection on indices.
+
+    Every parent is the winner of its own tournament, as in tournament_selection, but all the
+    tournaments are drawn together as an (n_pairs x 2 x max_size) array of contestant indices and
+    decided with one argmax over their fitness scores. Contestants beyond the size drawn for a
+    tournament are masked out, and ties go to the first contestant drawn.
+
+    Args:
+        fitnesses (list or numpy.ndarray): The fitness scores of the individuals in the population.
+        n_pairs (int): The number of parent pairs to select.
+        tournament_size (int or tuple): The number of contestants per tournament, or the (min, max)
+                                        range it is drawn from for every tournament.
+
+    Returns:
+        numpy.ndarray: An (n_pairs x 2) array with the population indices of the parents of each pair.
+
+    Example:
+        fitnesses = [0.7, 0.4, 0.9, 0.5, 0.6, 0.8]
+        parent_pairs = batch_tournament_selection(fitnesses, n_pairs=3, tournament_size=2)
+        for i, j in parent_pairs:
+            child1, child2 = order_crossover(population[i], population[j])
+    """
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    if isinstance(tournament_size, int):
+        min_size, max_size = tournament_size, tournament_size
+    else:
+        min_size, max_size = tournament_size
+
+    # draw the size and the contestants of every tournament
+    sizes = np.random.randint(min_size, max_size + 1, size=(n_pairs, 2))
+    contestants = np.random.randint(0, len(fitnesses), size=(n_pairs, 2, max_size))
+
+    # the contestant with the highest fitness score wins each tournament
+    scores = np.where(np.arange(max_size) < sizes[..., np.newaxis], fitnesses[contestants], -np.inf)
+    winners = np.take_along_axis(contestants, scores.argmax(axis=2)[..., np.newaxis], axis=2)
+    return winners[..., 0]
+
+# selects parent index pairs for a whole generation, see ga()
+batch_tournament_selection.batched = True
 
 def rank_selection(population, fitnesses):
     """
@@ -68,7 +111,7 @@ def rank_selection(population, fitnesses):
     higher probabilities of selection.
 
     Args:
-        population (list): A list of individuals in the population.
+        population (numpy.ndarray or list): The individuals in the population (one encoded route per row).
         fitnesses (list): A list of fitness scores corresponding to each individual.
 
     Returns:
@@ -90,3 +133,166 @@ def rank_selection(population, fitnesses):
     
     return population[selected_index]
 
+
+def roulette_weights(fitnesses):
+    """
+    Converts fitness scores to roulette wheel weights.
+
+    Fitness scores can be negative (fitness_function penalizes infeasible routes), so when the lowest
+    score is negative every score is shifted by it and the worst individual gets no slice of the wheel.
+    When every weight is zero, all individuals get the same slice.
+
+    Args:
+        fitnesses (list or numpy.ndarray): The fitness scores of the individuals in the population.
+
+    Returns:
+        numpy.ndarray: The non-negative selection weight of each individual.
+
+    Example:
+        roulette_weights([-200, 100, 300])  # Output: array([  0., 300., 500.])
+    """
+    weights = np.asarray(fitnesses, dtype=float)
+    if weights.min() < 0:
+        weights = weights - weights.min()
+    if weights.sum() <= 0:
+        weights = np.ones(len(weights))
+    return weights
+
+def rank_weights(fitnesses):
+    """
+    Converts fitness scores to rank selection weights, n for the fittest individual down to 1 for the
+    least fit, with ties ranked by position as in rank_selection.
+
+    Args:
+        fitnesses (list or numpy.ndarray): The fitness scores of the individuals in the population.
+
+    Returns:
+        numpy.ndarray: The selection weight of each individual.
+
+    Example:
+        rank_weights([0.7, 0.4, 0.9])  # Output: array([2., 1., 3.])
+    """
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    ranked_indices = np.argsort(-fitnesses, kind='stable')
+    weights = np.empty(len(fitnesses))
+    weights[ranked_indices] = np.arange(len(fitnesses), 0, -1)
+    return weights
+
+class ParentSampler:
+    """
+    Draws population indices with probabilities proportional to fixed weights, built once per generation.
+
+    The 'alias' method builds a Vose alias table in O(n), after which every draw costs O(1): a uniform
+    column is picked and either kept or replaced by its alias. The 'sus' method uses stochastic universal
+    sampling, which places all draws on evenly spaced pointers over the cumulative weights with a single
+    random offset, so every individual is drawn within one of its expected number of times.
+
+    Args:
+        weights (list or numpy.ndarray): The non-negative selection weights (see roulette_weights and rank_weights).
+        method (str): 'alias' for independent draws, 'sus' for stochastic universal sampling.
+
+    Example:
+        sampler = ParentSampler(roulette_weights(fitnesses), method='sus')
+        parent_pairs = sampler.pairs(len(fitnesses) // 2)
+    """
+
+    def __init__(self, weights, method='alias'):
+        if method not in ('alias', 'sus'):
+            raise ValueError(f"Unknown sampling method '{method}', expected 'alias' or 'sus'")
+        weights = np.asarray(weights, dtype=float)
+        if len(weights) == 0 or weights.min() < 0 or weights.sum() <= 0:
+            raise ValueError("Selection weights must be non-negative with a positive sum")
+        self.method = method
+        self.probabilities = weights / weights.sum()
+        if method == 'alias':
+            self.accept, self.alias = self._alias_table(self.probabilities)
+        else:
+            self.cumulative = np.cumsum(self.probabilities)
+
+    @staticmethod
+    def _alias_table(probabilities):
+        # Vose's alias method: every column holds a share of one small entry topped up by one large entry
+        n = len(probabilities)
+        scaled = probabilities * n
+        accept = np.ones(n)
+        alias = np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            accept[less], alias[less] = scaled[less], more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # the leftovers are full columns up to rounding errors
+        return accept, alias
+
+    def sample(self, size):
+        """
+        Draws population indices.
+
+        Args:
+            size (int): The number of indices to draw.
+
+        Returns:
+            numpy.ndarray: The drawn indices, in random order.
+        """
+        if self.method == 'alias':
+            columns = np.random.randint(0, len(self.accept), size=size)
+            return np.where(np.random.random(size) < self.accept[columns], columns, self.alias[columns])
+
+        pointers = (np.random.random() + np.arange(size)) / size
+        indices = np.minimum(np.searchsorted(self.cumulative, pointers, side='right'), len(self.cumulative) - 1)
+        # the pointers are sorted, shuffle them so that pairs mix different individuals
+        return np.random.permutation(indices)
+
+    def pairs(self, n_pairs):
+        """
+        Draws parent index pairs.
+
+        Args:
+            n_pairs (int): The number of parent pairs to draw.
+
+        Returns:
+            numpy.ndarray: An (n_pairs x 2) array of population indices.
+        """
+        return self.sample(2 * n_pairs).reshape(n_pairs, 2)
+
+def batch_roulette_selection(fitnesses, n_pairs, method='alias'):
+    """
+    Selects the parents of a whole generation at once using roulette wheel selection on indices,
+    with a ParentSampler built once from roulette_weights.
+
+    Args:
+        fitnesses (list or numpy.ndarray): The fitness scores of the individuals in the population.
+        n_pairs (int): The number of parent pairs to select.
+        method (str): 'alias' for independent draws, 'sus' for stochastic universal sampling.
+
+    Returns:
+        numpy.ndarray: An (n_pairs x 2) array with the population indices of the parents of each pair.
+
+    Example:
+        parent_pairs = batch_roulette_selection([-150, 400, 250, 300], n_pairs=2, method='sus')
+    """
+    return ParentSampler(roulette_weights(fitnesses), method).pairs(n_pairs)
+
+batch_roulette_selection.batched = True
+
+def batch_rank_selection(fitnesses, n_pairs, method='alias'):
+    """
+    Selects the parents of a whole generation at once using rank-based selection on indices,
+    with a ParentSampler built once from rank_weights.
+
+    Args:
+        fitnesses (list or numpy.ndarray): The fitness scores of the individuals in the population.
+        n_pairs (int): The number of parent pairs to select.
+        method (str): 'alias' for independent draws, 'sus' for stochastic universal sampling.
+
+    Returns:
+        numpy.ndarray: An (n_pairs x 2) array with the population indices of the parents of each pair.
+
+    Example:
+        parent_pairs = batch_rank_selection([-150, 400, 250, 300], n_pairs=2)
+    """
+    return ParentSampler(rank_weights(fitnesses), method).pairs(n_pairs)
+
+batch_rank_selection.batched = True
@@ -1,51 +1,63 @@
 import random
+import numpy as np
+from utils.utils import AREA_CODEC
 
-def generate_individual() -> list[str]:
+def generate_individual(instance=None) -> np.ndarray:
     """
     Generate a game route starting and ending at 'Dirtmouth' ('D') without strict sequence rules.
+    The route is encoded as an array of area indices (see AreaCodec in utils/utils.py).
+
+    Parameters:
+    instance (Instance, optional): The instance to generate a route for (any number of areas, starting
+                                   and ending at its depot), defaults to the areas of the game.
         
     Returns:
-    list: A list representing a route starting and ending at 'Dirtmouth'.
+    numpy.ndarray: An array representing a route starting and ending at 'Dirtmouth'.
 
     Example Usage:
     generate_individual()
-    # Output: ['D', 'FC', 'G', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']
+    # Output: array([0, 2, 1, 3, 4, 5, 6, 7, 8, 9, 0], dtype=uint8)
+    # Decoded: ['D', 'FC', 'G', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']
     """
     # define the areas in the game
-    areas = ['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG']
+    codec = AREA_CODEC if instance is None else instance.codec
+    areas = list(range(len(codec)))
+    dirtmouth = codec.index['D'] if instance is None else instance.depot_index
 
     # initialize the route starting at 'Dirtmouth'
-    route = ['D']
+    route = [dirtmouth]
     
     # exclude 'Dirtmouth' for route generation
-    possible_areas = [area for area in areas if area != 'D']
+    possible_areas = [area for area in areas if area != dirtmouth]
     
     random.shuffle(possible_areas)
 
     route.extend(possible_areas)
-    route.append('D') # end at 'Dirtmouth'
+    route.append(dirtmouth) # end at 'Dirtmouth'
     
-    return route
+    return np.array(route, dtype=codec.dtype)
 
-def population(n: int) -> list[list[str]]:
+def population(n: int, instance=None) -> np.ndarray:
     """
-    Generate a population of individual game routes, each represented as a list.
+    Generate a population of individual game routes as a 2-D array with one encoded route per row.
 
     Parameters:
     number (int): The number of individual routes to generate.
+    instance (Instance, optional): The instance to generate routes for, defaults to the areas of the game.
 
     Returns:
-    list: A list of generated individual game routes.
+    numpy.ndarray: An (n x route_length) array of generated individual game routes.
 
     Example Usage:
     population(5)
-    # Output: [['D', 'FC', 'G', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']
-    #          ['D', 'SN', 'QS', 'FC', 'CS', 'DV', 'RG', 'G', 'QG', 'KS', 'D']
-    #          ['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']
-    #          ['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']
-    #          ['D', 'FC', 'G', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']]
+    # Output: array([[0, 2, 1, 3, 4, 5, 6, 7, 8, 9, 0],
+    #                [0, 7, 8, 2, 4, 6, 9, 1, 3, 5, 0],
+    #                [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0],
+    #                [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0],
+    #                [0, 2, 1, 3, 4, 5, 6, 7, 8, 9, 0]], dtype=uint8)
     """
     # generate n individuals
-    population = [generate_individual() for _ in range(n)]
+    codec = AREA_CODEC if instance is None else instance.codec
+    population = np.array([generate_individual(instance) for _ in range(n)], dtype=codec.dtype)
     
     return population
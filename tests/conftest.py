@@ -0,0 +1,10 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from operators.crossovers import *
+
+
+def pytest_generate_tests(metafunc):
+    # run the crossover checks of test_crossover.py once per crossover operator
+    if 'crossover' in metafunc.fixturenames:
+        metafunc.parametrize('crossover', [partially_mapped_crossover, order_crossover, fast_order_mapped_crossover, cycle_crossover])
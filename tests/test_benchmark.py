@@ -0,0 +1,35 @@
+import sys
+import os
+import copy
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.benchmark import *
+
+
+def test_benchmark(verbose=False):
+    '''
+    Checks that the benchmark suite times every case of a small grid and flags the cases slower than the
+    baseline by more than the threshold.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_benchmark(verbose=True)
+    '''
+    results = run_benchmarks(population_sizes=(10,), route_sizes=(10, 12), groups=('crossover', 'fitness', 'local_search'),
+                             min_time=0, repeat=1, verbose=verbose)
+    expected = 2 * (len(CROSSOVERS) + len(BATCH_CROSSOVERS) + 2 + 2)
+    if len(results['results']) != expected or not all(result['seconds'] > 0 for result in results['results'].values()):
+        raise ValueError(f"Error: expected {expected} timed cases, got {len(results['results'])}")
+
+    for i, (scale, expected_regressions) in enumerate([(2.0, 0), (1.0, 0), (0.5, expected)]):
+        baseline = copy.deepcopy(results)
+        for result in baseline['results'].values():
+            result['seconds'] *= scale
+        comparisons, regressions = compare_results(results, baseline, threshold=0.25)
+        if verbose:
+            print(f"Iteration {i+1}: baseline x{scale}, {len(regressions)} regressions")
+        if len(comparisons) != expected or len(regressions) != expected_regressions:
+            raise ValueError(f"Error in iteration {i+1}: expected {expected_regressions} regressions against a baseline x{scale}, got {len(regressions)}")
+    else:
+        print(f"Test passed for iteration {i+1}")
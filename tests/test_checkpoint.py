@@ -0,0 +1,67 @@
+import sys
+import os
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ga.genetic_algorithm import *
+
+
+def test_checkpoint_resume(verbose=False):
+    '''
+    Checks that a run interrupted after a checkpoint and resumed from it gives the result of the
+    uninterrupted run, and that a checkpoint cannot resume a run on another Geo matrix.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_checkpoint_resume(verbose=True)
+    '''
+    configurations = [dict(), dict(selection=batch_tournament_selection, crossover=batch_order_crossover, mutation=batch_swap_mutation),
+                      dict(selection=roulette_selection, fitness_cache_size=1000, stall_generations=6),
+                      dict(instance=Instance.random(20, seed=2, candidates_k=5), local_search=[two_opt, or_opt])]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i, configuration in enumerate(configurations):
+            options = dict(configuration, population_size=20, num_generations=12, verbose=False, visualize=False, dashboard=True)
+            random.seed(i)
+            np.random.seed(i)
+            routes, fitnesses, best_route, best_fitness, matrix = ga(**options, matrix_seed=i)
+
+            # interrupt the run after generation 7, its last checkpoint being the one of generation 5
+            path = os.path.join(directory, f"run_{i}.ckpt")
+            random.seed(i)
+            np.random.seed(i)
+            evolution = Evolution(**configuration, matrix_seed=i, population_size=20, num_generations=12,
+                                  checkpoint_path=path, checkpoint_interval=5, keep_history=True)
+            for snapshot in evolution:
+                if snapshot.generation == 6:
+                    break
+            evolution.close()
+
+            random.seed(100 + i)
+            np.random.seed(100 + i)
+            result = ga(**options, resume_from=path, checkpoint_path=path)
+            if verbose:
+                print(f"Iteration {i+1}: {fitnesses} -> {result[1]}")
+            if result[1] != fitnesses or not all(np.array_equal(route, resumed) for route, resumed in zip(routes, result[0])) \
+                    or len(result[0]) != len(routes) or not np.array_equal(result[2], best_route) or result[3] != best_fitness:
+                raise ValueError(f"Error in iteration {i+1}: the resumed run differs from the uninterrupted one")
+
+            # the final checkpoint resumes a finished run
+            evolution = Evolution(**configuration, population_size=20, num_generations=12, resume_from=path)
+            if list(evolution) or evolution.best()[1] != best_fitness or evolution.stop_reason != result.stop_reason:
+                raise ValueError(f"Error in iteration {i+1}: the final checkpoint does not hold the finished run")
+
+        try:
+            Evolution(matrix_seed=1, population_size=20, resume_from=os.path.join(directory, 'run_0.ckpt'), matrix_to_use=matrix)
+        except ValueError:
+            pass
+        else:
+            raise ValueError("Error: a checkpoint resumed a run on another Geo matrix")
+
+    print(f"Test passed for iteration {i+1}")
+
+
+if __name__ == '__main__':
+    test_checkpoint_resume(verbose=True)
@@ -0,0 +1,50 @@
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pop.population import population
+from operators.optimizations import *
+from utils.utils import *
+
+
+def test_constraints(verbose=False):
+    '''
+    Checks that the compiled constraints give the same per-rule results for single routes and whole
+    populations, and that fitness_function, batch_fitness and two_opt agree under an extra rule.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_constraints(verbose=True)
+    '''
+    spec = ROUTE_CONSTRAINTS + [{'rule': 'window', 'area': 'KS', 'end': 5},
+                                {'rule': 'precedence', 'before': 'G', 'after': 'SN'}]
+    constraints = compile_constraints(spec, AREA_TO_INDEX)
+
+    for i in range(5):
+        matrix = np.array(geo_matrix_generator(seed=i))
+        routes = population(100)
+        # break the endpoints and the uniqueness of some routes
+        for route in routes[:20]:
+            route[random.randint(0, len(route) - 1)] = random.randint(0, len(AREAS) - 1)
+
+        for compiled in (CONSTRAINTS, constraints):
+            satisfied = compiled.satisfied(routes)
+            for j, route in enumerate(routes):
+                if compiled.check(route.tolist()) != satisfied[j].tolist():
+                    raise ValueError(f"Error in iteration {i+1}: {compiled.names} of {AREA_CODEC.decode(route)} are {compiled.check(route.tolist())} for one route and {satisfied[j].tolist()} for the population")
+
+        fitnesses, jumped_ks = batch_fitness(routes, matrix, constraints)
+        for j, route in enumerate(routes):
+            if (fitnesses[j], jumped_ks[j]) != fitness_function(route, matrix, constraints):
+                raise ValueError(f"Error in iteration {i+1}: batch_fitness and fitness_function disagree on {AREA_CODEC.decode(route)}")
+            optimized = two_opt(route, matrix, strategy='best', max_moves=None, constraints=constraints)
+            expected = two_opt(route, matrix, strategy='best', max_moves=None,
+                               evaluator=lambda new_route, m: fitness_function(new_route, m, constraints))
+            if not np.array_equal(optimized, expected):
+                raise ValueError(f"Error in iteration {i+1}: two_opt returned {AREA_CODEC.decode(optimized)} instead of {AREA_CODEC.decode(expected)}")
+        if verbose:
+            print(f"Iteration {i+1}: {constraints.feasible(routes).sum()} feasible routes")
+    else:
+        print(f"Test passed for iteration {i+1}")
@@ -1,7 +1,7 @@
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from pop.population import generate_individual
+from pop.population import generate_individual, population
 from operators.crossovers import *
 
 
@@ -28,9 +28,45 @@ def test_crossover(crossover, verbose=False):
         if len(child1) != len(parent1) or len(child2) != len(parent2):
             raise ValueError(f"Error in iteration {i+1}: The children should have the same length as the parents. Child1: {child1}, Child2: {child2}")
         for j in range(1, len(child1) - 1):
-            if child1.count(child1[j]) > 1 or child2.count(child2[j]) > 1:
+            if list(child1).count(child1[j]) > 1 or list(child2).count(child2[j]) > 1:
                 raise ValueError(f"Error in iteration {i+1}: The children should not have duplicate values. Child1: {child1}, Child2: {child2} (index {j})")
         else:
             if i == 49:
                 print(f"Test passed for iteration {i+1}")
 
+
+def test_batch_crossover(verbose=False):
+    '''
+    Checks that the batched crossovers keep the 'D' endpoints and return valid permutations for every
+    pair, and that the segment-based ones copy each segment from the other parent.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_batch_crossover(verbose=True)
+    '''
+    batch_crossovers = [batch_partially_mapped_crossover, batch_order_crossover, batch_fast_order_mapped_crossover, batch_cycle_crossover]
+
+    for i in range(10):
+        parents1, parents2 = population(200), population(200)
+        cut_points = batch_cut_points(200, parents1.shape[1])
+        for batch_crossover in batch_crossovers:
+            if batch_crossover is batch_cycle_crossover:
+                offspring = batch_crossover(parents1, parents2)
+            else:
+                offspring = batch_crossover(parents1, parents2, cut_points)
+            if verbose:
+                print(f"Iteration {i+1}: {batch_crossover.__name__} first children {offspring[0]}, {offspring[1]}")
+            if offspring.shape != (400, parents1.shape[1]):
+                raise ValueError(f"Error in iteration {i+1}: {batch_crossover.__name__} returned offspring of shape {offspring.shape}")
+            if not (offspring[:, 0] == parents1[0, 0]).all() or not (offspring[:, -1] == parents1[0, -1]).all():
+                raise ValueError(f"Error in iteration {i+1}: {batch_crossover.__name__} moved the 'D' endpoints")
+            if not (np.sort(offspring[:, 1:-1], axis=1) == np.sort(parents1[0, 1:-1])).all():
+                raise ValueError(f"Error in iteration {i+1}: {batch_crossover.__name__} returned children with duplicate values")
+            if batch_crossover in (batch_partially_mapped_crossover, batch_order_crossover):
+                for k, (start, end) in enumerate(cut_points):
+                    if (offspring[2 * k, start:end + 1] != parents2[k, start:end + 1]).any() or (offspring[2 * k + 1, start:end + 1] != parents1[k, start:end + 1]).any():
+                        raise ValueError(f"Error in iteration {i+1}: {batch_crossover.__name__} did not swap the segment {start}:{end + 1} of pair {k}")
+    else:
+        print(f"Test passed for iteration {i+1}")
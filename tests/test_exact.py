@@ -0,0 +1,38 @@
+import sys
+import os
+import itertools
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ga.exact import *
+from utils.utils import *
+from utils.instance import Instance
+
+
+def test_exhaustive_search(verbose=False):
+    '''
+    Checks that permutation_chunks streams every permutation once, in lexicographic order, and that
+    exhaustive_search finds the best route found by scoring every permutation with fitness_function.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_exhaustive_search(verbose=True)
+    '''
+    for i in range(5):
+        n_items, chunk_size = i + 2, [1, 5, 24, 100, 7][i]
+        chunks = list(permutation_chunks(np.arange(n_items), chunk_size))
+        if any(len(chunk) > chunk_size for chunk in chunks):
+            raise ValueError(f"Error in iteration {i+1}: a chunk holds more than {chunk_size} permutations")
+        if not np.array_equal(np.vstack(chunks), np.array(list(itertools.permutations(range(n_items))))):
+            raise ValueError(f"Error in iteration {i+1}: permutation_chunks did not enumerate the {n_items}! permutations in order")
+
+        instance = Instance.random(size=7, seed=i)
+        best_route, best_fitness, jumped_ks = exhaustive_search(instance=instance, chunk_size=50)
+        expected = max(fitness_function([0, *interior, 0], instance.geo_matrix, instance.constraints, instance.jump_areas)
+                       for interior in itertools.permutations(range(1, 7)))
+        if (best_fitness, jumped_ks) != expected or fitness_function(best_route, instance.geo_matrix, instance.constraints, instance.jump_areas) != expected:
+            raise ValueError(f"Error in iteration {i+1}: exhaustive_search returned {(best_fitness, jumped_ks)} instead of {expected}")
+        if verbose:
+            print(f"Iteration {i+1}: optimum {instance.codec.decode(best_route)} with fitness {best_fitness}")
+    else:
+        print(f"Test passed for iteration {i+1}")
@@ -0,0 +1,80 @@
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pop.population import population
+from utils.utils import *
+
+
+def test_batch_fitness(verbose=False):
+    '''
+    Checks that batch_fitness returns exactly what fitness_function returns, for valid routes,
+    routes that break the constraints and routes that jump from 'QS' straight to 'DV'.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_batch_fitness(verbose=True)
+    '''
+
+    for i in range(20):
+        matrix = geo_matrix_generator(seed=i)
+        routes = population(200)
+
+        # force some 'QS' -> 'DV' jumps and some repeated areas
+        qs, dv, g = AREA_CODEC.index['QS'], AREA_CODEC.index['DV'], AREA_CODEC.index['G']
+        for route in routes[:50]:
+            qs_position, dv_position = list(route).index(qs), list(route).index(dv)
+            if qs_position < len(route) - 2:
+                route[[qs_position + 1, dv_position]] = route[[dv_position, qs_position + 1]]
+        for route in routes[50:60]:
+            route[random.randint(1, len(route) - 2)] = g
+
+        expected = [fitness_function(route, matrix) for route in routes]
+        fitnesses, jumped_ks = batch_fitness(routes, matrix)
+        if verbose:
+            print(f"Iteration {i+1}: best fitness {max(fitnesses)}, jumps {sum(jumped_ks)}")
+        for j, (fitness, jumped) in enumerate(expected):
+            if fitnesses[j] != fitness or jumped_ks[j] != jumped:
+                raise ValueError(f"Error in iteration {i+1}: batch_fitness returned {(fitnesses[j], jumped_ks[j])} instead of {(fitness, jumped)} for route {AREA_CODEC.decode(routes[j])}")
+    else:
+        print(f"Test passed for iteration {i+1}")
+
+
+def test_fitness_sharing(verbose=False):
+    '''
+    Checks genotypic_diversity and fitness_shared against the pairwise comparisons of
+    individual_genotypic_diversity, including populations with duplicated individuals.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_fitness_sharing(verbose=True)
+    '''
+    for i in range(20):
+        routes = population(random.randint(2, 60))
+        if i % 2 == 0:
+            routes[:len(routes) // 2] = routes[0]
+        fitnesses = [random.randint(-600, 5000) for _ in routes]
+
+        # pairwise reference values
+        pair_differences = [int((routes[j] != routes[k]).sum()) for j in range(len(routes)) for k in range(j + 1, len(routes))]
+        expected_diversity = sum(pair_differences) / len(pair_differences)
+        distances = np.array([individual_genotypic_diversity(route, routes) for route in routes])
+        if distances.max() > 0:
+            distances /= distances.max()
+        expected_fitnesses = [np.round(fitness / (1 + (1 - distance)), 1) if distance < 1 else fitness
+                              for fitness, distance in zip(fitnesses, distances)]
+
+        diversity = genotypic_diversity(routes)
+        shared_fitnesses = fitness_shared(routes, fitnesses)
+        if diversity != expected_diversity:
+            raise ValueError(f"Error in iteration {i+1}: genotypic_diversity returned {diversity} instead of {expected_diversity}")
+        if shared_fitnesses != expected_fitnesses:
+            raise ValueError(f"Error in iteration {i+1}: fitness_shared returned {shared_fitnesses} instead of {expected_fitnesses}")
+        if verbose:
+            print(f"Iteration {i+1}: diversity {diversity:.2f} for {len(routes)} routes")
+    else:
+        print(f"Test passed for iteration {i+1}")
@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pop.population import population
+from utils.utils import *
+from utils.fitness_cache import FitnessCache
+
+
+def test_fitness_cache(verbose=False):
+    '''
+    Checks that a FitnessCache returns the same values as the evaluator it wraps, evicts the least
+    recently used routes once full and is emptied when the Geo matrix changes.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_fitness_cache(verbose=True)
+    '''
+    matrix = np.array(geo_matrix_generator(seed=0))
+    routes = population(300)
+    cache = FitnessCache(batch_fitness, capacity=100)
+
+    for i in range(3):
+        fitnesses, jumped_ks = cache(routes, matrix)
+        expected_fitnesses, expected_jumped_ks = batch_fitness(routes, matrix)
+        if not (np.array_equal(fitnesses, expected_fitnesses) and np.array_equal(jumped_ks, expected_jumped_ks)):
+            raise ValueError(f"Error in iteration {i+1}: cached fitnesses differ from batch_fitness")
+        if verbose:
+            print(f"Iteration {i+1}: {cache.stats()}")
+
+    if len(cache) > cache.capacity or cache.evictions == 0:
+        raise ValueError(f"The cache should hold at most {cache.capacity} routes and evict the oldest ones: {cache.stats()}")
+
+    # the most recently evaluated routes are hits, single route lookups share the same entries
+    hits = cache.hits
+    for route in routes[-10:]:
+        if cache.evaluate_route(route, matrix) != fitness_function(route, matrix):
+            raise ValueError(f"evaluate_route returned a different fitness for {AREA_CODEC.decode(route)}")
+    if cache.hits - hits != 10:
+        raise ValueError(f"The last routes evaluated should be cached: {cache.stats()}")
+
+    # a different Geo matrix empties the cache
+    other_matrix = np.array(geo_matrix_generator(seed=1))
+    stale_fitnesses, _ = cache(routes[:5], other_matrix)
+    if len(cache) != len({route.tobytes() for route in routes[:5]}):
+        raise ValueError(f"The cache should be emptied when the Geo matrix changes: {cache.stats()}")
+
+    # so does the same Geo matrix changed in place
+    other_matrix *= 2
+    fitnesses, _ = cache(routes[:5], other_matrix)
+    if np.array_equal(fitnesses, stale_fitnesses) or not np.array_equal(fitnesses, batch_fitness(routes[:5], other_matrix)[0]):
+        raise ValueError(f"The cache should be emptied when the Geo matrix is changed in place: {cache.stats()}")
+    print("Test passed")
+
+
+def test_fitness_cache_bound_evaluator(verbose=False):
+    '''
+    Checks that a FitnessCache around a batched evaluator with bound constraints evaluates single routes
+    with the same constraints, so that both lookups share correct entries.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_fitness_cache_bound_evaluator(verbose=True)
+    '''
+    from ga.genetic_algorithm import bind_evaluator
+    constraints = compile_constraints(ROUTE_CONSTRAINTS + [{'rule': 'window', 'area': 'KS', 'end': 3}], AREA_CODEC.index)
+
+    for i in range(3):
+        matrix = np.array(geo_matrix_generator(seed=i))
+        routes = population(20)
+        evaluator = bind_evaluator(batch_fitness, constraints=constraints)
+        cache = FitnessCache(evaluator, capacity=100)
+        expected_fitnesses, expected_jumped_ks = evaluator(routes, matrix)
+        single = [cache.evaluate_route(route, matrix) for route in routes[:10]]
+        fitnesses, jumped_ks = cache(routes, matrix)
+        if verbose:
+            print(f"Iteration {i+1}: {fitnesses[:5]} {expected_fitnesses[:5]}")
+        if [fitness for fitness, _ in single] != expected_fitnesses[:10].tolist() \
+                or not np.array_equal(fitnesses, expected_fitnesses) or not np.array_equal(jumped_ks, expected_jumped_ks):
+            raise ValueError(f"Error in iteration {i+1}: the cached fitnesses differ from the bound evaluator")
+
+    # a batched evaluator without a single-route counterpart is not replaced by another fitness
+    def batched_evaluator(routes, geo_matrix):
+        return batch_fitness(routes, geo_matrix)
+    batched_evaluator.batched = True
+    try:
+        FitnessCache(batched_evaluator).evaluate_route(routes[0], matrix)
+    except ValueError:
+        pass
+    else:
+        raise ValueError("Error: a single route was evaluated without a matching route evaluator")
+    print(f"Test passed for iteration {i+1}")
@@ -0,0 +1,60 @@
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gridsearch import *
+
+# one-sided 5% critical values of Student's t distribution for 1 to 30 degrees of freedom
+T_TABLE_05 = [6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812, 1.796, 1.782, 1.771, 1.761, 1.753,
+              1.746, 1.740, 1.734, 1.729, 1.725, 1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697]
+
+
+def test_dominated_combinations(verbose=False):
+    '''
+    Checks that the racing search eliminates a combination that is clearly less fit than the leader on the
+    seeds they share, and never the leader or a combination with a single shared seed.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_dominated_combinations(verbose=True)
+    '''
+    rng = np.random.default_rng(0)
+    for i in range(20):
+        seeds = list(range(2 + i % 8))
+        base = rng.normal(3000, 200, size=len(seeds))
+        scores = {'leader': {seed: base[k] + 500 for k, seed in enumerate(seeds)},
+                  'dominated': {seed: base[k] + rng.normal(0, 20) for k, seed in enumerate(seeds)},
+                  'tied': {seed: base[k] + 500 + rng.normal(0, 300) for k, seed in enumerate(seeds)},
+                  'one seed': {seeds[0]: 0}}
+        dominated = dominated_combinations(scores, alpha=0.05)
+        if verbose:
+            print(f"Iteration {i+1}: {len(seeds)} seeds, dominated {sorted(dominated)}")
+        leader = max(scores, key=lambda key: np.mean(list(scores[key].values())))
+        if 'dominated' not in dominated or leader in dominated or 'one seed' in dominated:
+            raise ValueError(f"Error in iteration {i+1}: unexpected dominated combinations {sorted(dominated)}")
+    else:
+        print(f"Test passed for iteration {i+1}")
+
+def test_t_critical(verbose=False):
+    '''
+    Checks the one-sided 5% critical values of Student's t distribution against the tabulated ones, exactly up to
+    30 degrees of freedom and within 0.1% above (1.684 at 40, 1.671 at 60 and 1.658 at 120).
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_t_critical(verbose=True)
+    '''
+    expected = dict(enumerate(T_TABLE_05, 1))
+    expected.update({40: 1.684, 60: 1.671, 120: 1.658})
+    for i, (dof, value) in enumerate(expected.items()):
+        critical = t_critical(0.05, dof)
+        if verbose:
+            print(f"Iteration {i+1}: {dof} degrees of freedom, {critical:.3f} (expected {value})")
+        if abs(critical - value) > 0.001 * value:
+            raise ValueError(f"Error in iteration {i+1}: t_critical(0.05, {dof}) is {critical}, expected {value}")
+    else:
+        print(f"Test passed for iteration {i+1}")
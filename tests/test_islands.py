@@ -0,0 +1,75 @@
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ga.genetic_algorithm import *
+
+
+def test_island_ga(verbose=False):
+    '''
+    Checks that island_ga() reports a best fitness curve per island and their global best curve, returns
+    the fitness of its best individual, and repeats a run with the same seed.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_island_ga(verbose=True)
+    '''
+    island_options = [{}, {'crossover': cycle_crossover},
+                      {'selection': batch_tournament_selection, 'crossover': batch_order_crossover, 'mutation': batch_inversion_mutation}]
+
+    for i, topology in enumerate(['ring', 'random']):
+        results = [island_ga(islands=3, migration_interval=2, topology=topology, island_options=island_options, seed=i,
+                             matrix_seed=i, population_size=16, num_generations=5, verbose=False) for _ in range(2)]
+        best_individual, best_fitness, island_curves, global_curve = results[0]
+        if verbose:
+            print(f"Iteration {i+1}: {topology} island curves {island_curves}, best fitness {best_fitness}")
+        if len(island_curves) != 3 or any(len(curve) != 5 for curve in island_curves):
+            raise ValueError(f"Error in iteration {i+1}: expected 5 best fitnesses for each of the 3 islands, got {island_curves}")
+        if global_curve != [max(values) for values in zip(*island_curves)] or best_fitness != global_curve[-1]:
+            raise ValueError(f"Error in iteration {i+1}: the global curve {global_curve} does not follow the island curves")
+        if best_fitness != fitness_function(best_individual, geo_matrix_generator(seed=i))[0]:
+            raise ValueError(f"Error in iteration {i+1}: the best fitness {best_fitness} is not the fitness of {best_individual}")
+        if results[1][1:] != results[0][1:] or not np.array_equal(results[1][0], best_individual):
+            raise ValueError(f"Error in iteration {i+1}: a run with the same seed returned {results[1][1]} instead of {best_fitness}")
+    else:
+        print(f"Test passed for iteration {i+1}")
+
+
+def test_receive_immigrants(verbose=False):
+    '''
+    Checks that immigrants replace the worst individuals of an island with their raw fitness, that the
+    fitnesses of the merged population are shared again when the island uses fitness sharing, and that
+    their evaluations are counted.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_receive_immigrants(verbose=True)
+    '''
+    from ga.islands import _receive_immigrants
+
+    for i, fitness_sharing in enumerate([True, False]):
+        random.seed(i)
+        np.random.seed(i)
+        matrix = geo_matrix_generator(seed=i)
+        evolution = Evolution(matrix_to_use=matrix, population_size=12, num_generations=4, fitness_sharing=fitness_sharing)
+        next(iter(evolution))
+        evaluations = evolution.evaluations
+        ranking = np.argsort(evolution.fitnesses, kind='stable')
+        immigrants = population(3)
+        _receive_immigrants(evolution, immigrants, ranking)
+
+        raw_fitnesses = batch_fitness(evolution.population, matrix)[0].tolist()
+        expected = fitness_shared(evolution.population, raw_fitnesses) if fitness_sharing else raw_fitnesses
+        if verbose:
+            print(f"Iteration {i+1}: {evolution.fitnesses}")
+        if not all(np.array_equal(evolution.population[index], route) for index, route in zip(ranking, immigrants)):
+            raise ValueError(f"Error in iteration {i+1}: the immigrants did not replace the worst individuals")
+        if evolution.raw_fitnesses != raw_fitnesses or not np.allclose(evolution.fitnesses, expected):
+            raise ValueError(f"Error in iteration {i+1}: the fitnesses of the merged population are not shared alike")
+        if evolution.evaluations != evaluations + 3:
+            raise ValueError(f"Error in iteration {i+1}: the evaluations of the immigrants were not counted")
+    print(f"Test passed for iteration {i+1}")
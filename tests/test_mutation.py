@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pop.population import population
+from operators.mutators import *
+
+
+def test_batch_mutation(verbose=False):
+    '''
+    Checks that the batched mutations return valid routes with the 'D' endpoints, mutate about the
+    expected share of rows and never modify their input, like swap_mutation.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_batch_mutation(verbose=True)
+    '''
+    for i in range(10):
+        individuals = population(2000)
+        original = individuals.copy()
+
+        for batch_mutation in (batch_swap_mutation, batch_inversion_mutation, batch_displacement_mutation):
+            if not np.array_equal(batch_mutation(individuals, 0.0), original):
+                raise ValueError(f"Error in iteration {i+1}: {batch_mutation.__name__} mutated rows with a rate of 0")
+            offspring = batch_mutation(individuals, 0.5)
+            changed = (offspring != original).any(axis=1).mean()
+            if verbose:
+                print(f"Iteration {i+1}: {batch_mutation.__name__} changed {changed:.1%} of the rows")
+            if not np.array_equal(individuals, original):
+                raise ValueError(f"Error in iteration {i+1}: {batch_mutation.__name__} modified its input")
+            if not ((offspring[:, 0] == original[:, 0]).all() and (offspring[:, -1] == original[:, -1]).all()):
+                raise ValueError(f"Error in iteration {i+1}: {batch_mutation.__name__} moved the 'D' endpoints")
+            if not (np.sort(offspring, axis=1) == np.sort(original, axis=1)).all():
+                raise ValueError(f"Error in iteration {i+1}: {batch_mutation.__name__} returned invalid routes")
+            if not 0.3 < changed < 0.6:
+                raise ValueError(f"Error in iteration {i+1}: {batch_mutation.__name__} changed {changed:.1%} of the rows with a rate of 0.5")
+
+        individual = individuals[0]
+        swap_mutation(individual, 1.0)
+        if not np.array_equal(individual, original[0]):
+            raise ValueError(f"Error in iteration {i+1}: swap_mutation modified its input")
+    else:
+        print(f"Test passed for iteration {i+1}")
@@ -0,0 +1,126 @@
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pop.population import population
+from operators.optimizations import *
+from utils.utils import *
+from utils.instance import Instance
+
+
+def test_two_opt_delta(verbose=False):
+    '''
+    Checks that the delta evaluated 2-opt moves score exactly like fitness_function on the reversed
+    routes, and that two_opt gives the same routes as full evaluation for every strategy.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_two_opt_delta(verbose=True)
+    '''
+    qs, dv = AREA_CODEC.index['QS'], AREA_CODEC.index['DV']
+
+    for i in range(10):
+        matrix = np.array(geo_matrix_generator(seed=i))
+        delta = TwoOptDelta(matrix)
+        routes = population(40)
+
+        # make sure some routes jump from 'QS' to 'DV' or can do so after one reversal
+        for route in routes[:10]:
+            qs_position, dv_position = list(route).index(qs), list(route).index(dv)
+            if qs_position < len(route) - 2:
+                route[[qs_position + 1, dv_position]] = route[[dv_position, qs_position + 1]]
+
+        for route in routes:
+            starts, ends = delta.moves(route)
+            fitnesses, jumped_ks = delta.move_fitness(route)
+            for k, (start, end) in enumerate(zip(starts, ends)):
+                new_route = route.copy()
+                new_route[start:end + 1] = new_route[start:end + 1][::-1]
+                expected = fitness_function(new_route, matrix)
+                if (fitnesses[k], jumped_ks[k]) != expected:
+                    raise ValueError(f"Error in iteration {i+1}: move {(start, end)} of {AREA_CODEC.decode(route)} scored {(fitnesses[k], jumped_ks[k])} instead of {expected}")
+
+            for strategy, max_moves in (('first', 1), ('best', 1), ('first', None), ('best', None)):
+                optimized = two_opt(route, matrix, strategy=strategy, max_moves=max_moves)
+                expected = two_opt(route, matrix, strategy=strategy, max_moves=max_moves, evaluator=fitness_function)
+                if not np.array_equal(optimized, expected):
+                    raise ValueError(f"Error in iteration {i+1}: two_opt ({strategy}, {max_moves}) returned {AREA_CODEC.decode(optimized)} instead of {AREA_CODEC.decode(expected)}")
+                if fitness_function(optimized, matrix) < fitness_function(route, matrix):
+                    raise ValueError(f"Error in iteration {i+1}: two_opt made {AREA_CODEC.decode(route)} worse")
+        if verbose:
+            print(f"Iteration {i+1}: {len(routes)} routes checked")
+    else:
+        print(f"Test passed for iteration {i+1}")
+
+
+def test_two_opt_candidates(verbose=False):
+    '''
+    Checks that on large instances the candidate list moves are 2-opt moves that create a candidate
+    edge, and that they score exactly like fitness_function on the reversed routes.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_two_opt_candidates(verbose=True)
+    '''
+    for i in range(5):
+        instance = Instance.random(size=60, seed=i, candidates_k=5)
+        delta = TwoOptDelta(instance.geo_matrix, instance.constraints, instance.jump_areas, instance.candidates)
+        full_delta = TwoOptDelta(instance.geo_matrix, instance.constraints, instance.jump_areas)
+
+        for route in population(10, instance=instance):
+            starts, ends = delta.moves(route)
+            all_moves = set(zip(*[moves.tolist() for moves in full_delta.moves(route)]))
+            fitnesses, jumped_ks = delta.move_fitness(route)
+            for k, (start, end) in enumerate(zip(starts, ends)):
+                if (start, end) not in all_moves or route[end] not in instance.candidates[route[start - 1]]:
+                    raise ValueError(f"Error in iteration {i+1}: {(start, end)} is not a candidate 2-opt move")
+                new_route = route.copy()
+                new_route[start:end + 1] = new_route[start:end + 1][::-1]
+                expected = fitness_function(new_route, instance.geo_matrix, instance.constraints, instance.jump_areas)
+                if (fitnesses[k], jumped_ks[k]) != expected:
+                    raise ValueError(f"Error in iteration {i+1}: move {(start, end)} scored {(fitnesses[k], jumped_ks[k])} instead of {expected}")
+        if verbose:
+            print(f"Iteration {i+1}: {len(starts)} candidate moves out of {len(all_moves)}")
+    else:
+        print(f"Test passed for iteration {i+1}")
+
+
+def test_or_opt_delta(verbose=False):
+    '''
+    Checks that the delta evaluated Or-opt moves score exactly like fitness_function on the moved
+    routes, and that or_opt gives the same routes as full evaluation and never makes a route worse.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_or_opt_delta(verbose=True)
+    '''
+    for i in range(5):
+        matrix = np.array(geo_matrix_generator(seed=i))
+        delta = OrOptDelta(matrix)
+        routes = population(30)
+
+        for route in routes:
+            starts, lengths, targets = delta.moves(route)
+            fitnesses, jumped_ks = delta.move_fitness(route)
+            for k, (start, length, target) in enumerate(zip(starts, lengths, targets)):
+                expected = fitness_function(relocate_segment(route, start, length, target), matrix)
+                if (fitnesses[k], jumped_ks[k]) != expected:
+                    raise ValueError(f"Error in iteration {i+1}: move {(start, length, target)} of {AREA_CODEC.decode(route)} scored {(fitnesses[k], jumped_ks[k])} instead of {expected}")
+
+            for strategy in ('first', 'best'):
+                optimized = or_opt(route, matrix, strategy=strategy)
+                expected = or_opt(route, matrix, strategy=strategy, evaluator=fitness_function)
+                if not np.array_equal(optimized, expected):
+                    raise ValueError(f"Error in iteration {i+1}: or_opt ({strategy}) returned {AREA_CODEC.decode(optimized)} instead of {AREA_CODEC.decode(expected)}")
+                if fitness_function(optimized, matrix) < fitness_function(route, matrix):
+                    raise ValueError(f"Error in iteration {i+1}: or_opt made {AREA_CODEC.decode(route)} worse")
+        if verbose:
+            print(f"Iteration {i+1}: {len(routes)} routes checked")
+    else:
+        print(f"Test passed for iteration {i+1}")
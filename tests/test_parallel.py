@@ -0,0 +1,36 @@
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ga.genetic_algorithm import *
+
+
+def test_parallel_ga(verbose=False):
+    '''
+    Checks that ga() with a pool of workers returns the same results as the serial mode for the same seed.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_parallel_ga(verbose=True)
+    '''
+    configurations = [dict(),
+                      dict(selection=batch_tournament_selection, crossover=batch_order_crossover,
+                           mutation=batch_swap_mutation, fitness_cache_size=500),
+                      dict(evaluator=fitness_function, elitism=False, local_search=[two_opt, or_opt])]
+
+    for i, configuration in enumerate(configurations):
+        results = []
+        for workers in (None, 2):
+            random.seed(i)
+            np.random.seed(i)
+            results.append(ga(**configuration, matrix_seed=i, population_size=20, num_generations=3, workers=workers,
+                              verbose=False, visualize=False, dashboard=False))
+        (serial_route, serial_fitness), (parallel_route, parallel_fitness) = results
+        if verbose:
+            print(f"Iteration {i+1}: serial {serial_fitness}, parallel {parallel_fitness}")
+        if serial_fitness != parallel_fitness or not np.array_equal(serial_route, parallel_route):
+            raise ValueError(f"Error in iteration {i+1}: the parallel run returned {parallel_fitness} instead of {serial_fitness}")
+    else:
+        print(f"Test passed for iteration {i+1}")
@@ -0,0 +1,95 @@
+import sys
+import os
+import random
+import tempfile
+import csv
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from operators.crossovers import *
+from operators.mutators import *
+from utils.result_store import *
+
+
+def test_result_store(verbose=False):
+    '''
+    Checks that a ResultStore keys combinations by stable labels, and that its seeds and results survive
+    reopening the store.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_result_store(verbose=True)
+    '''
+    combinations = [{'mutation_rate': rate, 'crossover': crossover, 'mutation': mutation}
+                    for rate in (0.05, 0.1) for crossover in (order_crossover, cycle_crossover) for mutation in (swap_mutation, inversion_mutation)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'results.sqlite')
+        for i in range(3):
+            with ResultStore(path) as store:
+                seeds = store.seeds(2 + i, lambda: random.randint(1, 10000))
+                stored = len(store)
+                if i > 0 and seeds[:len(previous_seeds)] != previous_seeds:
+                    raise ValueError(f"Error in iteration {i+1}: the stored seeds {previous_seeds} were not reused, got {seeds}")
+                if stored != 4 * i:
+                    raise ValueError(f"Error in iteration {i+1}: expected {4 * i} stored results, found {stored}")
+                for combination in combinations[4 * i:4 * i + 4]:
+                    store.add(seeds[0], dict(reversed(list(combination.items()))), 100 * i, i)
+                    if not store.completed(seeds[0], combination):
+                        raise ValueError(f"Error in iteration {i+1}: the run of {combination} is not completed after add")
+                previous_seeds = seeds
+                if verbose:
+                    print(f"Iteration {i+1}: seeds {seeds}, {len(store)} results")
+
+        key = combination_key(combinations[0])
+        if 'at 0x' in key or '"crossover": "order_crossover"' not in key:
+            raise ValueError(f"Error in iteration {i+1}: unstable combination key {key}")
+        with ResultStore(path) as store:
+            if len(store.results(combinations=combinations[:6])) != 6 or len(store.results(seeds=[-1])) != 0:
+                raise ValueError(f"Error in iteration {i+1}: the results are not filtered by combination and seed")
+    print(f"Test passed for iteration {i+1}")
+
+
+def test_result_aggregator(verbose=False):
+    '''
+    Checks that a ResultAggregator matches the mean and standard deviation computed from all the results,
+    ranks its leaderboard by average fitness and writes one column per hyperparameter.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_result_aggregator(verbose=True)
+    '''
+    combinations = [{'mutation_rate': rate, 'crossover': crossover} for rate in (0.05, 0.1) for crossover in (order_crossover, cycle_crossover)]
+    rng = np.random.default_rng(0)
+    results = {combination_key(combination): [] for combination in combinations}
+    aggregator = ResultAggregator()
+
+    for i in range(200):
+        combination = combinations[rng.integers(len(combinations))]
+        fitness, gap = rng.normal(3000, 300), rng.normal(500, 50)
+        aggregator.add(combination, fitness, gap)
+        results[combination_key(combination)].append((fitness, gap))
+
+    for key, runs in results.items():
+        labels, count, mean, std, gap = aggregator.summary(key)
+        fitnesses = [fitness for fitness, _ in runs]
+        if verbose:
+            print(f"{labels}: {count} runs, {mean:.1f} ± {std:.1f}")
+        if count != len(runs) or not np.isclose(mean, np.mean(fitnesses)) or not np.isclose(std, np.std(fitnesses, ddof=1)) \
+                or not np.isclose(gap, np.mean([gap for _, gap in runs])):
+            raise ValueError(f"Error in iteration {i+1}: the statistics of {key} differ from those of its {len(runs)} results")
+    means = [mean for _, _, mean, _, _ in aggregator.leaderboard(len(combinations))]
+    if means != sorted(means, reverse=True) or aggregator.best()[2] != means[0] or len(aggregator.leaderboard(2)) != 2:
+        raise ValueError(f"Error in iteration {i+1}: the leaderboard is not sorted by average fitness: {means}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'results.csv')
+        aggregator.write_csv(path)
+        with open(path) as csvfile:
+            rows = list(csv.reader(csvfile))
+    if rows[0][:2] != ['crossover', 'mutation_rate'] or {row[0] for row in rows[1:]} != {'order_crossover', 'cycle_crossover'}:
+        raise ValueError(f"Error in iteration {i+1}: unexpected CSV columns {rows[:2]}")
+    print(f"Test passed for iteration {i+1}")
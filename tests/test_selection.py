@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from operators.selection_algorithms import *
+
+
+def test_batch_tournament_selection(verbose=False):
+    '''
+    Checks that batch_tournament_selection returns valid parent index pairs and that larger
+    tournaments select fitter parents, also with duplicated fitness scores.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_batch_tournament_selection(verbose=True)
+    '''
+    for i in range(5):
+        fitnesses = np.random.permutation(np.repeat(np.arange(25), 2)) * 10.0 - 50
+        mean_fitnesses = []
+        for tournament_size in (1, 2, (3, 6), 8):
+            parent_pairs = batch_tournament_selection(fitnesses, 5000, tournament_size=tournament_size)
+            if parent_pairs.shape != (5000, 2) or parent_pairs.min() < 0 or parent_pairs.max() >= len(fitnesses):
+                raise ValueError(f"Error in iteration {i+1}: invalid parent pairs of shape {parent_pairs.shape} for tournament size {tournament_size}")
+            mean_fitnesses.append(fitnesses[parent_pairs].mean())
+
+        if mean_fitnesses != sorted(mean_fitnesses):
+            raise ValueError(f"Error in iteration {i+1}: larger tournaments should select fitter parents, got mean fitnesses {mean_fitnesses}")
+        if verbose:
+            print(f"Iteration {i+1}: mean parent fitness per tournament size {mean_fitnesses}")
+    else:
+        print(f"Test passed for iteration {i+1}")
+
+
+def test_parent_sampler(verbose=False):
+    '''
+    Checks that ParentSampler draws indices with the frequencies of its weights, that stochastic
+    universal sampling draws every individual within one of its expected count, and that the batched
+    roulette and rank selections handle negative fitness scores.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_parent_sampler(verbose=True)
+    '''
+    for i in range(5):
+        fitnesses = np.random.randint(-300, 1000, size=40).astype(float)
+        fitnesses[:3] = -400  # infeasible routes
+
+        for weights in (roulette_weights(fitnesses), rank_weights(fitnesses)):
+            expected = weights / weights.sum()
+            for method in ('alias', 'sus'):
+                sampler = ParentSampler(weights, method)
+                frequencies = np.bincount(sampler.sample(200000), minlength=len(weights)) / 200000
+                if np.abs(frequencies - expected).max() > 0.01:
+                    raise ValueError(f"Error in iteration {i+1}: {method} frequencies differ from the weights by {np.abs(frequencies - expected).max()}")
+            counts = np.bincount(ParentSampler(weights, 'sus').sample(100), minlength=len(weights))
+            if np.abs(counts - 100 * expected).max() >= 1:
+                raise ValueError(f"Error in iteration {i+1}: stochastic universal sampling drew {counts} instead of about {100 * expected}")
+
+        for selection in (batch_roulette_selection, batch_rank_selection):
+            parent_pairs = selection(fitnesses, 500, method='sus')
+            if parent_pairs.shape != (500, 2):
+                raise ValueError(f"Error in iteration {i+1}: {selection.__name__} returned pairs of shape {parent_pairs.shape}")
+        if np.isin(batch_roulette_selection(fitnesses, 500), np.arange(3)).any():
+            raise ValueError(f"Error in iteration {i+1}: batch_roulette_selection selected the least fit routes")
+        if verbose:
+            print(f"Iteration {i+1}: samplers checked for {len(fitnesses)} fitnesses")
+    else:
+        print(f"Test passed for iteration {i+1}")
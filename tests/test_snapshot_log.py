@@ -0,0 +1,71 @@
+import sys
+import os
+import json
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ga.genetic_algorithm import *
+
+
+def test_snapshot_log(verbose=False):
+    '''
+    Checks that a SnapshotLogReader follows the SnapshotLog of a run as it is written, leaving out a line
+    being written, and that the live dashboard is built from the log.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_snapshot_log(verbose=True)
+    '''
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(3):
+            path = os.path.join(directory, f"snapshots_{i}.jsonl")
+            random.seed(i)
+            np.random.seed(i)
+            matrix = geo_matrix_generator(seed=i)
+            reader = SnapshotLogReader(path)
+            if reader.poll() != 0:
+                raise ValueError(f"Error in iteration {i+1}: snapshots read before the log was written")
+            new_generations = []
+            with SnapshotLog(path, matrix) as log:
+                routes, fitnesses, best_route, best_fitness, _ = ga(matrix_to_use=matrix, population_size=20, num_generations=6,
+                                                                    callbacks=[log, lambda snapshot: new_generations.append(reader.poll())],
+                                                                    verbose=False, visualize=False, dashboard=True)
+            if verbose:
+                print(f"Iteration {i+1}: {new_generations} {reader.fitnesses}")
+            if new_generations != [1] * 6 or reader.fitnesses != fitnesses or reader.best != int(np.argmax(fitnesses)) \
+                    or reader.header['matrix'] != np.asarray(matrix).tolist():
+                raise ValueError(f"Error in iteration {i+1}: the reader did not follow the run")
+            if any(reader.snapshot(g)['best_route'] != route.tolist() for g, route in enumerate(routes)):
+                raise ValueError(f"Error in iteration {i+1}: the routes read back differ from the run")
+
+            # a line being written is read once it is complete, and an appended log keeps its description
+            line = json.dumps(dict(reader.snapshot(0), generation=6)) + '\n'
+            with open(path, 'a') as file:
+                file.write(line[:10])
+                file.flush()
+                if reader.poll() != 0:
+                    raise ValueError(f"Error in iteration {i+1}: a partial line was read")
+                file.write(line[10:])
+            with SnapshotLog(path, matrix, append=True):
+                pass
+            if reader.poll() != 1 or len(reader) != 7 or sum(1 for _ in open(path)) != 8:
+                raise ValueError(f"Error in iteration {i+1}: the completed line was not read once")
+
+            app = create_live_dashboard(path, interval=500)
+            if app.layout['live-interval'].interval != 500:
+                raise ValueError(f"Error in iteration {i+1}: the live dashboard does not poll the log")
+
+        try:
+            create_live_dashboard(os.path.join(directory, 'missing.jsonl'))
+        except ValueError:
+            pass
+        else:
+            raise ValueError("Error: a live dashboard was built without a Geo matrix")
+
+    print(f"Test passed for iteration {i+1}")
+
+
+if __name__ == '__main__':
+    test_snapshot_log(verbose=True)
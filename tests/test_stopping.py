@@ -0,0 +1,50 @@
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ga.genetic_algorithm import *
+
+
+def test_stopping_criteria(verbose=False):
+    '''
+    Checks that every stopping criterion of ga() ends the run with its stop reason, that the evaluation
+    budget is never exceeded and that the best fitness returned is the unshared one.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_stopping_criteria(verbose=True)
+    '''
+    configurations = [(dict(), 'num_generations'),
+                      (dict(stall_generations=3), 'stall_generations'),
+                      (dict(target_fitness=3000), 'target_fitness'),
+                      (dict(max_evaluations=450), 'max_evaluations'),
+                      (dict(time_limit=0.05, local_search=or_opt), 'time_limit'),
+                      (dict(stall_generations=3, fitness_sharing=True), 'stall_generations')]
+
+    for i, (configuration, stop_reason) in enumerate(configurations):
+        random.seed(i)
+        np.random.seed(i)
+        result = ga(**configuration, matrix_seed=i, population_size=50, num_generations=30, verbose=False, visualize=False,
+                    dashboard=False)
+        best_individual, best_fitness = result
+        if verbose:
+            print(f"Iteration {i+1}: {result.stop_reason} after {result.generations} generations, "
+                  f"{result.evaluations} evaluations and {result.seconds:.2f}s, best fitness {best_fitness}")
+        if result.stop_reason != stop_reason:
+            raise ValueError(f"Error in iteration {i+1}: the run stopped with {result.stop_reason} instead of {stop_reason}")
+        if (result.generations == 30) != (stop_reason == 'num_generations') or result.evaluations != 50 * (result.generations + 1):
+            raise ValueError(f"Error in iteration {i+1}: unexpected {result.generations} generations and {result.evaluations} evaluations")
+        if 'max_evaluations' in configuration and result.evaluations > configuration['max_evaluations']:
+            raise ValueError(f"Error in iteration {i+1}: {result.evaluations} evaluations exceed the budget")
+        if 'target_fitness' in configuration and best_fitness < configuration['target_fitness']:
+            raise ValueError(f"Error in iteration {i+1}: the run stopped below the target fitness with {best_fitness}")
+        if best_fitness != fitness_function(best_individual, geo_matrix_generator(seed=i))[0]:
+            raise ValueError(f"Error in iteration {i+1}: the best fitness {best_fitness} is not the fitness of the best individual")
+
+    print(f"Test passed for iteration {i+1}")
+
+
+if __name__ == '__main__':
+    test_stopping_criteria(verbose=True)
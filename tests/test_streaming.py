@@ -0,0 +1,67 @@
+import sys
+import os
+import json
+import random
+from multiprocessing import shared_memory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ga.genetic_algorithm import *
+
+
+def test_evolution(verbose=False):
+    '''
+    Checks that an Evolution yields the generations of the seeded ga() run, that the callbacks of ga()
+    receive the same snapshots, that the history is only kept with keep_history, and that a run can be left early.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_evolution(verbose=True)
+    '''
+    configurations = [dict(), dict(selection=batch_tournament_selection, crossover=batch_order_crossover, timer=PhaseTimer()),
+                      dict(exact_max_areas=9)]
+
+    for i, configuration in enumerate(configurations):
+        random.seed(i)
+        np.random.seed(i)
+        snapshots = []
+        routes, fitnesses, best_route, best_fitness, matrix = ga(**configuration, matrix_seed=i, population_size=20, num_generations=4,
+                                                                 callbacks=[snapshots.append], verbose=False, visualize=False, dashboard=True)
+        random.seed(i)
+        np.random.seed(i)
+        evolution = Evolution(**configuration, matrix_seed=i, population_size=20, num_generations=4)
+        streamed = list(evolution)
+        if verbose:
+            print(f"Iteration {i+1}: {streamed}")
+        if [snapshot.best_fitness for snapshot in snapshots] != fitnesses or [snapshot.best_fitness for snapshot in streamed] != fitnesses:
+            raise ValueError(f"Error in iteration {i+1}: the snapshots {streamed} do not follow the best fitnesses {fitnesses}")
+        if not all(np.array_equal(snapshot.best_route, route) for snapshot, route in zip(streamed, routes)) \
+                or evolution.best()[1] != best_fitness or len(streamed) != (1 if evolution.exact else 4):
+            raise ValueError(f"Error in iteration {i+1}: the streamed run differs from ga()")
+        if evolution.best_routes or evolution.best_fitnesses:
+            raise ValueError(f"Error in iteration {i+1}: the Evolution kept a history without keep_history")
+        random.seed(i)
+        np.random.seed(i)
+        evolution = Evolution(**configuration, matrix_seed=i, population_size=20, num_generations=4, keep_history=True)
+        list(evolution)
+        if evolution.best_fitnesses != fitnesses or not all(np.array_equal(a, b) for a, b in zip(evolution.best_routes, routes)):
+            raise ValueError(f"Error in iteration {i+1}: the history of the Evolution differs from ga()")
+        snapshot = json.loads(json.dumps(streamed[-1].as_dict()))
+        if snapshot['best_route'] != best_route.tolist() or (configuration.get('timer') is not None) != (snapshot['timings'] is not None):
+            raise ValueError(f"Error in iteration {i+1}: unexpected snapshot {snapshot}")
+
+    # leave a run with an offspring pool after two generations
+    evolution = Evolution(matrix_seed=0, population_size=10, num_generations=10, workers=2)
+    for snapshot in evolution:
+        if snapshot.generation == 1:
+            break
+    evolution.close()
+    if evolution.generation != 2:
+        raise ValueError(f"Error: the run left after generation 1 ran {evolution.generation} generations")
+    try:
+        shared_memory.SharedMemory(name=evolution.pool.segment.name).close()
+    except FileNotFoundError:
+        pass
+    else:
+        raise ValueError("Error: the offspring pool of the run left early was not closed")
+    print(f"Test passed for iteration {i+1}")
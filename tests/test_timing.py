@@ -0,0 +1,51 @@
+import sys
+import os
+import json
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ga.genetic_algorithm import *
+
+
+def test_phase_timer(verbose=False):
+    '''
+    Checks that a PhaseTimer passed to ga() times and counts the calls of every phase of every generation
+    without changing the results of the run.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_phase_timer(verbose=True)
+    '''
+    configurations = [dict(), dict(selection=batch_tournament_selection, crossover=batch_order_crossover, mutation=batch_swap_mutation)]
+
+    for i, configuration in enumerate(configurations):
+        results, timer = [], PhaseTimer()
+        for run_timer in (None, timer):
+            random.seed(i)
+            np.random.seed(i)
+            results.append(ga(**configuration, matrix_seed=i, population_size=20, num_generations=4, timer=run_timer,
+                              verbose=False, visualize=False, dashboard=False))
+        summary = json.loads(timer.to_json())
+        if verbose:
+            print(f"Iteration {i+1}: {summary['phases']}")
+        if results[0][1] != results[1][1] or not np.array_equal(results[0][0], results[1][0]):
+            raise ValueError(f"Error in iteration {i+1}: the timed run returned {results[1][1]} instead of {results[0][1]}")
+        expected_phases = {'elitism', 'selection', 'crossover', 'mutation', 'local_search', 'evaluation', 'fitness_sharing', 'diversity'}
+        if set(summary['phases']) != expected_phases or len(summary['generations']) != 4:
+            raise ValueError(f"Error in iteration {i+1}: timed phases {sorted(summary['phases'])} over {len(summary['generations'])} generations")
+        if summary['phases']['local_search']['calls'] != 4 or summary['phases']['evaluation']['calls'] != 5 \
+                or summary['phases']['fitness_sharing']['calls'] != 3:
+            raise ValueError(f"Error in iteration {i+1}: unexpected call counts {summary['phases']}")
+        phase_seconds = sum(phase['seconds'] for phase in summary['phases'].values())
+        generation_seconds = sum(phase['seconds'] for generation in summary['generations'] for phase in generation.values())
+        if not np.isclose(phase_seconds, summary['total_seconds']) or generation_seconds > phase_seconds:
+            raise ValueError(f"Error in iteration {i+1}: the phase totals do not add up: {summary['total_seconds']}")
+        # every generation runs its local search once and shares its fitnesses, except the last one
+        generation_calls = [{name: phase['calls'] for name, phase in generation.items()} for generation in summary['generations']]
+        if any(calls['local_search'] != 1 or calls['evaluation'] != 1 for calls in generation_calls) \
+                or [calls.get('fitness_sharing', 0) for calls in generation_calls] != [1, 1, 1, 0] \
+                or any(sum(calls.get(name, 0) for calls in generation_calls) > summary['phases'][name]['calls'] for name in expected_phases):
+            raise ValueError(f"Error in iteration {i+1}: unexpected call counts per generation {generation_calls}")
+    else:
+        print(f"Test passed for iteration {i+1}")
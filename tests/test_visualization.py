@@ -0,0 +1,96 @@
+import sys
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import pytest
+from PIL import Image
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ga.genetic_algorithm import *
+
+
+def test_export_routes_animation(verbose=False):
+    '''
+    Checks the frames selected for an exported animation, that the blitted frames match a full redraw
+    of the same routes, and that GIF and PNG exports hold one frame per selected generation.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_export_routes_animation(verbose=True)
+    '''
+    for n_routes, every, max_frames, expected in [(10, 1, None, list(range(10))), (10, 4, None, [0, 4, 8, 9]),
+                                                  (1000, 1, 5, [0, 250, 500, 750, 999]), (7, 1, 1, [6]), (0, 1, None, [])]:
+        if frame_indices(n_routes, every, max_frames) != expected:
+            raise ValueError(f"Error: frame_indices({n_routes}, {every}, {max_frames}) is not {expected}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(3):
+            random.seed(i)
+            instance = None if i == 0 else Instance.random(8 + 10 * i, seed=i)
+            codec = AREA_CODEC if instance is None else instance.codec
+            coordinates = None if instance is None else instance.coordinates
+            routes = [generate_individual(instance=instance) for _ in range(12)]
+            best_route = routes[-1]
+            options = dict(codec=codec, coordinates=coordinates, figsize=(6, 3), dpi=50)
+
+            # a route drawn on the background of another generation is the route drawn on a fresh figure
+            blitted = [np.array(image) for image in route_frames(routes, best_route, [0, 5], **options)]
+            fresh = np.array(next(route_frames(routes, best_route, [5], **options)))
+            if verbose:
+                print(f"Iteration {i+1}: frames of shape {blitted[0].shape}")
+            if not np.array_equal(blitted[1], fresh) or np.array_equal(blitted[0], blitted[1]):
+                raise ValueError(f"Error in iteration {i+1}: the blitted frames differ from the redrawn ones")
+
+            gif = export_routes_animation(routes, best_route, os.path.join(directory, f"routes_{i}.gif"), every=5, **options)
+            frames = export_routes_animation(routes, best_route, os.path.join(directory, f"routes_{i}.png"), max_frames=3, **options)
+            with Image.open(gif[0]) as image:
+                gif_frames = image.n_frames
+            if gif_frames != 4 or [os.path.basename(path) for path in frames] != [f"routes_{i}_{g:05d}.png" for g in (1, 7, 12)]:
+                raise ValueError(f"Error in iteration {i+1}: unexpected exports {gif_frames} {frames}")
+
+        try:
+            export_routes_animation(routes, best_route, os.path.join(directory, 'routes.avi'))
+        except ValueError:
+            pass
+        else:
+            raise ValueError("Error: an unsupported format was exported")
+
+    print(f"Test passed for iteration {i+1}")
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg is not installed')
+def test_export_routes_animation_mp4(verbose=False):
+    '''
+    Checks that an MP4 export holds one frame of the figure size per selected generation, by decoding it
+    back with ffmpeg.
+
+    Parameters:
+        - verbose (bool): Whether to print output.
+
+    Example Usage:
+        test_export_routes_animation_mp4(verbose=True)
+    '''
+    with tempfile.TemporaryDirectory() as directory:
+        for i, (every, max_frames) in enumerate([(1, None), (3, None), (1, 4)]):
+            random.seed(i)
+            routes = [generate_individual() for _ in range(10)]
+            path = os.path.join(directory, f"routes_{i}.mp4")
+            written = export_routes_animation(routes, routes[-1], path, fps=5, every=every, max_frames=max_frames,
+                                              figsize=(6, 3), dpi=50)
+            decoded = subprocess.run([shutil.which('ffmpeg'), '-v', 'error', '-i', path, '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'],
+                                     capture_output=True, check=True).stdout
+            frames = len(decoded) / (300 * 150 * 3)
+            if verbose:
+                print(f"Iteration {i+1}: {frames} frames in {os.path.getsize(path)} bytes")
+            if written != [path] or frames != len(frame_indices(len(routes), every, max_frames)):
+                raise ValueError(f"Error in iteration {i+1}: the MP4 holds {frames} frames")
+    print(f"Test passed for iteration {i+1}")
+
+
+if __name__ == '__main__':
+    test_export_routes_animation(verbose=True)
+    if shutil.which('ffmpeg') is not None:
+        test_export_routes_animation_mp4(verbose=True)
@@ -0,0 +1,104 @@
+import os
+import random
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+
+def random_state():
+    """
+    Returns the states of the global random and numpy.random generators as arrays.
+
+    Returns:
+        dict: The arrays of both states, to be stored in a checkpoint and given back to set_random_state.
+
+    Example Usage:
+        state = random_state()
+        random.random(), np.random.rand()
+        set_random_state(state)  # the same numbers are drawn again
+    """
+    version, internal, gauss_next = random.getstate()
+    name, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+    return dict(random_version=np.int64(version), random_internal=np.array(internal, dtype=np.uint32),
+                random_gauss_next=np.float64(np.nan if gauss_next is None else gauss_next),
+                numpy_name=np.str_(name), numpy_keys=np.array(keys, dtype=np.uint32),
+                numpy_position=np.int64(position), numpy_has_gauss=np.int64(has_gauss),
+                numpy_cached_gaussian=np.float64(cached_gaussian))
+
+
+def set_random_state(state):
+    """
+    Restores the states of the global random and numpy.random generators saved by random_state.
+
+    Parameters:
+        state (dict): The arrays of random_state, or a checkpoint containing them.
+    """
+    gauss_next = float(state['random_gauss_next'])
+    random.setstate((int(state['random_version']), tuple(int(value) for value in state['random_internal']),
+                     None if np.isnan(gauss_next) else gauss_next))
+    np.random.set_state((str(state['numpy_name']), np.asarray(state['numpy_keys'], dtype=np.uint32),
+                         int(state['numpy_position']), int(state['numpy_has_gauss']),
+                         float(state['numpy_cached_gaussian'])))
+
+
+def number_arrays(name, values):
+    """
+    Returns the arrays storing a list of numbers in a checkpoint: their values and which of them are integers,
+    so that read_numbers gives back the same list (fitnesses mix the integers of the evaluator with the floats
+    of fitness sharing).
+
+    Example Usage:
+        save_checkpoint('run.ckpt', **number_arrays('fitnesses', [3408, 3428.8]))
+        read_numbers(load_checkpoint('run.ckpt'), 'fitnesses')  # Output: [3408, 3428.8]
+    """
+    return {name: np.array(values, dtype=np.float64),
+            f"{name}_integer": np.array([isinstance(value, (int, np.integer)) for value in values], dtype=bool)}
+
+
+def read_numbers(checkpoint, name):
+    """
+    Returns the list of numbers stored in a checkpoint with number_arrays.
+    """
+    return [int(value) if integer else float(value)
+            for value, integer in zip(checkpoint[name], checkpoint[f"{name}_integer"])]
+
+
+def save_checkpoint(path, **arrays):
+    """
+    Writes a compressed checkpoint of named arrays (a numpy .npz file).
+
+    The checkpoint is written to a temporary file that then replaces path, so a run interrupted while
+    writing keeps its previous checkpoint intact.
+
+    Parameters:
+        path (str): The checkpoint file.
+        arrays: The arrays (or scalars) to store.
+
+    Example Usage:
+        save_checkpoint('run.ckpt', population=population, generation=10, **random_state())
+    """
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'wb') as file:
+        np.savez_compressed(file, checkpoint_version=CHECKPOINT_VERSION, **arrays)
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path):
+    """
+    Reads a checkpoint written by save_checkpoint.
+
+    Parameters:
+        path (str): The checkpoint file.
+
+    Returns:
+        dict: The stored arrays, by name.
+
+    Example Usage:
+        checkpoint = load_checkpoint('run.ckpt')
+        print(int(checkpoint['generation']))
+    """
+    with np.load(path, allow_pickle=False) as file:
+        checkpoint = {name: file[name] for name in file.files}
+    if int(checkpoint.get('checkpoint_version', -1)) != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} checkpoint")
+    return checkpoint
@@ -0,0 +1,222 @@
+import numpy as np
+
+# the route constraints of the game, declared as data
+# - window: the area must be between positions start and end (inclusive); floats are fractions of the route length
+# - precedence: the area 'before' must not appear after the area 'after'
+# - endpoints: the route must start and end at the area
+# - unique: no repeated areas between the endpoints
+ROUTE_CONSTRAINTS = [
+    {'rule': 'window', 'area': 'RG', 'start': 0.5},          # 'Resting Grounds' in the second half of the route
+    {'rule': 'precedence', 'before': 'CS', 'after': 'QG'},   # 'City of Tears' not after 'Queen's Gardens'
+    {'rule': 'endpoints', 'area': 'D'},                      # start and end at 'Dirtmouth'
+    {'rule': 'unique'},                                      # no repeated spots except for 'D'
+]
+
+# rules that only depend on the positions of their areas, and rules that depend on the whole route
+POSITION_RULES = ('window', 'precedence')
+STRUCTURE_RULES = ('endpoints', 'unique')
+
+
+def _resolve_position(bound, route_length, default):
+    # converts a window bound (int position, negative from the end, or fraction of the length) to a position
+    if bound is None:
+        return default
+    if isinstance(bound, float):
+        return int(bound * route_length)
+    return bound if bound >= 0 else route_length + bound
+
+
+class CompiledConstraints:
+    """
+    A route constraint spec compiled into position-index checks on encoded routes.
+
+    The areas named in the spec are converted to their codes once. Checking a population then only
+    needs the first position of each constrained area in every route, so all rules are evaluated over
+    a whole (n_individuals x route_length) array at once.
+
+    Parameters:
+        spec (list of dict): The constraint rules (see ROUTE_CONSTRAINTS).
+        area_index (dict): Maps area initials to their codes.
+
+    Example Usage:
+        constraints = compile_constraints(ROUTE_CONSTRAINTS, AREA_CODEC.index)
+        violations = constraints.violations(population(100))   # (100 x 4) boolean matrix
+        feasible = constraints.feasible(population(100))       # (100,) boolean array
+    """
+
+    def __init__(self, spec, area_index):
+        self.spec = [dict(rule) for rule in spec]
+        self.rules = []
+        self.names = []
+        tracked_areas = []
+
+        for rule in self.spec:
+            kind = rule.get('rule')
+            if kind == 'window':
+                compiled = (kind, area_index[rule['area']], rule.get('start'), rule.get('end'))
+                tracked_areas.append(compiled[1])
+                name = f"window({rule['area']})"
+            elif kind == 'precedence':
+                compiled = (kind, area_index[rule['before']], area_index[rule['after']])
+                tracked_areas.extend(compiled[1:])
+                name = f"precedence({rule['before']}<{rule['after']})"
+            elif kind == 'endpoints':
+                compiled = (kind, area_index[rule['area']])
+                name = f"endpoints({rule['area']})"
+            elif kind == 'unique':
+                compiled = (kind,)
+                name = 'unique'
+            else:
+                raise ValueError(f"Unknown constraint rule {rule!r}, expected one of {POSITION_RULES + STRUCTURE_RULES}")
+            self.rules.append(compiled)
+            self.names.append(name)
+
+        # areas whose positions the rules need, and the penalty of an infeasible route
+        self.tracked_areas = sorted(set(tracked_areas))
+        self.penalty = -50 * len(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def first_positions(self, population_array, areas=None):
+        """
+        Returns the position of the first occurrence of each area in every route (-1 when missing).
+
+        Parameters:
+            population_array (numpy.ndarray): An (n_individuals x route_length) array of area indices.
+            areas (list of int, optional): The area codes to locate, defaults to the constrained areas.
+
+        Returns:
+            dict: Maps each area code to an (n_individuals,) array of positions.
+        """
+        positions = {}
+        for area in (self.tracked_areas if areas is None else areas):
+            hits = population_array == area
+            positions[area] = np.where(hits.any(axis=1), hits.argmax(axis=1), -1)
+        return positions
+
+    def position_violations(self, positions, route_length):
+        """
+        Evaluates the position rules from the first positions of the constrained areas.
+
+        Parameters:
+            positions (dict): Maps area codes to arrays of positions (as returned by first_positions).
+            route_length (int): The length of the routes.
+
+        Returns:
+            dict: Maps the index of each position rule to a boolean array, True where the rule is violated.
+        """
+        violations = {}
+        for index, rule in enumerate(self.rules):
+            if rule[0] == 'window':
+                _, area, start, end = rule
+                position = positions[area]
+                start = _resolve_position(start, route_length, 0)
+                end = _resolve_position(end, route_length, route_length - 1)
+                violations[index] = ~((position >= start) & (position <= end))
+            elif rule[0] == 'precedence':
+                _, before, after = rule
+                before_position, after_position = positions[before], positions[after]
+                violations[index] = (before_position >= 0) & (after_position >= 0) & (before_position > after_position)
+        return violations
+
+    def structure_violations(self, population_array):
+        """
+        Evaluates the endpoint and uniqueness rules.
+
+        Parameters:
+            population_array (numpy.ndarray): An (n_individuals x route_length) array of area indices.
+
+        Returns:
+            dict: Maps the index of each structure rule to a boolean array, True where the rule is violated.
+        """
+        violations = {}
+        for index, rule in enumerate(self.rules):
+            if rule[0] == 'endpoints':
+                violations[index] = ~((population_array[:, 0] == rule[1]) & (population_array[:, -1] == rule[1]))
+            elif rule[0] == 'unique':
+                # sorted neighbours must all differ
+                interior = np.sort(population_array[:, 1:-1], axis=1)
+                violations[index] = (interior[:, 1:] == interior[:, :-1]).any(axis=1)
+        return violations
+
+    def violations(self, population_array):
+        """
+        Returns the per-rule violation matrix of a population.
+
+        Parameters:
+            population_array (numpy.ndarray): An (n_individuals x route_length) array of area indices.
+
+        Returns:
+            numpy.ndarray: An (n_individuals x n_rules) boolean array, True where a rule is violated.
+        """
+        population_array = np.asarray(population_array)
+        violations = self.position_violations(self.first_positions(population_array), population_array.shape[1])
+        violations.update(self.structure_violations(population_array))
+        if not violations:
+            return np.zeros((len(population_array), 0), dtype=bool)
+        return np.column_stack([violations[index] for index in range(len(self.rules))])
+
+    def satisfied(self, population_array):
+        """
+        Returns the per-rule satisfaction matrix of a population (the negated violation matrix).
+        """
+        return ~self.violations(population_array)
+
+    def feasible(self, population_array):
+        """
+        Returns whether each route of a population satisfies every rule.
+        """
+        return ~self.violations(population_array).any(axis=1)
+
+    def penalties(self, population_array):
+        """
+        Returns the fitness penalty of every route: 0 when feasible, else -50 per rule in the spec.
+        """
+        return np.where(self.feasible(population_array), 0, self.penalty)
+
+    def check(self, route):
+        """
+        Checks a single route without array operations (faster for one short route).
+
+        Parameters:
+            route (list of int): The encoded route.
+
+        Returns:
+            list: A boolean per rule, True when the rule is satisfied.
+        """
+        route_length = len(route)
+        results = []
+        for rule in self.rules:
+            kind = rule[0]
+            if kind == 'window':
+                _, area, start, end = rule
+                position = route.index(area) if area in route else -1
+                results.append(_resolve_position(start, route_length, 0) <= position
+                               <= _resolve_position(end, route_length, route_length - 1))
+            elif kind == 'precedence':
+                _, before, after = rule
+                results.append(not (after in route and before in route and route.index(before) > route.index(after)))
+            elif kind == 'endpoints':
+                results.append(route[0] == rule[1] and route[-1] == rule[1])
+            else:
+                results.append(len(set(route[1:-1])) == route_length - 2)
+        return results
+
+
+def compile_constraints(spec, area_index):
+    """
+    Compiles a constraint spec for the given area codes.
+
+    Parameters:
+        spec (list of dict): The constraint rules (see ROUTE_CONSTRAINTS).
+        area_index (dict): Maps area initials to their codes.
+
+    Returns:
+        CompiledConstraints: The compiled constraints.
+
+    Example Usage:
+        spec = ROUTE_CONSTRAINTS + [{'rule': 'window', 'area': 'KS', 'end': 3}]
+        constraints = compile_constraints(spec, AREA_CODEC.index)
+    """
+    return CompiledConstraints(spec, area_index)
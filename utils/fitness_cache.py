@@ -0,0 +1,181 @@
+from collections import OrderedDict
+import numpy as np
+from utils.utils import fitness_function, batch_fitness
+
+
+class FitnessCache:
+    """
+    Bounded LRU memoization layer around a fitness evaluator.
+
+    Routes are keyed by the raw bytes of their encoded array, which is a cheap and collision-free hash
+    of the permutation. The cache has the same interface as the evaluator it wraps, so it can be passed
+    to ga() as the evaluator: a batched evaluator (batch_fitness) is only called once per population,
+    on the routes that were not found in the cache. Single routes (e.g. the candidates of two_opt) are
+    looked up through evaluate_route and computed with route_evaluator on a miss.
+
+    The cached values are only valid for one Geo matrix, so the cache is emptied whenever it is called
+    with a different matrix, or with the same matrix after it was changed in place.
+
+    Parameters:
+        evaluator (function): The evaluator to wrap, either fitness_function or batch_fitness.
+        capacity (int): The maximum number of routes kept in the cache.
+        route_evaluator (function, optional): Evaluator used for single routes when the wrapped evaluator is batched,
+            by default the route_evaluator attribute of the evaluator (fitness_function for batch_fitness, with the
+            options bound by bind_evaluator). evaluate_route raises a ValueError if there is none.
+
+    Example Usage:
+        cache = FitnessCache(batch_fitness, capacity=10000)
+        fitnesses, jumped_ks = cache(population(100), matrix)
+        fitness, jumped_ks = cache.evaluate_route(generate_individual(), matrix)
+        print(cache.stats())
+        # Output: {'hits': 0, 'misses': 101, 'evictions': 0, 'size': 101, 'capacity': 10000, 'hit_rate': 0.0}
+    """
+
+    def __init__(self, evaluator=batch_fitness, capacity=100000, route_evaluator=None):
+        if capacity < 1:
+            raise ValueError(f"The cache capacity must be at least 1, got {capacity}")
+        self.evaluator = evaluator
+        self.capacity = capacity
+        if not getattr(evaluator, 'batched', False):
+            route_evaluator = evaluator
+        elif route_evaluator is None:
+            # the single-route counterpart of the batched evaluator, with the same bound options (see bind_evaluator)
+            route_evaluator = getattr(evaluator, 'route_evaluator', None)
+        self.route_evaluator = route_evaluator
+        self.batched = getattr(evaluator, 'batched', False)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._matrix_key = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __call__(self, routes, geo_matrix):
+        """
+        Evaluates routes with the same interface as the wrapped evaluator.
+
+        Parameters:
+            routes (numpy.ndarray): A population array if the wrapped evaluator is batched, else a single route.
+            geo_matrix (numpy.ndarray): The Geo matrix.
+
+        Returns:
+            tuple: The fitness and jumped_ks flag (arrays of them for a batched evaluator).
+        """
+        if self.batched:
+            return self.evaluate_population(routes, geo_matrix)
+        return self.evaluate_route(routes, geo_matrix)
+
+    def evaluate_route(self, route, geo_matrix):
+        """
+        Returns the cached (fitness, jumped_ks) of a single route, computing it on a miss.
+
+        Parameters:
+            route (numpy.ndarray): The encoded route.
+            geo_matrix (numpy.ndarray): The Geo matrix.
+
+        Returns:
+            tuple: The fitness and jumped_ks flag of the route.
+        """
+        self._bind(geo_matrix)
+        key = np.asarray(route).tobytes()
+        result = self._entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return result
+
+        if self.route_evaluator is None:
+            raise ValueError("The batched evaluator has no route_evaluator computing the same fitness for single routes")
+        self.misses += 1
+        result = self.route_evaluator(route, geo_matrix)
+        self._store(key, result)
+        return result
+
+    def evaluate_population(self, population_array, geo_matrix):
+        """
+        Returns the fitnesses and jumped_ks flags of a whole population, evaluating only the routes that
+        are not cached (each distinct route once) with a single call to the batched evaluator.
+
+        Parameters:
+            population_array (numpy.ndarray): An (n_individuals x route_length) array of area indices.
+            geo_matrix (numpy.ndarray): The Geo matrix.
+
+        Returns:
+            tuple: Arrays with the fitness and jumped_ks flag of every individual.
+        """
+        self._bind(geo_matrix)
+        population_array = np.asarray(population_array)
+        keys = [route.tobytes() for route in population_array]
+        results = [None] * len(keys)
+
+        # rows to evaluate, keyed by route so repeated routes in the population are computed once
+        pending = {}
+        for i, key in enumerate(keys):
+            result = self._entries.get(key)
+            if result is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                results[i] = result
+            elif key in pending:
+                self.hits += 1
+            else:
+                self.misses += 1
+                pending[key] = i
+
+        if pending:
+            rows = list(pending.values())
+            if self.batched:
+                fitnesses, jumped_ks = self.evaluator(population_array[rows], geo_matrix)
+                computed = dict(zip(pending, zip(fitnesses.tolist(), jumped_ks.tolist())))
+            else:
+                computed = {key: tuple(self.evaluator(population_array[row], geo_matrix)) for key, row in pending.items()}
+            for key, result in computed.items():
+                self._store(key, result)
+
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = computed[key]
+
+        fitnesses, jumped_ks = zip(*results) if results else ((), ())
+        return np.array(fitnesses), np.array(jumped_ks, dtype=bool)
+
+    def clear(self):
+        """
+        Empties the cache (the hit and miss counters are kept).
+        """
+        self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Hits, misses, evictions, current size, capacity and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'capacity': self.capacity,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _bind(self, geo_matrix):
+        # invalidate the cache when the Geo matrix changes, by content so that a matrix changed in place counts too
+        matrix = np.asarray(geo_matrix)
+        matrix_key = (matrix.shape, matrix.tobytes())
+        if matrix_key != self._matrix_key:
+            self._entries.clear()
+            self._matrix_key = matrix_key
+
+    def _store(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
@@ -0,0 +1,109 @@
+import numpy as np
+from utils.utils import AREAS, AreaCodec, geo_matrix_generator
+from utils.constraints import ROUTE_CONSTRAINTS, compile_constraints
+
+
+def circle_coordinates(areas):
+    """
+    Lays areas out on a circle, for plotting instances without known coordinates.
+
+    Parameters:
+        areas (list of str): The area labels.
+
+    Returns:
+        dict: Maps each area label to an (x, y) position.
+
+    Example Usage:
+        coordinates = circle_coordinates(['D', 'A1', 'A2', 'A3'])
+    """
+    angles = np.linspace(0, 2 * np.pi, len(areas), endpoint=False)
+    radius = max(len(areas) / (2 * np.pi), 1)
+    return {area: (float(radius * np.cos(angle)), float(radius * np.sin(angle))) for area, angle in zip(areas, angles)}
+
+
+class Instance:
+    """
+    A routing problem instance: the area labels, the Geo matrix, the route constraints and the
+    candidate successor lists used to restrict local search neighborhoods.
+
+    Any number of areas is supported. When no labels are given, the original instance uses the areas of
+    the game and any other size uses 'D' (the start and end of every route) followed by 'A1', 'A2', ...
+    The constraints default to the rules of the game that only mention areas of the instance, and the
+    'QS' -> 'DV' rule only applies when both areas exist.
+
+    With candidates_k set, every area keeps the k successors it earns the most Geo going to, and
+    two_opt and or_opt only try moves that create one of those edges, so a 2-opt scan costs O(n*k)
+    instead of O(n^2).
+
+    Parameters:
+        geo_matrix (list of lists): The Geo matrix.
+        areas (list of str, optional): The area labels, in Geo matrix order.
+        depot (str, optional): The area where every route starts and ends, defaults to the first area.
+        constraints (list of dict, optional): The route constraint spec (see utils/constraints.py).
+        candidates_k (int, optional): The length of the candidate successor lists, None for full neighborhoods.
+        coordinates (dict, optional): Maps area labels to (x, y) positions for the visualizations.
+
+    Example Usage:
+        instance = Instance.random(size=500, seed=0, candidates_k=10)
+        best_route, best_fitness = ga(instance=instance, fitness_sharing=False, visualize=False, dashboard=False)
+        print(instance.codec.decode(best_route))
+    """
+
+    def __init__(self, geo_matrix, areas=None, depot=None, constraints=None, candidates_k=None, coordinates=None):
+        self.geo_matrix = np.asarray(geo_matrix)
+        size = len(self.geo_matrix)
+        if self.geo_matrix.shape != (size, size):
+            raise ValueError(f"The Geo matrix must be square, got shape {self.geo_matrix.shape}")
+
+        if areas is None:
+            areas = AREAS if size == len(AREAS) else ['D'] + [f'A{i}' for i in range(1, size)]
+        if len(areas) != size:
+            raise ValueError(f"Expected {size} area labels for the Geo matrix, got {len(areas)}")
+        self.areas = list(areas)
+        self.codec = AreaCodec(self.areas)
+        self.depot = self.areas[0] if depot is None else depot
+        self.depot_index = self.codec.index[self.depot]
+
+        if constraints is None:
+            constraints = [rule for rule in ROUTE_CONSTRAINTS
+                           if all(rule[key] in self.codec.index for key in ('area', 'before', 'after') if key in rule)]
+            if not any(rule['rule'] == 'endpoints' for rule in constraints):
+                constraints.append({'rule': 'endpoints', 'area': self.depot})
+        self.constraint_spec = constraints
+        self.constraints = compile_constraints(constraints, self.codec.index)
+
+        # the 'QS' -> 'DV' rule of the game
+        self.jump_areas = (self.codec.index['QS'], self.codec.index['DV']) if {'QS', 'DV'} <= set(self.areas) else None
+
+        self.candidates_k = candidates_k
+        self.candidates = None if candidates_k is None else self._candidate_lists(candidates_k)
+        self.coordinates = coordinates
+
+    @classmethod
+    def random(cls, size=10, seed=None, candidates_k=None, **kwargs):
+        """
+        Creates an instance with a Geo matrix from geo_matrix_generator.
+
+        Parameters:
+            size (int): The number of areas.
+            seed (int, optional): Seed for Geo matrix generation.
+            candidates_k (int, optional): The length of the candidate successor lists.
+
+        Returns:
+            Instance: The generated instance.
+        """
+        return cls(geo_matrix_generator(size=size, seed=seed), candidates_k=candidates_k, **kwargs)
+
+    def __len__(self):
+        return len(self.areas)
+
+    def _candidate_lists(self, k):
+        # the k most profitable successors of every area, excluding itself and the depot
+        profits = self.geo_matrix.astype(float)
+        np.fill_diagonal(profits, -np.inf)
+        profits[:, self.depot_index] = -np.inf
+        k = min(k, len(self.areas) - 2)
+        candidates = np.argpartition(-profits, k - 1, axis=1)[:, :k] if k > 0 else np.empty((len(self.areas), 0), int)
+        # order each list from the most to the least profitable successor
+        order = np.argsort(-np.take_along_axis(profits, candidates, axis=1), axis=1, kind='stable')
+        return np.take_along_axis(candidates, order, axis=1)
@@ -0,0 +1,242 @@
+import csv
+import heapq
+import json
+import sqlite3
+import numpy as np
+
+
+def parameter_label(value):
+    """
+    Returns a stable label for a grid search parameter value.
+
+    Functions are labelled by their name rather than their repr, which contains a memory address that
+    changes with every run. Numbers, strings, booleans and None are kept as they are, anything else is
+    labelled by its repr.
+
+    Parameters:
+        value: The parameter value.
+
+    Returns:
+        The label of the value (a JSON-serializable value).
+
+    Example Usage:
+        parameter_label(order_crossover)  # Output: 'order_crossover'
+        parameter_label(0.7)  # Output: 0.7
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if callable(value) and hasattr(value, '__name__'):
+        return value.__name__
+    return repr(value)
+
+
+def combination_labels(parameters):
+    """
+    Returns the stable labels of a parameter combination, sorted by parameter name.
+
+    Parameters:
+        parameters (dict): The parameter combination.
+
+    Returns:
+        dict: The label of every parameter (see parameter_label).
+
+    Example Usage:
+        combination_labels({'mutation': swap_mutation, 'mutation_rate': 0.1})
+        # Output: {'mutation': 'swap_mutation', 'mutation_rate': 0.1}
+    """
+    return {name: parameter_label(parameters[name]) for name in sorted(parameters)}
+
+
+def combination_key(parameters):
+    """
+    Returns the stable key of a parameter combination, the JSON of its labels.
+
+    Parameters:
+        parameters (dict): The parameter combination.
+
+    Returns:
+        str: The key of the combination, the same in every run.
+
+    Example Usage:
+        combination_key({'mutation_rate': 0.1, 'mutation': swap_mutation})
+        # Output: '{"mutation": "swap_mutation", "mutation_rate": 0.1}'
+    """
+    return json.dumps(combination_labels(parameters))
+
+
+class ResultStore:
+    """
+    Persistent SQLite store of grid search results, one row per (seed, combination) run.
+
+    Every result is committed as soon as it is added, so an interrupted search keeps all its finished
+    runs: on restart the runs found in the store are skipped, and a search can be extended with more
+    seeds or parameter values without redoing any run. The seeds of a search are stored too, so that a
+    resumed search uses the same ones.
+
+    Parameters:
+        path (str): The SQLite database file, created if needed (':memory:' for a temporary store).
+
+    Example Usage:
+        with ResultStore('grid_search_results.sqlite') as store:
+            if not store.completed(seed, parameters):
+                store.add(seed, parameters, best_fitness, gap)
+    """
+
+    def __init__(self, path='grid_search_results.sqlite'):
+        self.path = path
+        # autocommit: every result is on disk once add returns
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS seeds (position INTEGER PRIMARY KEY, seed INTEGER NOT NULL)')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS results (seed INTEGER NOT NULL, combination TEXT NOT NULL, '
+                                'fitness REAL, gap REAL, PRIMARY KEY (seed, combination))')
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def seeds(self, n_seeds, draw_seed):
+        """
+        Returns the first n_seeds seeds of the search, drawing and storing the missing ones.
+
+        Parameters:
+            n_seeds (int): The number of seeds.
+            draw_seed (function): Called without arguments to draw a new seed.
+
+        Returns:
+            list of int: The seeds, the same ones as in the previous runs of the search.
+        """
+        seeds = [seed for (seed,) in self.connection.execute('SELECT seed FROM seeds ORDER BY position')]
+        while len(seeds) < n_seeds:
+            seed = int(draw_seed())
+            self.connection.execute('INSERT INTO seeds (position, seed) VALUES (?, ?)', (len(seeds), seed))
+            seeds.append(seed)
+        return seeds[:n_seeds]
+
+    def completed(self, seed, parameters):
+        """
+        Returns whether the run of a combination with a seed is in the store.
+        """
+        query = 'SELECT 1 FROM results WHERE seed = ? AND combination = ?'
+        return self.connection.execute(query, (int(seed), combination_key(parameters))).fetchone() is not None
+
+    def completed_keys(self):
+        """
+        Returns the set of (seed, combination key) pairs of the runs in the store.
+        """
+        return set(self.connection.execute('SELECT seed, combination FROM results'))
+
+    def add(self, seed, parameters, fitness, gap):
+        """
+        Adds the result of a run and commits it, replacing any previous result of the same run.
+
+        Parameters:
+            seed (int): The seed of the run.
+            parameters (dict): The parameter combination.
+            fitness (float): The best fitness of the run.
+            gap (float): Its gap to the optimal fitness.
+        """
+        self.connection.execute('INSERT OR REPLACE INTO results (seed, combination, fitness, gap) VALUES (?, ?, ?, ?)',
+                                (int(seed), combination_key(parameters), float(fitness), float(gap)))
+
+    def results(self, seeds=None, combinations=None):
+        """
+        Returns the stored results, optionally only those of some seeds and combinations.
+
+        Parameters:
+            seeds (list of int, optional): The seeds to keep.
+            combinations (list of dict, optional): The parameter combinations to keep.
+
+        Returns:
+            list of tuple: The (seed, combination key, fitness, gap) of every run.
+        """
+        seeds = None if seeds is None else {int(seed) for seed in seeds}
+        keys = None if combinations is None else {combination_key(parameters) for parameters in combinations}
+        return [(seed, key, fitness, gap)
+                for seed, key, fitness, gap in self.connection.execute('SELECT seed, combination, fitness, gap FROM results')
+                if (seeds is None or seed in seeds) and (keys is None or key in keys)]
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ResultAggregator:
+    """
+    Streaming aggregation of grid search results: a running count, mean and variance (Welford's algorithm)
+    of the fitness and the running mean of the optimality gap of every combination, updated in O(1) per
+    result as the results arrive.
+
+    Example Usage:
+        aggregator = ResultAggregator()
+        aggregator.add(parameters, best_fitness, gap)
+        for labels, count, mean, std, gap in aggregator.leaderboard(5):
+            print(labels, mean)
+        aggregator.write_csv('grid_search_results.csv')
+    """
+
+    def __init__(self):
+        # combination key -> [labels, count, fitness mean, fitness M2, gap mean]
+        self._stats = {}
+
+    def __len__(self):
+        return len(self._stats)
+
+    def add(self, parameters, fitness, gap):
+        """
+        Adds the result of a run.
+
+        Parameters:
+            parameters (dict): The parameter combination (or its labels, see combination_labels).
+            fitness (float): The best fitness of the run.
+            gap (float): Its gap to the optimal fitness.
+        """
+        labels = combination_labels(parameters)
+        key = json.dumps(labels)
+        if key not in self._stats:
+            self._stats[key] = [labels, 0, 0.0, 0.0, 0.0]
+        stats = self._stats[key]
+        stats[1] += 1
+        delta = fitness - stats[2]
+        stats[2] += delta / stats[1]
+        stats[3] += delta * (fitness - stats[2])
+        stats[4] += (gap - stats[4]) / stats[1]
+
+    def summary(self, key):
+        """
+        Returns the (labels, count, fitness mean, fitness standard deviation, gap mean) of a combination key.
+        """
+        labels, count, mean, m2, gap = self._stats[key]
+        return labels, count, mean, np.sqrt(m2 / (count - 1)) if count > 1 else 0.0, gap
+
+    def leaderboard(self, n=10):
+        """
+        Returns the summaries of the n combinations with the highest average fitness, best first.
+        """
+        keys = heapq.nlargest(n, self._stats, key=lambda key: self._stats[key][2])
+        return [self.summary(key) for key in keys]
+
+    def best(self):
+        """
+        Returns the summary of the combination with the highest average fitness.
+        """
+        return self.leaderboard(1)[0]
+
+    def write_csv(self, path):
+        """
+        Writes one row per combination, with one column per hyperparameter holding its label (a number,
+        a boolean or a function name) followed by the run count and the fitness and gap statistics.
+        """
+        names = sorted({name for labels, *_ in self._stats.values() for name in labels})
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(names + ['Runs', 'Average Fitness', 'Fitness Std', 'Average Optimality Gap'])
+            for key in self._stats:
+                labels, count, mean, std, gap = self.summary(key)
+                writer.writerow([labels.get(name, '') for name in names] + [count, mean, std, gap])
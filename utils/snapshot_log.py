@@ -0,0 +1,121 @@
+import json
+import threading
+import numpy as np
+
+
+class SnapshotLog:
+    """
+    Append-only JSON Lines log of the GenerationSnapshot of every generation of a run, to be followed while
+    the run goes on (see run_live_dashboard in visualizations/dashboard.py and SnapshotLogReader).
+
+    The first line describes the run (its Geo matrix, area labels and coordinates), the others are the
+    snapshots (see GenerationSnapshot.as_dict). Every line is flushed as soon as it is written, so readers
+    never wait for the end of the run. The log is a callback of ga().
+
+    Parameters:
+        path (str): The log file.
+        matrix (numpy.ndarray, optional): The Geo matrix of the run.
+        areas (list of str, optional): The area labels in Geo matrix order, defaults to the areas of the game.
+        coordinates (dict, optional): Maps area labels to (x, y) positions, defaults to the map of the game.
+        append (bool): Whether to append to an existing log (a resumed run) instead of starting a new one.
+
+    Example Usage:
+        matrix = geo_matrix_generator()
+        with SnapshotLog('ga_snapshots.jsonl', matrix) as log:
+            ga(matrix_to_use=matrix, callbacks=[log], visualize=False, dashboard=False)
+    """
+
+    def __init__(self, path='ga_snapshots.jsonl', matrix=None, areas=None, coordinates=None, append=False):
+        self.path = path
+        self.file = open(path, 'a' if append else 'w')
+        # a resumed run keeps the description of the run it continues
+        if matrix is not None and self.file.tell() == 0:
+            header = dict(matrix=np.asarray(matrix).tolist(), areas=None if areas is None else list(areas),
+                          coordinates=None if coordinates is None else {area: list(position) for area, position in coordinates.items()})
+            self._write(header)
+
+    def _write(self, record):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def __call__(self, snapshot):
+        self._write(snapshot.as_dict())
+
+    def close(self):
+        """
+        Closes the log.
+        """
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SnapshotLogReader:
+    """
+    Follows a SnapshotLog while it is written: every poll reads only the lines appended since the previous
+    one. The best fitness of every generation is kept in memory, the snapshots themselves stay on disk and
+    are read back on demand, so following a long run costs a few bytes per generation.
+
+    Parameters:
+        path (str): The log file, which may not exist yet.
+
+    Example Usage:
+        reader = SnapshotLogReader('ga_snapshots.jsonl')
+        new_generations = reader.poll()
+        print(len(reader), reader.fitnesses[-1], reader.snapshot(reader.best)['best_route'])
+    """
+
+    def __init__(self, path='ga_snapshots.jsonl'):
+        self.path = path
+        self.header = None
+        self.offsets = []
+        self.fitnesses = []
+        self.best = None
+        self._position = 0
+        # the dashboard polls from several threads
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def poll(self):
+        """
+        Reads the lines appended to the log since the last poll, leaving out a last line still being written.
+
+        Returns:
+            int: The number of new snapshots.
+        """
+        with self._lock:
+            try:
+                file = open(self.path, 'rb')
+            except FileNotFoundError:
+                return 0
+            count = 0
+            with file:
+                file.seek(self._position)
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        break
+                    offset, self._position = self._position, self._position + len(line)
+                    record = json.loads(line)
+                    if 'generation' not in record:
+                        self.header = record
+                        continue
+                    self.offsets.append(offset)
+                    self.fitnesses.append(record['best_fitness'])
+                    if self.best is None or record['best_fitness'] > self.fitnesses[self.best]:
+                        self.best = len(self.fitnesses) - 1
+                    count += 1
+            return count
+
+    def snapshot(self, index):
+        """
+        Returns the snapshot of the index-th generation of the log as a dict (see GenerationSnapshot.as_dict).
+        """
+        with open(self.path, 'rb') as file:
+            file.seek(self.offsets[index])
+            return json.loads(file.readline())
@@ -1,62 +1,168 @@
 import numpy as np
+from utils.constraints import ROUTE_CONSTRAINTS, CompiledConstraints, compile_constraints
 
-def check_constraints(route):
+# area initials in Geo matrix order
+AREAS = ['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG']
+
+
+class AreaCodec:
+    """
+    Converts routes between area initials and their integer encoding.
+
+    Inside the genetic algorithm a route is a compact integer array where every area is stored as its
+    index in the Geo matrix, and a population is a 2-D (n_individuals x route_length) array. Area
+    initials are only needed at the boundaries (printing and visualizations), where this codec is used.
+
+    Parameters:
+        areas (list of str): The area initials, in Geo matrix order.
+
+    Example Usage:
+        codec = AreaCodec(AREAS)
+        route = codec.encode(['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D'])
+        # Output: array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0], dtype=uint8)
+        codec.decode(route)
+        # Output: ['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']
+    """
+
+    def __init__(self, areas):
+        self.areas = list(areas)
+        self.index = {area: index for index, area in enumerate(self.areas)}
+        # smallest integer type able to hold every area index
+        self.dtype = np.uint8 if len(self.areas) <= 256 else np.int16
+        self._labels = np.array(self.areas, dtype=object)
+
+    def __len__(self):
+        return len(self.areas)
+
+    def encode(self, route):
+        """
+        Encodes a route of area initials (already encoded routes are returned as arrays unchanged).
+
+        Parameters:
+            route (list of str): The route, represented by area initials.
+
+        Returns:
+            numpy.ndarray: The route as an array of area indices.
+        """
+        if len(route) and isinstance(route[0], str):
+            return np.array([self.index[area] for area in route], dtype=self.dtype)
+        return np.asarray(route, dtype=self.dtype)
+
+    def decode(self, route):
+        """
+        Decodes an encoded route into area initials (routes of initials are returned as a list unchanged).
+
+        Parameters:
+            route (numpy.ndarray): The route as an array of area indices.
+
+        Returns:
+            list of str: The route, represented by area initials.
+        """
+        if len(route) and isinstance(route[0], str):
+            return list(route)
+        return self._labels[np.asarray(route, dtype=np.intp)].tolist()
+
+    def encode_population(self, routes):
+        """
+        Encodes a list of routes into a 2-D (n_individuals x route_length) array.
+
+        Parameters:
+            routes (list of list of str): The routes, all of the same length.
+
+        Returns:
+            numpy.ndarray: The encoded population.
+        """
+        if isinstance(routes, np.ndarray):
+            return routes.astype(self.dtype, copy=False)
+        return np.array([self.encode(route) for route in routes], dtype=self.dtype)
+
+    def decode_population(self, population):
+        """
+        Decodes a 2-D population array into lists of area initials.
+
+        Parameters:
+            population (numpy.ndarray): The encoded population.
+
+        Returns:
+            list of list of str: The decoded routes.
+        """
+        return [self.decode(route) for route in population]
+
+
+# codec for the areas of the original problem
+AREA_CODEC = AreaCodec(AREAS)
+AREA_TO_INDEX = AREA_CODEC.index
+
+# route constraints of the original problem, compiled for its area codes
+CONSTRAINTS = compile_constraints(ROUTE_CONSTRAINTS, AREA_TO_INDEX)
+
+# codes of the areas of the 'QS' -> 'DV' rule (jumping over 'KS')
+JUMP_AREAS = (AREA_TO_INDEX['QS'], AREA_TO_INDEX['DV'])
+
+
+def _as_codes(route):
+    # routes are walked element by element, which is fastest on a plain list of ints
+    if isinstance(route, np.ndarray):
+        return route.tolist()
+    if len(route) and isinstance(route[0], str):
+        return [AREA_TO_INDEX[area] for area in route]
+    return list(route)
+
+
+def _compiled(constraints):
+    # accepts compiled constraints, a constraint spec or None (the constraints of the game)
+    if constraints is None:
+        return CONSTRAINTS
+    if isinstance(constraints, CompiledConstraints):
+        return constraints
+    return compile_constraints(constraints, AREA_TO_INDEX)
+
+def check_constraints(route, constraints=None):
     """
     Check if a given route satisfies certain constraints for the game.
 
-    The constraints checked are:
+    The constraints checked by default (ROUTE_CONSTRAINTS in utils/constraints.py) are:
         1. 'Resting Grounds' ('RG') must be in the second half of the route.
         2. 'City of Tears' ('CS') should not appear after 'Queen's Gardens' ('QG').
         3. The route must start and end with 'Dirtmouth' ('D').
         4. No repeated spots are allowed in the route.
 
     Parameters:
-        route (list): The route to be checked, represented as a list of locations.
+        route (numpy.ndarray or list): The route to be checked, as area indices (or area initials).
+        constraints (CompiledConstraints or list of dict, optional): The constraints to check instead.
 
     Returns:
         list: A list of boolean values indicating whether each constraint is satisfied.
 
     Example usage:
-        route = ['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']
+        route = AREA_CODEC.encode(['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D'])
         constraints = check_constraints(route)
         print(constraints)  # Output: [True, False, True, True]
     """
-    # length of the route ignoring Dirtmouth endpoints
-    route_length = len(route) - 2
-    
-    # check for 'RG' in the second half of the route
-    rg_index = route.index('RG') if 'RG' in route else -1
-    constraint1 = rg_index >= len(route) // 2
-
-    # check if 'CS' is not after 'QG'
-    constraint2 = not ('QG' in route and 'CS' in route and route.index('CS') > route.index('QG'))
+    return _compiled(constraints).check(_as_codes(route))
 
-    # check if route starts and ends with 'D'
-    constraint3 = route[0] == "D" and route[-1] == "D"
 
-    # check for repeated spots except for 'D'
-    constraint4 = len(set(route[1:-1])) == route_length
-
-    return [constraint1, constraint2, constraint3, constraint4]
-
-
-def fitness_function(route, geo_matrix):
+def fitness_function(route, geo_matrix, constraints=None, jump_areas=JUMP_AREAS):
     """
     Calculates the total accumulated Geo for a given route.
     Sums the Geo gains or losses when traveling from one area to another along the route.
     Geo values are obtained from a geo_matrix which is a list of lists.
 
     Parameters:
-        route (list of str): The route taken, represented by area initials.
+        route (numpy.ndarray or list): The route taken, as area indices (or area initials).
         geo_matrix (list of lists): A matrix where each list corresponds to an area and contains
                                 the Geo changes to all other areas.
+        constraints (CompiledConstraints or list of dict, optional): The route constraints, defaults to
+                                the constraints of the game.
+        jump_areas (tuple, optional): The codes of 'QS' and 'DV' for the jump rule, None when the
+                                instance has no such rule.
 
     Returns:
     tuple: (total Geo accumulated along the route, jumped_ks flag)
         int: The total Geo accumulated along the route.
 
     Example Usage:
-        route = ['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']
+        route = AREA_CODEC.encode(['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D'])
         geo_matrix = [[0, 10, -20, 30, -40, 50, -60, 70, -80, 90],
                      [-10, 0, -15, 25, -35, 45, -55, 65, -75, 85],
                      [20, 15, 0, 35, -45, 55, -65, 75, -85, 95],
@@ -75,28 +181,29 @@ def fitness_function(route, geo_matrix):
     skip_ks = False
     jumped_ks = False
 
-    area_to_index = {'D': 0, 'G': 1, 'FC': 2, 'QG': 3, 'CS': 4, 'KS': 5, 'DV': 6, 'SN': 7, 'QS': 8, 'RG': 9}
+    route = _as_codes(route)
+    jump_from, jump_to = jump_areas if jump_areas is not None else (-1, -1)
 
     # check route constraints
-    constraints = check_constraints(route)
+    constraints = check_constraints(route, constraints)
     num_constraints = len(constraints)
     invalid_penalty = -50 * num_constraints
 
     if all(constraints):
         for i in range(len(route) - 1):
-            from_area = area_to_index[route[i]]
-            to_area = area_to_index[route[i + 1]]
+            from_area = route[i]
+            to_area = route[i + 1]
 
             if skip_ks:
                 skip_ks = False
                 continue
 
             # handle special case for skipping 'KS' between 'QS' and 'DV'
-            if route[i] == 'QS' and route[i + 1] == 'DV':
+            if from_area == jump_from and to_area == jump_to:
                 skip_ks = True
                 jumped_ks = True
                 if i > 0:
-                    previous_area = area_to_index[route[i-1]]
+                    previous_area = route[i-1]
                     total_geo_without_ks += geo_matrix[previous_area][to_area]
             else:
                 total_geo_without_ks += geo_matrix[from_area][to_area]
@@ -108,13 +215,94 @@ def fitness_function(route, geo_matrix):
         return invalid_penalty, False
 
 
+def batch_check_constraints(population_array, constraints=None):
+    """
+    Vectorized version of check_constraints for a whole population of encoded routes.
+
+    Parameters:
+        population_array (numpy.ndarray): An (n_individuals x route_length) array of area indices.
+        constraints (CompiledConstraints or list of dict, optional): The constraints to check instead.
+
+    Returns:
+        numpy.ndarray: An (n_individuals x n_constraints) boolean array, one column per constraint,
+                       in the same order as check_constraints.
+
+    Example Usage:
+        population_array = AREA_CODEC.encode_population([['D', 'G', 'FC', 'QG', 'CS', 'KS', 'DV', 'SN', 'QS', 'RG', 'D']])
+        batch_check_constraints(population_array)
+        # Output: array([[ True, False,  True,  True]])
+    """
+    return _compiled(constraints).satisfied(population_array)
+
+
+def batch_fitness(population_array, geo_matrix, constraints=None, jump_areas=JUMP_AREAS):
+    """
+    Vectorized version of fitness_function that scores a whole population in one pass.
+    Every edge of every route is gathered from the Geo matrix at once, and the 'QS' -> 'DV'
+    rule is applied with masks: the edge following the jump is dropped from both totals, and the
+    alternative total replaces the 'QS' -> 'DV' edge with the edge from the area before 'QS' to 'DV'.
+
+    Parameters:
+        population_array (numpy.ndarray): An (n_individuals x route_length) array of area indices.
+        geo_matrix (list of lists): A matrix where each list corresponds to an area and contains
+                                the Geo changes to all other areas.
+        constraints (CompiledConstraints or list of dict, optional): The route constraints, defaults to
+                                the constraints of the game.
+        jump_areas (tuple, optional): The codes of 'QS' and 'DV' for the jump rule, None when the
+                                instance has no such rule.
+
+    Returns:
+    tuple: (fitnesses, jumped_ks flags)
+        numpy.ndarray: The fitness of every individual, identical to fitness_function.
+        numpy.ndarray: The jumped_ks flag of every individual.
+
+    Example Usage:
+        population_array = population(100)
+        fitnesses, jumped_ks = batch_fitness(population_array, geo_matrix_generator(seed=0))
+    """
+    population_array = np.asarray(population_array)
+    geo_matrix = np.asarray(geo_matrix)
+    jump_from, jump_to = jump_areas if jump_areas is not None else (-1, -1)
+
+    # check route constraints
+    constraints = _compiled(constraints)
+    valid = constraints.feasible(population_array)
+
+    from_areas, to_areas = population_array[:, :-1], population_array[:, 1:]
+    edges = geo_matrix[from_areas, to_areas]
+
+    # handle special case for skipping 'KS' between 'QS' and 'DV'
+    jumps = (from_areas == jump_from) & (to_areas == jump_to)
+    skipped = np.zeros_like(jumps)
+    skipped[:, 1:] = jumps[:, :-1]
+
+    total_geo = np.where(skipped, 0, edges).sum(axis=1)
+
+    # edges from the area before 'QS' straight to 'DV' (only defined from the second edge on)
+    bypass = geo_matrix[population_array[:, :-2], population_array[:, 2:]]
+    total_geo_without_ks = (total_geo
+                            - np.where(jumps, edges, 0).sum(axis=1)
+                            + np.where(jumps[:, 1:], bypass, 0).sum(axis=1))
+
+    fitnesses = np.where(valid, np.maximum(total_geo, total_geo_without_ks), constraints.penalty)
+    jumped_ks = valid & jumps.any(axis=1)
+
+    return fitnesses, jumped_ks
+
+# lets ga() score the whole population with a single call
+batch_fitness.batched = True
+# the single-route evaluator computing the same fitness (see FitnessCache.evaluate_route)
+batch_fitness.route_evaluator = fitness_function
+
+
 
 def genotypic_diversity(population):
     """
     Calculates the genotypic diversity of a population by comparing the number of different positions between every pair of individuals.
+    The pairwise differences are counted per position from how many individuals share each area there, in O(n*L).
     
     Parameters:
-        population (list): A list of individuals in the population.
+        population (list or numpy.ndarray): A list of individuals in the population, or an (n x L) array.
     
     Returns:
         float: The average number of different positions between individuals in the population.
@@ -127,19 +315,30 @@ def genotypic_diversity(population):
         print(diversity)  # Output: 0.8181818181818182
     """
     num_individuals = len(population)
-    num_positions = len(population[0])
-    total_diff_positions = 0
 
-    # compare each pair of individuals
-    for i in range(num_individuals - 1):
-        for j in range(i + 1, num_individuals):
-            # count differing positions
-            total_diff_positions += sum(population[i][k] != population[j][k] for k in range(num_positions))
+    # every pair is counted from both sides
+    total_diff_positions = int(_hamming_totals(population).sum()) // 2
 
     # calculate average number of different positions
     return total_diff_positions / (num_individuals * (num_individuals - 1) / 2)
 
 
+def _hamming_totals(population):
+    # sum of the Hamming distances from every individual to the whole population, in O(n*L):
+    # an individual differs at position k from every individual not sharing its area at k
+    population_array = np.asarray(population)
+    if not np.issubdtype(population_array.dtype, np.integer):
+        population_array = np.unique(population_array, return_inverse=True)[1].reshape(population_array.shape)
+    num_individuals, num_positions = population_array.shape
+    num_values = int(population_array.max()) + 1
+
+    # counts[k, v] is the number of individuals with area v at position k
+    cells = np.arange(num_positions) * num_values + population_array
+    counts = np.bincount(cells.ravel(), minlength=num_positions * num_values)
+    same = counts[cells].sum(axis=1)
+    return num_individuals * num_positions - same
+
+
 def individual_genotypic_diversity(individual, population):
     """
     Calculates the genotypic diversity of a single individual by comparing the number of different positions 
@@ -161,13 +360,9 @@ def individual_genotypic_diversity(individual, population):
         print(diversity)  # Output: 0.8181818181818182
     """
     num_individuals = len(population)
-    num_positions = len(individual)
-    total_diff_positions = 0
 
-    # compare the individual with each other individual in the population
-    for other_individual in population:
-        # count differing positions
-        total_diff_positions += sum(individual[k] != other_individual[k] for k in range(num_positions))
+    # count differing positions with every individual in the population at once
+    total_diff_positions = int((np.asarray(population) != np.asarray(individual)).sum())
 
     # calculate average number of different positions
     return total_diff_positions / num_individuals
@@ -177,7 +372,7 @@ def fitness_shared(population, fitnesses, sigma_share=1.0):
     Calculates the shared fitness of a population based on genotypic diversity.
 
     Parameters:
-        population (list of list of str): The population of routes, where each route is a list of area initials.
+        population (list of list of str or numpy.ndarray): The population of routes, as lists of area initials or encoded routes.
         fitnesses (list of float): The fitness values of the population.
         sigma_share (float): The sharing threshold, which normalizes distances and controls the influence range.
 
@@ -199,11 +394,11 @@ def fitness_shared(population, fitnesses, sigma_share=1.0):
         Linear sharing function that decreases the fitness contribution based on the normalized distance.
 
         Parameters:
-            distance (float): The genotypic distance between two individuals.
+            distance (float or numpy.ndarray): The genotypic distance between two individuals, or an array of distances.
             sigma_share (float): The sharing threshold.
 
         Returns:
-            float: The sharing value, which is reduced as the distance increases.
+            float or numpy.ndarray: The sharing value, which is reduced as the distance increases.
 
         Example Usage:
             distance = 0.5
@@ -212,16 +407,11 @@ def fitness_shared(population, fitnesses, sigma_share=1.0):
             print(sharing_value)
         """
         normalized_distance = distance / sigma_share
-        if normalized_distance < 1:
-            return 1 - normalized_distance
-        else:
-            return 0
+        return np.where(normalized_distance < 1, 1 - normalized_distance, 0)
 
     # based on theoretical slides (Vanneschi)
     # step 1: calculate the genotypic diversity distances for each individual
-    distances = np.zeros(num_individuals)
-    for i in range(num_individuals):
-        distances[i] = individual_genotypic_diversity(population[i], population)
+    distances = _hamming_totals(population) / num_individuals
 
     # step 2: normalize the distances by dividing by the maximum distance
     max_distance = np.max(distances)
@@ -229,18 +419,13 @@ def fitness_shared(population, fitnesses, sigma_share=1.0):
         distances /= max_distance
 
     # step 3: apply the linear sharing function to each individual's distance
-    sharing_coefficients = np.zeros(num_individuals)
-    for i in range(num_individuals):
-        sharing_coefficients[i] = linear_sharing_function(distances[i], sigma_share)
+    sharing_coefficients = linear_sharing_function(distances, sigma_share)
 
     # step 4: redefine the fitness
-    shared_fitnesses = []
-    for i in range(num_individuals):
-        if sharing_coefficients[i] == 0:
-            shared_fitness = fitnesses[i]
-        else:
-            shared_fitness = fitnesses[i] / (1 + sharing_coefficients[i])
-        shared_fitnesses.append(np.round(shared_fitness, 1))
+    shared_fitnesses = list(np.round(np.asarray(fitnesses, dtype=float) / (1 + sharing_coefficients), 1))
+    for i in np.flatnonzero(sharing_coefficients == 0):
+        # unshared fitnesses keep their type
+        shared_fitnesses[i] = np.round(fitnesses[i], 1)
 
     return shared_fitnesses
 
@@ -1,7 +1,11 @@
 import dash
-from dash import dcc, html
+from dash import dcc, html, no_update
 import plotly.graph_objs as go
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
+from utils.utils import AREA_CODEC, AreaCodec
+from utils.instance import circle_coordinates
+from utils.snapshot_log import SnapshotLogReader
 
 # Define areas and coordinates
 areas = ["D", "FC", "G", "QS", "QG", "CS", "KS", "RG", "DV", "SN"]
@@ -18,13 +22,20 @@ coordinates = {
     "SN": (8, 5)
 }
 
-def create_heatmap_figure(matrix, title):
+def _resolve_coordinates(codec, area_coordinates=None):
+    # coordinates of the game when they cover the areas, else a circle layout
+    if area_coordinates is None:
+        area_coordinates = coordinates if set(codec.areas) <= set(coordinates) else circle_coordinates(codec.areas)
+    return area_coordinates
+
+def create_heatmap_figure(matrix, title, labels=None):
     """
     Create a heatmap figure to visualize the Geo earnings/loss matrix.
 
     Parameters:
         matrix (list of lists): The Geo matrix representing gains/losses.
         title (str): The title of the heatmap.
+        labels (list of str, optional): The area labels in Geo matrix order, defaults to the areas of the game.
 
     Returns:
         The heatmap figure.
@@ -42,8 +53,8 @@ def create_heatmap_figure(matrix, title):
     """
     heatmap = go.Heatmap(
         z=matrix,
-        x=areas,
-        y=areas,
+        x=AREA_CODEC.areas if labels is None else labels,
+        y=AREA_CODEC.areas if labels is None else labels,
         colorscale='Viridis'
     )
     layout = go.Layout(
@@ -59,14 +70,16 @@ def create_heatmap_figure(matrix, title):
     return go.Figure(data=[heatmap], layout=layout)
 
 
-def create_route_figure(route, title, color='skyblue'):
+def create_route_figure(route, title, color='skyblue', codec=AREA_CODEC, coordinates=None):
     """
     Create a route figure to visualize the given route.
 
     Parameters:
-        route (list of str): The route taken, represented by area initials.
+        route (numpy.ndarray or list of str): The route taken, encoded or as area initials.
         title (str): The title of the route figure.
         color (str): The color of the route line.
+        codec (AreaCodec): The codec used to decode encoded routes.
+        coordinates (dict, optional): Maps area labels to (x, y) positions, defaults to the map of the game.
 
     Returns:
         The route figure.
@@ -76,8 +89,11 @@ def create_route_figure(route, title, color='skyblue'):
         create_route_figure(route, 'Best Route', color='limegreen')
 
     """
-    x = [coordinates[area][0] for area in route]
-    y = [coordinates[area][1] for area in route]
+    route = codec.decode(route)
+    area_coordinates = _resolve_coordinates(codec, coordinates)
+    x = [area_coordinates[area][0] for area in route]
+    y = [area_coordinates[area][1] for area in route]
+    xs, ys = zip(*area_coordinates.values())
     trace = go.Scatter(
         x=x,
         y=y,
@@ -89,8 +105,8 @@ def create_route_figure(route, title, color='skyblue'):
     )
     layout = go.Layout(
         title=title,
-        xaxis=dict(title='X Coordinate', range=[-1, 10]),
-        yaxis=dict(title='Y Coordinate', range=[-1, 8]),
+        xaxis=dict(title='X Coordinate', range=[min(xs) - 1, max(xs) + 1]),
+        yaxis=dict(title='Y Coordinate', range=[min(ys) - 1, max(ys) + 1]),
         showlegend=False
     )
     return go.Figure(data=[trace], layout=layout)
@@ -128,7 +144,22 @@ def create_fitness_evolution_figure(iterations, fitness_scores):
     return go.Figure(data=[trace], layout=layout)
 
 
-def run_dashboard(routes, fitnesses, best_route, matrix):
+def _title():
+    # the title and the authors heading every dashboard
+    return [
+        html.H1(
+            children='Hallow Knight Route Optimization',
+            style={'textAlign': 'center', 'fontFamily': 'Arial, sans-serif'}
+        ),
+
+        html.H4(
+            children='Francisco Batista; Vicente Miranda; Lourenço Mourão Martins; Cícero Dias dos Santos',
+            style={'textAlign': 'center', 'paddingBottom': '20px', 'fontFamily': 'Arial, sans-serif'}
+        )
+    ]
+
+
+def run_dashboard(routes, fitnesses, best_route, matrix, instance=None):
     """
     Run the Dash dashboard to visualize route optimization results.
 
@@ -137,10 +168,14 @@ def run_dashboard(routes, fitnesses, best_route, matrix):
         fitnesses (list of float): The fitness scores for each generation.
         best_route (list of str): The best route found.
         matrix (list of lists): The Geo matrix representing gains/losses.
+        instance (Instance, optional): The instance the routes belong to, for its area labels and coordinates.
 
     Example Usage:
         run_dashboard(routes, fitnesses, best_route, matrix)
     """
+    codec = AREA_CODEC if instance is None else instance.codec
+    area_coordinates = None if instance is None else instance.coordinates
+
     # Initialize Dash app
     app = dash.Dash(__name__)
 
@@ -148,17 +183,7 @@ def run_dashboard(routes, fitnesses, best_route, matrix):
     slider_marks = {i: '' for i in range(len(routes))}
 
     # App layout
-    app.layout = html.Div(children=[
-        html.H1(
-            children='Hallow Knight Route Optimization',
-            style={'textAlign': 'center', 'fontFamily': 'Arial, sans-serif'}
-        ),
-
-        html.H4(
-            children='Francisco Batista; Vicente Miranda; Lourenço Mourão Martins; Cícero Dias dos Santos',
-            style={'textAlign': 'center', 'paddingBottom': '20px', 'fontFamily': 'Arial, sans-serif'}
-        ),
-
+    app.layout = html.Div(children=_title() + [
         html.Div([
             dcc.Slider(
                 id='generation-slider',
@@ -178,7 +203,7 @@ def run_dashboard(routes, fitnesses, best_route, matrix):
         html.Div([
             dcc.Graph(
                 id='heatmap-graph',
-                figure=create_heatmap_figure(matrix, 'Geo Earnings/Loss Matrix')
+                figure=create_heatmap_figure(matrix, 'Geo Earnings/Loss Matrix', labels=codec.areas)
             ),
             dcc.Graph(
                 id='fitness-evolution-graph',
@@ -203,11 +228,141 @@ def run_dashboard(routes, fitnesses, best_route, matrix):
         Returns:
         tuple: Updated figures for the route graph, best route graph, and slider output text.
         """
-        route_figure = create_route_figure(routes[selected_generation], f'Generation {selected_generation + 1}')
-        best_route_figure = create_route_figure(best_route, 'Best Route', color='limegreen')
+        route_figure = create_route_figure(routes[selected_generation], f'Generation {selected_generation + 1}',
+                                           codec=codec, coordinates=area_coordinates)
+        best_route_figure = create_route_figure(best_route, 'Best Route', color='limegreen',
+                                                codec=codec, coordinates=area_coordinates)
         best_fitness_score = max(fitnesses)
         return route_figure, best_route_figure, f'Current Generation: {selected_generation + 1}, Best Fitness Score: {best_fitness_score}'
 
     # Run the app
     app.run_server(debug=False)
 
+
+
+def create_live_dashboard(log_path, interval=1000, max_points=None, matrix=None, instance=None):
+    """
+    Create a Dash dashboard following a running GA through its SnapshotLog (see utils/snapshot_log.py).
+
+    Every interval milliseconds the app reads the lines appended to the log and pushes only the new generations
+    to the browser: their points are appended to the fitness evolution trace (extendData), the slider range grows
+    (and follows the last generation unless another one is selected), and the best route figure is only rebuilt
+    when the best fitness improves. The route of a generation is read back from the log when it is selected.
+
+    Parameters:
+        log_path (str): The SnapshotLog of the run, which may not have been started yet.
+        interval (int): The polling interval, in milliseconds.
+        max_points (int, optional): Keep only the last max_points generations in the fitness evolution trace.
+        matrix (list of lists, optional): The Geo matrix, when the log does not describe the run.
+        instance (Instance, optional): The instance of the run, when the log does not describe the run.
+
+    Returns:
+        The Dash app.
+
+    Example Usage:
+        app = create_live_dashboard('ga_snapshots.jsonl', interval=2000)
+        app.run_server(debug=False)
+    """
+    reader = SnapshotLogReader(log_path)
+    reader.poll()
+    if reader.header is not None:
+        header = reader.header
+        matrix = header['matrix']
+        codec = AREA_CODEC if header['areas'] is None else AreaCodec(header['areas'])
+        area_coordinates = None if header['coordinates'] is None else {area: tuple(position) for area, position in header['coordinates'].items()}
+    elif instance is not None:
+        matrix, codec, area_coordinates = instance.geo_matrix, instance.codec, instance.coordinates
+    elif matrix is not None:
+        codec, area_coordinates = AREA_CODEC, None
+    else:
+        raise ValueError(f"{log_path} does not describe its run yet, the Geo matrix or the instance is needed")
+
+    app = dash.Dash(__name__)
+
+    app.layout = html.Div(children=_title() + [
+        html.Div([
+            dcc.Slider(
+                id='generation-slider',
+                min=0,
+                max=0,
+                value=0,
+                step=1,
+                marks=None,
+                updatemode='drag'
+            ),
+            html.Div(id='slider-output', style={'paddingTop': '10px'}),
+            html.Div(id='live-status', style={'paddingTop': '10px'})
+        ], style={'width': '80%', 'padding': '0px 20px 20px 20px', 'margin': 'auto'}),
+        html.Div([
+            dcc.Graph(id='route-graph'),
+            dcc.Graph(id='best-route-graph')
+        ], style={'display': 'flex', 'flexDirection': 'row', 'justifyContent': 'center'}),
+        html.Div([
+            dcc.Graph(
+                id='heatmap-graph',
+                figure=create_heatmap_figure(matrix, 'Geo Earnings/Loss Matrix', labels=codec.areas)
+            ),
+            dcc.Graph(
+                id='fitness-evolution-graph',
+                figure=create_fitness_evolution_figure([], [])
+            )
+        ], style={'display': 'flex', 'flexDirection': 'row', 'justifyContent': 'center'}),
+        # the generations and the best generation already sent to this browser
+        dcc.Store(id='live-state', data=dict(sent=0, best=None)),
+        dcc.Interval(id='live-interval', interval=interval)
+    ], style={'textAlign': 'center', 'maxWidth': '1200px', 'margin': 'auto', 'fontFamily': 'Arial, sans-serif'})
+
+    @app.callback(
+        [Output('fitness-evolution-graph', 'extendData'), Output('generation-slider', 'max'),
+         Output('generation-slider', 'value'), Output('best-route-graph', 'figure'),
+         Output('live-status', 'children'), Output('live-state', 'data')],
+        [Input('live-interval', 'n_intervals')],
+        [State('live-state', 'data'), State('generation-slider', 'value'), State('generation-slider', 'max')]
+    )
+    def push_new_generations(n_intervals, state, selected_generation, last_generation):
+        """
+        Push the generations appended to the log since the last update of this browser.
+        """
+        reader.poll()
+        sent, generations = state['sent'], len(reader)
+        if generations == sent:
+            raise PreventUpdate
+        # the last generation is followed unless another one is selected
+        following = sent == 0 or selected_generation == last_generation
+        new_points = dict(x=[list(range(sent, generations))], y=[reader.fitnesses[sent:generations]])
+        extend_data = [new_points, [0], max_points] if max_points else [new_points, [0]]
+        best_route_figure = no_update
+        if reader.best != state['best']:
+            best_route_figure = create_route_figure(reader.snapshot(reader.best)['best_route'], 'Best Route',
+                                                    color='limegreen', codec=codec, coordinates=area_coordinates)
+        status = f'Generations: {generations}, Best Fitness Score: {reader.fitnesses[reader.best]}'
+        return (extend_data, generations - 1, generations - 1 if following else no_update, best_route_figure,
+                status, dict(sent=generations, best=reader.best))
+
+    @app.callback(
+        [Output('route-graph', 'figure'), Output('slider-output', 'children')],
+        [Input('generation-slider', 'value')]
+    )
+    def update_route_graph(selected_generation):
+        """
+        Update the route graph with the route of the selected generation, read back from the log.
+        """
+        if selected_generation is None or selected_generation >= len(reader):
+            raise PreventUpdate
+        snapshot = reader.snapshot(selected_generation)
+        route_figure = create_route_figure(snapshot['best_route'], f'Generation {selected_generation + 1}',
+                                           codec=codec, coordinates=area_coordinates)
+        return route_figure, f"Current Generation: {selected_generation + 1}, Fitness Score: {snapshot['best_fitness']}"
+
+    return app
+
+
+def run_live_dashboard(log_path, interval=1000, max_points=None, matrix=None, instance=None):
+    """
+    Run the Dash dashboard following a running GA through its SnapshotLog (see create_live_dashboard).
+
+    Example Usage:
+        run_live_dashboard('ga_snapshots.jsonl')
+    """
+    app = create_live_dashboard(log_path, interval, max_points, matrix, instance)
+    app.run_server(debug=False)
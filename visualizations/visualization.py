@@ -1,5 +1,15 @@
+import os
+import math
+import shutil
+import subprocess
+import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from utils.utils import AREA_CODEC
+from utils.instance import circle_coordinates
 
 # Define the areas and their coordinates
 areas = ["D", "FC", "G", "QS", "QG", "CS", "KS", "RG", "DV", "SN"]
@@ -16,15 +26,44 @@ coordinates = {
     "SN": (8, 5)
 }
 
-def plot_route(route, ax, title, color='skyblue'):
+def _resolve_coordinates(codec, area_coordinates=None):
+    # coordinates of the game when they cover the areas, else a circle layout
+    if area_coordinates is None:
+        area_coordinates = coordinates if set(codec.areas) <= set(coordinates) else circle_coordinates(codec.areas)
+    return area_coordinates
+
+def _route_xy(route, codec, area_coordinates):
+    # the x and y coordinates of the areas of a route
+    route = codec.decode(route)
+    return [area_coordinates[area][0] for area in route], [area_coordinates[area][1] for area in route]
+
+def _route_style(color):
+    # the line and markers of a route
+    return dict(marker='o', markersize=8, markerfacecolor='blue', markeredgewidth=2, markeredgecolor='black', color=color, linewidth=2)
+
+def _decorate_route_axes(ax, title, area_coordinates, areas):
+    # the area labels, axis labels, title, grid and limits around a route
+    for area in areas:
+        ax.text(area_coordinates[area][0], area_coordinates[area][1], area, fontsize=12, ha='right', color='darkred', fontweight='bold')
+    ax.set_xlabel('X Coordinate', fontsize=14)
+    ax.set_ylabel('Y Coordinate', fontsize=14)
+    ax.set_title(title, fontsize=16, fontweight='bold')
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+    xs, ys = zip(*area_coordinates.values())
+    ax.set_xlim(min(xs) - 1, max(xs) + 1)
+    ax.set_ylim(min(ys) - 1, max(ys) + 1)
+
+def plot_route(route, ax, title, color='skyblue', codec=AREA_CODEC, coordinates=None):
     """
     Plots a single route on the given axes with enhanced aesthetics.
 
     Parameters:
-        - route (list of str): The route to be plotted, represented by area initials.
+        - route (numpy.ndarray or list of str): The route to be plotted, encoded or as area initials.
         - ax (matplotlib.axes._subplots.AxesSubplot): The matplotlib axes to plot on.
         - title (str): The title of the plot.
         - color (str): The color of the route line.
+        - codec (AreaCodec): The codec used to decode encoded routes.
+        - coordinates (dict, optional): Maps area labels to (x, y) positions, defaults to the map of the game.
 
     Returns:
         - None: Displays the route on the provided axes.
@@ -32,20 +71,14 @@ def plot_route(route, ax, title, color='skyblue'):
         route = ['D', 'FC', 'G', 'QS', 'QG', 'CS', 'KS', 'RG', 'DV', 'SN']
         plot_route(route, ax, 'Best Route', color='limegreen')
     """
-    x = [coordinates[area][0] for area in route]
-    y = [coordinates[area][1] for area in route]
+    area_coordinates = _resolve_coordinates(codec, coordinates)
+    x, y = _route_xy(route, codec, area_coordinates)
     ax.clear()
-    ax.plot(x, y, marker='o', markersize=8, markerfacecolor='blue', markeredgewidth=2, markeredgecolor='black', color=color, linewidth=2)
-    for area in route:
-        ax.text(coordinates[area][0], coordinates[area][1], area, fontsize=12, ha='right', color='darkred', fontweight='bold')
-    ax.set_xlabel('X Coordinate', fontsize=14)
-    ax.set_ylabel('Y Coordinate', fontsize=14)
-    ax.set_title(title, fontsize=16, fontweight='bold')
-    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
-    ax.set_xlim(-1, 10)
-    ax.set_ylim(-1, 8)
+    ax.plot(x, y, **_route_style(color))
+    _decorate_route_axes(ax, title, area_coordinates, codec.decode(route))
 
-def visualize_routes(routes, best_route, interval=500):
+def visualize_routes(routes, best_route, interval=500, codec=AREA_CODEC, coordinates=None, path=None, every=1,
+                     max_frames=None):
     """
     Visualizes routes over generations with enhanced aesthetics using matplotlib animation.
 
@@ -53,14 +86,26 @@ def visualize_routes(routes, best_route, interval=500):
         - routes (list of list of str): A list of routes for each generation.
         - best_route (list of str): The best route found.
         - interval (int): The interval between frames in milliseconds.
+        - codec (AreaCodec): The codec used to decode encoded routes.
+        - coordinates (dict, optional): Maps area labels to (x, y) positions, defaults to the map of the game.
+        - path (str, optional): Export the animation to this MP4, GIF or PNG file without displaying it
+          (see export_routes_animation), for machines without a display.
+        - every (int): With path, render every every-th generation only.
+        - max_frames (int, optional): With path, render at most this many generations.
 
     Returns:
         - None: Displays the animated visualization of routes over generations.
+        - list of str: The files written when path is given.
 
     Example Usage:
         visualize_routes(routes, best_route, interval=500)
+        visualize_routes(routes, best_route, path='routes.gif', max_frames=200)
 
     """
+    if path is not None:
+        return export_routes_animation(routes, best_route, path, fps=1000 / interval, every=every, max_frames=max_frames,
+                                       codec=codec, coordinates=coordinates)
+
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
     
     def update(num):
@@ -77,8 +122,161 @@ def visualize_routes(routes, best_route, interval=500):
             update(1)      
 
         """
-        plot_route(routes[num], ax1, f"Generation {num+1}")
-        plot_route(best_route, ax2, "Best Route", color='limegreen')
+        plot_route(routes[num], ax1, f"Generation {num+1}", codec=codec, coordinates=coordinates)
+        plot_route(best_route, ax2, "Best Route", color='limegreen', codec=codec, coordinates=coordinates)
     
     ani = animation.FuncAnimation(fig, update, frames=len(routes), interval=interval)
     plt.show()
+
+
+def frame_indices(n_routes, every=1, max_frames=None):
+    """
+    Selects the generations rendered in an exported animation: every every-th generation, fewer when needed
+    to keep at most max_frames, and always the last one.
+
+    Parameters:
+        - n_routes (int): The number of generations.
+        - every (int): The step between two rendered generations.
+        - max_frames (int, optional): The maximum number of frames.
+
+    Returns:
+        - list of int: The indices of the rendered generations.
+
+    Example Usage:
+        frame_indices(10, every=4)  # Output: [0, 4, 8, 9]
+        frame_indices(1000, max_frames=5)  # Output: [0, 250, 500, 750, 999]
+    """
+    if n_routes == 0:
+        return []
+    if max_frames is not None:
+        if max_frames < 2:
+            return [n_routes - 1]
+        every = max(every, math.ceil((n_routes - 1) / (max_frames - 1)))
+    indices = list(range(0, n_routes, every))
+    if indices[-1] != n_routes - 1:
+        indices.append(n_routes - 1)
+    return indices
+
+def route_frames(routes, best_route, frames, codec=AREA_CODEC, coordinates=None, figsize=(18, 8), dpi=100):
+    """
+    Renders the frames of the route animation off-screen, with the Agg canvas and blitting.
+
+    Everything but the route of the current generation and its title (the area labels, axes, grid and the best
+    route) is drawn once and saved as a background; every frame restores the background and only draws the
+    updated route line and title, so the time per frame does not depend on the number of generations.
+
+    Parameters:
+        - routes (list of list of str): A list of routes for each generation.
+        - best_route (list of str): The best route found.
+        - frames (list of int): The generations to render (see frame_indices).
+        - codec (AreaCodec): The codec used to decode encoded routes.
+        - coordinates (dict, optional): Maps area labels to (x, y) positions, defaults to the map of the game.
+        - figsize (tuple): The size of the figure, in inches.
+        - dpi (int): The resolution of the figure.
+
+    Returns:
+        - generator of numpy.ndarray: The (height x width x 4) RGBA image of every frame. The images share the
+          buffer of the canvas, so each one must be used (or copied) before the next one is rendered.
+
+    Example Usage:
+        for image in route_frames(routes, best_route, frame_indices(len(routes), every=10)):
+            Image.fromarray(image).save('frame.png')
+    """
+    area_coordinates = _resolve_coordinates(codec, coordinates)
+    figure = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+    ax1, ax2 = figure.subplots(1, 2)
+    _decorate_route_axes(ax1, '', area_coordinates, codec.decode(best_route))
+    _decorate_route_axes(ax2, 'Best Route', area_coordinates, codec.decode(best_route))
+    ax2.plot(*_route_xy(best_route, codec, area_coordinates), **_route_style('limegreen'))
+    line, = ax1.plot([], [], animated=True, **_route_style('skyblue'))
+    ax1.title.set_animated(True)
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(figure.bbox)
+    for index in frames:
+        canvas.restore_region(background)
+        line.set_data(*_route_xy(routes[index], codec, area_coordinates))
+        ax1.title.set_text(f"Generation {index+1}")
+        ax1.draw_artist(line)
+        ax1.draw_artist(ax1.title)
+        yield np.asarray(canvas.buffer_rgba())
+
+def export_routes_animation(routes, best_route, path, fps=2, every=1, max_frames=None, codec=AREA_CODEC, coordinates=None,
+                            figsize=(18, 8), dpi=100):
+    """
+    Exports the route animation of visualize_routes to a file without displaying it, for machines without a display.
+    The frames are rendered with route_frames and streamed to the file as they are rendered.
+
+    The format follows the extension of path:
+        - .mp4: a video encoded by ffmpeg (which must be installed, see matplotlib's animation.ffmpeg_path).
+        - .gif: an animated GIF with the palette of the first frame (Pillow keeps the frames of a GIF in memory,
+          use max_frames on long runs).
+        - .png: one image per frame, named after the generation (routes.png gives routes_00001.png, ...).
+
+    Parameters:
+        - routes (list of list of str): A list of routes for each generation.
+        - best_route (list of str): The best route found.
+        - path (str): The file to write.
+        - fps (float): The frames per second of MP4 and GIF files.
+        - every (int): Render every every-th generation only.
+        - max_frames (int, optional): Render at most this many generations (see frame_indices).
+        - codec (AreaCodec): The codec used to decode encoded routes.
+        - coordinates (dict, optional): Maps area labels to (x, y) positions, defaults to the map of the game.
+        - figsize (tuple): The size of the figure, in inches.
+        - dpi (int): The resolution of the figure.
+
+    Returns:
+        - list of str: The files written.
+
+    Example Usage:
+        export_routes_animation(routes, best_route, 'routes.mp4', fps=10, max_frames=1000)
+        export_routes_animation(routes, best_route, 'frames/routes.png', every=50)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ('.mp4', '.gif', '.png'):
+        raise ValueError(f"Unsupported animation format {extension!r}, use .mp4, .gif or .png")
+    frames = frame_indices(len(routes), every, max_frames)
+    if not frames:
+        raise ValueError("There are no routes to animate")
+    images = route_frames(routes, best_route, frames, codec, coordinates, figsize, dpi)
+
+    if extension in ('.png', '.gif'):
+        # Pillow writes the images, the rest of the visualizations do without it
+        from PIL import Image
+
+    if extension == '.png':
+        paths = []
+        for index, image in zip(frames, images):
+            paths.append(f"{path[:-len(extension)]}_{index+1:05d}.png")
+            Image.fromarray(image).save(paths[-1])
+        return paths
+
+    if extension == '.gif':
+        # every frame takes the palette of the first one, which has all the colors of the animation, and is
+        # written whole: quantizing and comparing full frames in Pillow costs far more than rendering them
+        first = Image.fromarray(next(images)).convert('RGB').quantize(method=Image.Quantize.FASTOCTREE)
+        palette_frames = (Image.fromarray(image).convert('RGB').quantize(palette=first, dither=Image.Dither.NONE)
+                          for image in images)
+        first.save(path, save_all=True, append_images=palette_frames, duration=1000 / fps, loop=0, optimize=False)
+        return [path]
+
+    ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is needed to write MP4 files, export a GIF or PNG frames instead")
+    first = next(images)
+    height, width = first.shape[:2]
+    # raw RGBA frames piped to ffmpeg, padded to the even size required by yuv420p
+    process = subprocess.Popen([ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+                                '-s', f"{width}x{height}", '-r', str(fps), '-i', '-',
+                                '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path],
+                               stdin=subprocess.PIPE)
+    try:
+        process.stdin.write(first.tobytes())
+        for image in images:
+            process.stdin.write(image.tobytes())
+    finally:
+        process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg could not write {path}")
+    return [path]